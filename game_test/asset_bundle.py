@@ -0,0 +1,174 @@
+# asset_bundle.py
+"""
+起動を速くするための画像バンドル（tools/build_asset_bundle.py で作る）。
+
+PNG/JPG を読み込んで smoothscale した「後」の画素をそのまま1つのファイルに並べておき、
+起動時は mmap して pygame.image.frombuffer で Surface にする（PNG の展開も縮小もしない）。
+
+    assets = AssetBundle(Config.PATH_ASSET_BUNDLE)
+    img = assets.load("title/logo.PNG", {"max_w": 800}, lambda: 今まで通り読み込む関数())
+
+バンドルに無い・元画像が変わっている（更新日時かサイズが違う）ときは loader() を呼ぶだけなので、
+バンドルが無くても古くても今まで通り動く。record=True だと loader() の結果を覚えておき、save() で書き出す。
+
+ファイル形式:
+    MAGIC(8) + マニフェストの長さ(uint32 LE) + マニフェスト(JSON) + 64バイト境界から画素データ
+    マニフェスト: {"version": 1, "entries": {名前: {"offset", "length", "size", "format", "colorkey",
+                                               "source", "mtime", "bytes"}}}
+"""
+import json
+import mmap
+import os
+import struct
+
+import pygame
+
+from common import Config
+
+MAGIC = b"PBASSET1"
+VERSION = 1
+ALIGN = 64
+_HEADER = struct.Struct("<8sI")
+
+# バンドルの source はリポジトリのルートからの相対パス（title/ などは実行場所からの相対パスなので）
+REPO_DIR = os.path.abspath(os.path.join(Config.BASE_DIR, ".."))
+
+
+def _tobytes(surf, fmt):
+    tobytes = getattr(pygame.image, "tobytes", None) or pygame.image.tostring
+    return tobytes(surf, fmt)
+
+
+class AssetBundle:
+    def __init__(self, path=None, record=False):
+        """path: バンドルのファイル（None や存在しないときは使わない）"""
+        self.path = path
+        self.record = record
+        self._file = None
+        self._mm = None
+        self._entries = None
+        self._recorded = {}  # 名前 -> (Surface, source の絶対パス)
+
+    # -------------------------
+    # 読み込み
+    # -------------------------
+    @staticmethod
+    def key(source, params):
+        rel = os.path.relpath(os.path.abspath(source), REPO_DIR).replace(os.sep, "/")
+        return rel + "|" + json.dumps(params, sort_keys=True)
+
+    def _open(self):
+        """最初に使うときに1回だけ mmap してマニフェストを読む"""
+        if self._entries is not None:
+            return self._entries
+        self._entries = {}
+        if not self.path or not os.path.exists(self.path):
+            return self._entries
+        try:
+            self._file = open(self.path, "rb")
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, n = _HEADER.unpack_from(self._mm, 0)
+            if magic != MAGIC:
+                raise ValueError("not an asset bundle")
+            manifest = json.loads(self._mm[_HEADER.size:_HEADER.size + n].decode("utf-8"))
+            if manifest.get("version") != VERSION:
+                raise ValueError(f"bundle version {manifest.get('version')} != {VERSION}")
+            self._entries = manifest["entries"]
+        except (OSError, ValueError, struct.error) as e:
+            print(f"[WARN] asset bundle not used ({self.path}): {e}")
+            self.close()
+            self._entries = {}
+        return self._entries
+
+    @staticmethod
+    def _is_fresh(entry):
+        """元画像が無い（バンドルだけ配布）か、作ったときから変わっていなければ使ってよい"""
+        src = os.path.join(REPO_DIR, entry["source"])
+        try:
+            st = os.stat(src)
+        except OSError:
+            return True
+        return st.st_size == entry["bytes"] and abs(st.st_mtime - entry["mtime"]) < 1e-3
+
+    def _surface(self, entry):
+        start = entry["offset"]
+        view = memoryview(self._mm)[start:start + entry["length"]]
+        try:
+            surf = pygame.image.frombuffer(view, tuple(entry["size"]), entry["format"])
+            # 画面の形式に変換（ここでコピーされるので mmap とは切り離される）
+            if entry["format"] == "RGBA":
+                surf = surf.convert_alpha()
+            else:
+                surf = surf.convert()
+                if entry["colorkey"] is not None:
+                    surf.set_colorkey(entry["colorkey"], pygame.RLEACCEL)
+        finally:
+            view.release()
+        return surf
+
+    def load(self, source, params, loader):
+        """バンドルにあればそれを、無ければ loader() の結果を返す（loader が None を返したら None）"""
+        name = self.key(source, params)
+        entry = self._open().get(name)
+        if entry is not None and self._is_fresh(entry):
+            return self._surface(entry)
+
+        surf = loader()
+        if self.record and surf is not None:
+            self._recorded[name] = (surf, os.path.abspath(source))
+        return surf
+
+    def close(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    # -------------------------
+    # 書き出し（tools/build_asset_bundle.py から）
+    # -------------------------
+    def save(self, path=None):
+        """record=True で覚えた Surface を1つのファイルに書き出す。書いた件数を返す"""
+        path = path or self.path
+        entries = {}
+        blobs = []
+        for name, (surf, source) in sorted(self._recorded.items()):
+            fmt = "RGBA" if surf.get_flags() & pygame.SRCALPHA else "RGB"
+            data = _tobytes(surf, fmt)
+            st = os.stat(source)
+            colorkey = surf.get_colorkey()
+            entries[name] = {
+                "offset": 0,
+                "length": len(data),
+                "size": list(surf.get_size()),
+                "format": fmt,
+                "colorkey": list(colorkey) if colorkey is not None else None,
+                "source": os.path.relpath(source, REPO_DIR).replace(os.sep, "/"),
+                "mtime": st.st_mtime,
+                "bytes": st.st_size,
+            }
+            blobs.append((name, data))
+
+        # offset はマニフェストの長さで決まるので、桁が落ち着くまで数回作り直す
+        offsets_fixed = False
+        while not offsets_fixed:
+            manifest = json.dumps({"version": VERSION, "entries": entries}, ensure_ascii=False).encode("utf-8")
+            pos = -(-(_HEADER.size + len(manifest)) // ALIGN) * ALIGN
+            offsets_fixed = True
+            for name, data in blobs:
+                if entries[name]["offset"] != pos:
+                    entries[name]["offset"] = pos
+                    offsets_fixed = False
+                pos += -(-len(data) // ALIGN) * ALIGN
+
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, len(manifest)))
+            f.write(manifest)
+            for name, data in blobs:
+                f.write(b"\0" * (entries[name]["offset"] - f.tell()))
+                f.write(data)
+        os.replace(tmp, path)
+        return len(blobs)
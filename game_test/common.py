@@ -3,6 +3,9 @@ import os
 import random
 import re
 import sys
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from datetime import datetime
 
@@ -17,6 +20,79 @@ class GameState:
     theme: str = ""
     player_turn: int = 1
     shutter_paths: list[str] = field(default_factory=list)
+    round_id: int | None = None  # score_store のラウンド id（CameraScene で開始）
+
+    # 得点（メモリ上）。採点が終わると publish_score() で入り、購読中のシーンに通知される
+    # round_scores: {round_id: {player: {"Dynamic", "Stable", "Unique"}}}  … このゲームの全ラウンド
+    round_scores: dict = field(default_factory=dict)
+    # 撮影画像・骨格画像のパス（作ったときに記録。結果画面でフォルダを探さなくて済む）
+    # round_images: {round_id: {player: {"shutter": path, "pose": path}}}
+    round_images: dict = field(default_factory=dict)
+    _listeners: list = field(default_factory=list, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def subscribe(self, callback):
+        """得点が入ったときに callback(round_id, player, scores) を呼ぶ（採点スレッドから呼ばれる）"""
+        with self._lock:
+            if callback not in self._listeners:
+                self._listeners.append(callback)
+
+    def unsubscribe(self, callback):
+        with self._lock:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+
+    def publish_score(self, round_id, player, scores):
+        """採点結果をメモリに反映して購読者に知らせる（同じラウンド・プレイヤーは上書き）"""
+        values = {k: float(scores.get(k, 0.0)) for k in ("Dynamic", "Stable", "Unique")}
+        with self._lock:
+            self.round_scores.setdefault(round_id, {})[player] = values
+            listeners = list(self._listeners)
+        for cb in listeners:
+            cb(round_id, player, values)
+
+    def get_round_scores(self, round_id):
+        """{player: {"Dynamic", "Stable", "Unique"}}（まだ無ければ None）"""
+        with self._lock:
+            players = self.round_scores.get(round_id)
+            return dict(players) if players else None
+
+    def record_image(self, round_id, player, path, kind="shutter"):
+        """ラウンド・プレイヤーの画像パスを覚えておく（kind: "shutter" 撮影 / "pose" 骨格推定の出力）"""
+        with self._lock:
+            self.round_images.setdefault(round_id, {}).setdefault(player, {})[kind] = path
+
+    def get_image(self, player, kind="shutter", round_id=None):
+        """画像パス（round_id 省略時は最後に記録したラウンド）。無ければ None"""
+        with self._lock:
+            if round_id is None:
+                if not self.round_images:
+                    return None
+                round_id = next(reversed(self.round_images))
+            return self.round_images.get(round_id, {}).get(player, {}).get(kind)
+
+    def image_paths(self):
+        """このゲームで記録した画像パスすべて（撮影・骨格推定の出力）"""
+        with self._lock:
+            return [path for players in self.round_images.values()
+                    for images in players.values() for path in images.values()]
+
+    def session_component_totals(self):
+        """このゲームの各プレイヤーの項目別合計 {1: [D, S, U], 2: [D, S, U]}"""
+        out = {1: [0.0, 0.0, 0.0], 2: [0.0, 0.0, 0.0]}
+        with self._lock:
+            for players in self.round_scores.values():
+                for p, sc in players.items():
+                    tot = out.setdefault(p, [0.0, 0.0, 0.0])
+                    out[p] = [t + sc[k] for t, k in zip(tot, ("Dynamic", "Stable", "Unique"))]
+        return out
+
+    def reset_scores(self):
+        """ゲーム終了時に呼ぶ（次のゲームは 0 点から）"""
+        with self._lock:
+            self.round_id = None
+            self.round_scores = {}
+            self.round_images = {}
 
 
 game_state = GameState()
@@ -30,6 +106,7 @@ class Config:
     SCREEN_WIDTH = 800
     SCREEN_HEIGHT = 600
     FPS = 60
+    BUSY_FPS = 30  # 裏で推論しているあいだの fps（CPU を推論に回す）
     CAPTION = "Pose Battle Game - Refactored"
 
     # パス設定 (絶対パス)
@@ -39,6 +116,12 @@ class Config:
     PATH_FONT_PAINTBALL = os.path.join(BASE_DIR, "font", "Paintball_Beta_3.ttf")
     PATH_IMG_BOMB = os.path.join(HARUKI_ASSET_DIR, "bakudan-white.JPG")
     PATH_SHUTTER_DIR = os.path.join(BASE_DIR, "shuttered")
+    PATH_OUTPUT_DIR = os.path.join(BASE_DIR, "outputs_estimated")  # 骨格推定の結果画像
+    PATH_ARCHIVE_DIR = os.path.join(BASE_DIR, "archive")
+    # 縮小済みの画像をまとめたファイル（tools/build_asset_bundle.py で作る。無ければ今まで通り読み込む）
+    PATH_ASSET_BUNDLE = os.path.join(BASE_DIR, "assets.bundle")
+    USE_ASSET_BUNDLE = True
+    PATH_SCORE_DB = os.path.join(BASE_DIR, "scores.db")
 
     # 色定義
     WHITE = (255, 255, 255)
@@ -61,6 +144,31 @@ class Config:
     FUSE_DURATION = 3.0
     COUNTDOWN_SECONDS = 5.0
 
+    # 骨格推定モデル（tools/export_pose_model.py で ONNX / OpenVINO に書き出せる）
+    POSE_MODEL_PATH = "yolo11n-pose.pt"
+    POSE_RUNTIME = None  # None: そのまま / "onnx" / "openvino"
+    # tools/quantize_models.py で作った INT8 モデルを使う（CPU のみの PC 向け）
+    # 採点は SCORE_BACKEND = "onnx"、骨格推定は POSE_RUNTIME = None / "onnx" のときだけ効く（それ以外は警告を出して FP32）
+    USE_QUANTIZED_MODELS = False
+    # 採点モデルのバックエンド: "keras"(TensorFlow) / "onnx"
+    SCORE_BACKEND = "keras"
+    # 推論の実行場所: "inprocess"(ゲームと同じプロセス) / "process"(別プロセスの推論サービス)
+    INFERENCE_MODE = "inprocess"
+    # 複数ブース共有の採点サーバー (services/scoring_server.py)。None ならローカルで採点
+    SCORE_SERVER = None  # 例) ("192.168.0.10", 5055)
+    SCORE_SERVER_TIMEOUT = 2.0
+    # フレーム計測（F3: グラフ表示、F4: CSV 書き出し）。ブースでカクつきを調べるとき True に
+    FRAME_PROFILER = False
+    FRAME_PROFILER_SIZE = 600  # 何フレーム分貯めるか
+    PATH_PROFILE_DIR = os.path.join(BASE_DIR, "profiles")
+    # 撮影画像・推定結果の整理（services/retention.py）。シーン切替のときに裏で古い分を消す
+    RETENTION_ENABLED = True
+    RETENTION_MAX_AGE_DAYS = 30   # None で制限なし
+    RETENTION_MAX_FILES = 2000    # フォルダごと
+    RETENTION_MAX_MB = 2048       # フォルダごと
+    RETENTION_ARCHIVE = True      # 消す前に日付ごとの tar.gz（PATH_ARCHIVE_DIR）にまとめる
+    RETENTION_INTERVAL = 300      # 整理する最短間隔（秒）
+
     # お題リスト
     THEMES = [
         "グリコ",
@@ -125,10 +233,45 @@ class Utils:
 # ====================================================
 # 3. Managers: リソース・テキスト・ハードウェア
 # ====================================================
+class FontRegistry:
+    """
+    フォントの置き場（ファイル・サイズ・太字/斜体ごとに1つだけ作る）
+    シーンを作るたびに同じ TTF を読み直さないように、全シーンでこれを使う。
+        font = app.fonts.get(Config.PATH_FONT_PAINTBALL, 36)
+    返す Font は共有なので set_bold などで書き換えない（bold / italic は引数で指定）
+    """
+
+    def __init__(self):
+        self._fonts = {}
+
+    def get(self, path, size, bold=False, italic=False, fallback=None):
+        """path が読めないときは fallback(size)（省略時は pygame の標準フォント）"""
+        key = (os.path.abspath(path) if path else None, size, bold, italic)
+        font = self._fonts.get(key)
+        if font is None:
+            try:
+                font = pygame.font.Font(path, size)
+            except OSError:
+                print(f"[WARN] font load failed: {path}")
+                font = fallback(size) if fallback else pygame.font.Font(None, size)
+            font.set_bold(bold)
+            font.set_italic(italic)
+            self._fonts[key] = font
+        return font
+
+
+# AppContext.fonts の中身（app なしで作ったシーンも同じものを使う）
+font_registry = FontRegistry()
+
+
 class ResourceManager:
     """リソース管理とフォールバック処理"""
 
-    def __init__(self):
+    def __init__(self, fonts=None, assets=None):
+        from asset_bundle import AssetBundle
+
+        self.fonts = fonts or font_registry
+        self.assets = assets or AssetBundle()  # path なしの AssetBundle は毎回 PNG/JPG から読む
         self.fonts_ioei = {}
         self.fonts_paintball = {}
         self.fonts_system = {}
@@ -166,6 +309,13 @@ class ResourceManager:
         print("----------------------")
 
     def _load_image(self, path, size=None, target_height=None, transparent=False):
+        """アセットバンドルに縮小済みのものがあればそれを使う"""
+        params = {"size": size, "target_height": target_height, "transparent": transparent}
+        return self.assets.load(
+            path, params, lambda: self._decode_image(path, size, target_height, transparent)
+        )
+
+    def _decode_image(self, path, size=None, target_height=None, transparent=False):
         try:
             if not os.path.exists(path):
                 return None
@@ -197,15 +347,14 @@ class ResourceManager:
         if size in cache_dict:
             return cache_dict[size]
 
-        try:
-            font = pygame.font.Font(path, size)
-        except OSError:
+        def fallback(size):
             print(f"Warning: Font {path} not found. Using fallback '{fallback_sysfont}'.")
             try:
-                font = pygame.font.SysFont(fallback_sysfont, size)
+                return pygame.font.SysFont(fallback_sysfont, size)
             except Exception:
-                font = pygame.font.Font(None, int(size * 1.5))
+                return pygame.font.Font(None, int(size * 1.5))
 
+        font = self.fonts.get(path, size, fallback=fallback)
         cache_dict[size] = font
         return font
 
@@ -268,6 +417,198 @@ class TextRenderer:
         return font.render(text, True, color)
 
 
+class LayerPool:
+    """
+    演出用の画面サイズのレイヤー（Surface）を使い回すプール。
+    毎フレーム pygame.Surface(画面サイズ) を作るとメモリの確保・解放が重いので、借りて返す。
+        with app.layers.layer() as tmp:        # 透明にクリア済みの SRCALPHA レイヤー
+            pygame.draw.circle(tmp, ...)
+            surface.blit(tmp, (0, 0))
+        with app.layers.layer(alpha=False) as fade:   # 不透明レイヤー（set_alpha で全体を薄く）
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self._free = {True: [], False: []}
+
+    def acquire(self, alpha=True, clear=True):
+        free = self._free[alpha]
+        if free:
+            layer = free.pop()
+        elif alpha:
+            layer = pygame.Surface(self.size, pygame.SRCALPHA)
+        else:
+            layer = pygame.Surface(self.size).convert()
+        if alpha and clear:
+            layer.fill((0, 0, 0, 0))
+        return layer
+
+    def release(self, layer):
+        alpha = bool(layer.get_flags() & pygame.SRCALPHA)
+        if not alpha:
+            layer.set_alpha(None)
+        self._free[alpha].append(layer)
+
+    @contextmanager
+    def layer(self, alpha=True, clear=True):
+        layer = self.acquire(alpha=alpha, clear=clear)
+        try:
+            yield layer
+        finally:
+            self.release(layer)
+
+
+class FadeSprite:
+    """
+    フェードイン・半透明で描く画像（毎フレーム copy() して set_alpha しないため）
+    set_alpha 用のコピーは1枚だけ持っておき、アルファが変わったときだけ set_alpha する。
+    完全に不透明になったら元の画像をそのまま blit する（コピーも捨てる）。
+        logo = FadeSprite(logo_img)
+        logo.blit(surface, pos, alpha)
+    """
+
+    def __init__(self, image):
+        self.image = image
+        self._faded = None
+        self._alpha = None
+
+    def surface(self, alpha):
+        alpha = max(0, min(255, int(alpha)))
+        if alpha >= 255:
+            self._faded = None
+            self._alpha = None
+            return self.image
+        if self._faded is None:
+            self._faded = self.image.copy()
+        if alpha != self._alpha:
+            self._faded.set_alpha(alpha)
+            self._alpha = alpha
+        return self._faded
+
+    def blit(self, surface, pos, alpha=255):
+        if alpha <= 0:
+            return None
+        return surface.blit(self.surface(alpha), pos)
+
+
+class StyledTextCache:
+    """
+    縁取り・影つき文字の画像キャッシュ（文字・フォント・色・縁・影が同じなら作り直さない）
+    影 → 縁取り → 本体の順に1枚に重ねて覚えておくので、変わらない数字は毎フレーム blit 1回で済む。
+        text_cache.draw(surface, "12", font, WHITE, outline=RED, center=(400, 300))
+        surf = text_cache.render("とくてん", font, WHITE, outline=BLACK)   # 縁の分だけ大きい Surface
+    縁取りは斜め4方向に outline_width ずらして重ねる。返す Surface は共有なので set_alpha するなら copy() する。
+    """
+
+    def __init__(self, max_items=512):
+        self.max_items = max_items
+        self._cache = OrderedDict()  # key -> (Surface, 本体の左上の位置, 本体のサイズ)
+
+    def _get(self, text, font, color, outline, outline_width, shadow, shadow_offset):
+        color = tuple(pygame.Color(color))
+        outline = tuple(pygame.Color(outline)) if outline is not None else None
+        shadow = tuple(pygame.Color(shadow)) if shadow is not None else None
+        key = (text, font, color, outline, outline_width, shadow, tuple(shadow_offset))
+        entry = self._cache.get(key)
+        if entry is not None:
+            self._cache.move_to_end(key)
+            return entry
+
+        base = font.render(text, True, color)
+        w, h = base.get_size()
+        pad = outline_width if outline is not None else 0
+        sx, sy = shadow_offset if shadow is not None else (0, 0)
+        ox, oy = pad + max(0, -sx), pad + max(0, -sy)
+        surf = pygame.Surface((w + pad * 2 + abs(sx), h + pad * 2 + abs(sy)), pygame.SRCALPHA)
+        if shadow is not None:
+            surf.blit(font.render(text, True, shadow), (ox + sx, oy + sy))
+        if outline is not None:
+            line = font.render(text, True, outline)
+            for dx in (-pad, pad):
+                for dy in (-pad, pad):
+                    surf.blit(line, (ox + dx, oy + dy))
+        surf.blit(base, (ox, oy))
+
+        entry = (surf, (ox, oy), (w, h))
+        self._cache[key] = entry
+        if len(self._cache) > self.max_items:
+            self._cache.popitem(last=False)
+        return entry
+
+    def render(self, text, font, color, outline=None, outline_width=2, shadow=None, shadow_offset=(2, 2)):
+        return self._get(text, font, color, outline, outline_width, shadow, shadow_offset)[0]
+
+    def draw(self, surface, text, font, color, outline=None, outline_width=2, shadow=None,
+             shadow_offset=(2, 2), **anchor):
+        """
+        文字本体（縁・影を除く）の Rect を anchor（center=..., topleft=... など）に合わせて描く
+        描いた範囲の Rect を返す
+        """
+        surf, (ox, oy), size = self._get(text, font, color, outline, outline_width, shadow, shadow_offset)
+        body = pygame.Rect((0, 0), size)
+        for name, value in (anchor or {"topleft": (0, 0)}).items():
+            setattr(body, name, value)
+        return surface.blit(surf, (body.x - ox, body.y - oy))
+
+
+# シーン間で共有するインスタンス（app を受け取らないシーンからも使う）
+text_cache = StyledTextCache()
+
+
+class RotationCache:
+    """
+    回転した画像のキャッシュ（くるくる回す演出で毎フレーム transform.rotate しないため）
+    角度を step 度ごとに丸めて、作った画像は覚えておく。合計が budget_mb を超えたら古い順に捨てる。
+        cache = RotationCache(photo, step=1, smooth=True)
+        rotated = cache.get(angle)             # 1度単位
+        rotated = cache.get(angle, step=8)     # 速く回っている間は粗くてよい
+    smooth=True だと rotozoom（なめらかだけど遅い。キャッシュするので気にならない）
+    """
+
+    def __init__(self, image, step=1, smooth=False, budget_mb=48):
+        self.image = image
+        self.step = step
+        self.smooth = smooth
+        self.budget = budget_mb * 1024 * 1024
+        self.used = 0
+        self._cache = OrderedDict()  # 丸めた角度 -> Surface（後ろほど最近使った）
+
+    def key(self, angle, step=None):
+        step = step or self.step
+        return int(round(angle / step) * step) % 360
+
+    def _rotate(self, angle):
+        if self.smooth:
+            return pygame.transform.rotozoom(self.image, angle, 1.0)
+        return pygame.transform.rotate(self.image, angle)
+
+    def get(self, angle, step=None):
+        k = self.key(angle, step)
+        surf = self._cache.get(k)
+        if surf is not None:
+            self._cache.move_to_end(k)
+            return surf
+
+        surf = self._rotate(k)
+        self._cache[k] = surf
+        self.used += surf.get_width() * surf.get_height() * surf.get_bytesize()
+        while self.used > self.budget and len(self._cache) > 1:
+            _, old = self._cache.popitem(last=False)
+            self.used -= old.get_width() * old.get_height() * old.get_bytesize()
+        return surf
+
+    def warm(self, angles, step=None, limit=None):
+        """まだ作っていない角度を先に作っておく（暇なフレームで少しずつ）。作った枚数を返す"""
+        made = 0
+        for a in angles:
+            if limit is not None and made >= limit:
+                break
+            if self.key(a, step) not in self._cache:
+                self.get(a, step)
+                made += 1
+        return made
+
+
 class HardwareManager:
     """カメラとMediaPipeの管理（自動検出＆エラーハンドリング）"""
 
@@ -362,8 +703,179 @@ class AppContext:
     core/manager.py が渡してくる app の代わりに、
     game_main.py 側で組み立てて scenes に渡すことを想定。
     """
-    def __init__(self, screen: pygame.Surface):
+    def __init__(self, screen: pygame.Surface, assets=None):
+        from asset_bundle import AssetBundle
+
         self.screen = screen
-        self.resource_manager = ResourceManager()
+        self.fonts = font_registry
+        if assets is None:
+            assets = AssetBundle(Config.PATH_ASSET_BUNDLE if Config.USE_ASSET_BUNDLE else None)
+        self.assets = assets
+        self.resource_manager = ResourceManager(self.fonts, self.assets)
         self.text_renderer = TextRenderer(self.resource_manager)
         self.hardware = HardwareManager()
+        self.layers = LayerPool(screen.get_size())
+        self.score_predictor = None
+        self.inference = None  # services.inference_service.InferenceClient
+        self._inference_status = None
+        self._status_future = None
+        self._score_executor = None
+        self._background_jobs = []  # 実行中の重い裏処理（Future / Thread）
+        self.retention = None  # services.retention.RetentionService
+
+    @staticmethod
+    def score_predictor_kwargs():
+        """ScorePredictor の引数（INT8 は ONNX 版しか無いので、keras のときは警告して FP32）"""
+        quantized = Config.USE_QUANTIZED_MODELS
+        if quantized and Config.SCORE_BACKEND != "onnx":
+            print(f"[WARN] USE_QUANTIZED_MODELS needs SCORE_BACKEND='onnx' (now {Config.SCORE_BACKEND!r}); "
+                  "using FP32 score models")
+            quantized = False
+        return {"backend": Config.SCORE_BACKEND, "quantized": quantized}
+
+    def start_model_loading(self):
+        """
+        採点モデルの読み込みを裏で開始する（起動時に1回。タイトル表示中に読み込む）
+        Config.INFERENCE_MODE == "process" なら推論サービスを起動し、モデルはそちらで読み込む
+        """
+        if Config.INFERENCE_MODE == "process":
+            self.start_inference()
+            return None
+        if self.score_predictor is not None:
+            return self.score_predictor
+
+        if Config.SCORE_SERVER is not None:
+            # 採点は共有サーバーに任せる（繋がらないときだけローカルで読み込む）
+            from services.scoring_server import RemoteScoreBackend
+
+            host, port = Config.SCORE_SERVER
+            self.score_predictor = RemoteScoreBackend(
+                host, port,
+                timeout=Config.SCORE_SERVER_TIMEOUT,
+                fallback_factory=self._create_local_predictor,
+            )
+            return self.score_predictor
+
+        try:
+            self.score_predictor = self._create_local_predictor()
+        except ImportError as e:
+            print(f"Score model dependencies missing: {e}")
+            return None
+        return self.score_predictor
+
+    def _create_local_predictor(self):
+        from scenes.score_predictor import ScorePredictor
+
+        return ScorePredictor(background=True, **self.score_predictor_kwargs())
+
+    def start_inference(self, mode="process"):
+        """推論サービス（骨格推定＋採点）を起動する"""
+        if self.inference is not None:
+            return self.inference
+        from scenes.pose_scene import PoseEstimationScene
+        from services.inference_service import InferenceClient
+
+        self.inference = InferenceClient(
+            mode=mode,
+            pose_kwargs=PoseEstimationScene.estimator_kwargs(on_black=True),
+            score_kwargs=self.score_predictor_kwargs(),
+        )
+        return self.inference
+
+    def _poll_inference_status(self):
+        """推論サービスの読み込み状況を、ブロックせずに問い合わせる"""
+        fut = self._status_future
+        if fut is not None and fut.done():
+            self._inference_status = fut.result() if fut.exception() is None else None
+            fut = None
+        if fut is None and (self._inference_status is None or not self._inference_status["ready"]):
+            fut = self.inference.submit("status")
+        self._status_future = fut
+        return self._inference_status
+
+    def model_loading_text(self):
+        """読み込み中なら進捗の文字列（例: "loading models 1/3"）、終わっていれば None"""
+        if self.inference is not None:
+            st = self._poll_inference_status()
+        elif self.score_predictor is not None:
+            st = self.score_predictor.status()
+        else:
+            return None
+        if st is None or st["ready"]:
+            return None
+        return f"loading models {st['done']}/{st['total']}"
+
+    def submit_score(self, image_path):
+        """
+        画像の採点をバックグラウンドで行い、スコア辞書(失敗時 None)の Future を返す
+        （推論サービス / 採点サーバー / ローカルのどれを使うかはここで吸収する）
+        """
+        if self.inference is None and self.score_predictor is None:
+            self.start_model_loading()
+        if self.inference is not None:
+            return self.inference.submit("score", image_path=image_path)
+        if self.score_predictor is None:
+            return None
+        if self._score_executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+
+            self._score_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="score")
+        fut = self._score_executor.submit(self.score_predictor.predict, image_path)
+        self.track_background(fut)
+        return fut
+
+    def start_retention(self):
+        """撮影画像・推定結果の整理係を用意する（実際に動くのはシーン切替のとき）"""
+        if not Config.RETENTION_ENABLED or self.retention is not None:
+            return self.retention
+        from services.retention import RetentionPolicy, RetentionService
+
+        limits = dict(
+            max_age_days=Config.RETENTION_MAX_AGE_DAYS,
+            max_files=Config.RETENTION_MAX_FILES,
+            max_mb=Config.RETENTION_MAX_MB,
+        )
+        self.retention = RetentionService(
+            [RetentionPolicy(Config.PATH_SHUTTER_DIR, **limits), RetentionPolicy(Config.PATH_OUTPUT_DIR, **limits)],
+            archive_dir=Config.PATH_ARCHIVE_DIR if Config.RETENTION_ARCHIVE else None,
+            min_interval=Config.RETENTION_INTERVAL,
+        )
+        return self.retention
+
+    def on_scene_switch(self, name):
+        """SceneManager がシーンを切り替えたときに呼ぶ（整理を裏に頼むだけ。今のゲームの画像は残す）"""
+        if self.retention is None:
+            return
+        protected = list(game_state.shutter_paths) + game_state.image_paths()
+        self.retention.request(protected=protected)
+
+    def track_background(self, job):
+        """重い裏処理（Future か Thread）を登録する。終わるまで is_inference_busy() が True"""
+        self._background_jobs.append(job)
+
+    def is_inference_busy(self):
+        """裏で推論・モデル読み込みをしているか（SceneManager.tick が fps を落とすのに使う）"""
+        self._background_jobs = [
+            j for j in self._background_jobs
+            if not (j.done() if hasattr(j, "done") else not j.is_alive())
+        ]
+        if self._background_jobs:
+            return True
+        if self.inference is not None and self.inference.pending() > 0:
+            return True
+        if self.score_predictor is not None and not self.score_predictor.is_ready():
+            return True
+        return False
+
+    def shutdown(self):
+        if self.inference is not None:
+            self.inference.close()
+            self.inference = None
+        if self._score_executor is not None:
+            self._score_executor.shutdown(wait=False, cancel_futures=True)
+            self._score_executor = None
+        if self.retention is not None:
+            self.retention.close()
+            self.retention = None
+        self.assets.close()
+        self._background_jobs = []  # 終わっていない裏処理は待たずに手放す
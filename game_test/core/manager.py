@@ -1,17 +1,33 @@
+import math
 import pygame
+from contextlib import nullcontext
 from core.scene import Scene
 
 class SceneManager:
-    def __init__(self, initial_scene: Scene, scene_factory):
+    MAX_IDLE = 1.0  # 止まっているシーンでも最低この間隔で update する（秒）
+
+    def __init__(self, initial_scene: Scene, scene_factory, profiler=None, on_switch=None):
         """
         initial_scene: 最初に表示するシーンインスタンス
         scene_factory: 名前からシーンを生成する関数 例) lambda name: ...
+        profiler: core.profiler.FrameProfiler（None なら計測しない）
+        on_switch: シーンを切り替えた後に on_switch(名前) を呼ぶ（裏の片付けなど。すぐ戻ること）
         """
         self.current_scene = initial_scene
         self.scene_factory = scene_factory
+        self.profiler = profiler
+        self.on_switch = on_switch
+        # 差分描画: 次の present で画面に反映する範囲（None は全画面）
+        self._rects = None
+        self._full_redraw = True
+        self._hud_shown = False
+        self._waited_events = []  # tick の event.wait で受け取ったイベント
         if hasattr(self.current_scene, "on_enter"):
             self.current_scene.on_enter()
 
+    def _measure(self, phase):
+        return self.profiler.measure(phase) if self.profiler else nullcontext()
+
     def switch_if_needed(self):
         """シーン側が next_scene_name をセットしていたら切替"""
         if self.current_scene.quit_requested:
@@ -19,22 +35,80 @@ class SceneManager:
 
         if self.current_scene.next_scene_name:
             next_name = self.current_scene.next_scene_name
-            if hasattr(self.current_scene, "on_exit"):
-                self.current_scene.on_exit()
-            self.current_scene = self.scene_factory(next_name)
-            if hasattr(self.current_scene, "on_enter"):
-                self.current_scene.on_enter()
+            with self._measure("create"):
+                if hasattr(self.current_scene, "on_exit"):
+                    self.current_scene.on_exit()
+                self.current_scene = self.scene_factory(next_name)
+            with self._measure("enter"):
+                if hasattr(self.current_scene, "on_enter"):
+                    self.current_scene.on_enter()
+            self._full_redraw = True  # 新しいシーンの最初のフレームは全画面
+            if self.on_switch is not None:
+                self.on_switch(next_name)
         return True
 
     def run_frame(self, surface, dt):
         """1フレーム分のイベント処理→更新→描画"""
-        events = pygame.event.get()
-        for e in events:
-            if e.type == pygame.QUIT:
-                self.current_scene.request_quit()
+        if self.profiler:
+            self.profiler.begin_frame(self.current_scene)
+
+        with self._measure("events"):
+            events = self._waited_events + pygame.event.get()
+            self._waited_events = []
+            for e in events:
+                if e.type == pygame.QUIT:
+                    self.current_scene.request_quit()
+                elif e.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                    self._full_redraw = True
+            if self.profiler:
+                self.profiler.handle_events(events)
+            self.current_scene.handle_events(events)
+
+        with self._measure("update"):
+            self.current_scene.update(dt)
+
+        rects = self.current_scene.dirty_rects()
+        hud = self.profiler is not None and self.profiler.show
+        if self._full_redraw or hud or self._hud_shown:
+            rects = None  # HUD 表示中（と消した直後）も全体を描く
+        self._full_redraw = False
+        self._hud_shown = hud
+        self._rects = rects
+
+        if rects != []:
+            with self._measure("draw"):
+                self.current_scene.draw(surface)
 
-        self.current_scene.handle_events(events)
-        self.current_scene.update(dt)
-        self.current_scene.draw(surface)
+        if self.profiler:
+            self.profiler.draw(surface)
 
         return self.switch_if_needed()
+
+    def tick(self, clock, fps, busy_fps=None, is_busy=None):
+        """
+        次のフレームまで待って dt(秒) を返す（clock.tick の代わり）
+        - シーンの idle_timeout() が秒数を返したら、入力が来るかその時間まで event.wait で眠る
+        - is_busy() が True の間（裏で推論中など）は busy_fps に落として CPU を譲る
+        """
+        if busy_fps and is_busy is not None and is_busy():
+            fps = min(fps, busy_fps)
+
+        timeout = self.current_scene.idle_timeout()
+        hud = self.profiler is not None and self.profiler.show
+        if timeout is not None and timeout > 0 and not hud and not self._full_redraw:
+            # event.wait(0) は「時間切れなしで待つ」なので、1ms 未満でも 1ms は待つ形にする
+            ev = pygame.event.wait(max(1, math.ceil(min(timeout, self.MAX_IDLE) * 1000)))
+            if ev.type != pygame.NOEVENT:
+                self._waited_events.append(ev)
+        # 眠っていた分はここでは待たない（入力が続くときも fps 以上にはならない）
+        return clock.tick(fps) / 1000.0
+
+    def present(self):
+        """画面に反映する（flip の時間も計測に入れる）。差分描画のシーンは変わった範囲だけ"""
+        with self._measure("flip"):
+            if self._rects is None:
+                pygame.display.flip()
+            elif self._rects:
+                pygame.display.update(self._rects)
+        if self.profiler:
+            self.profiler.end_frame()
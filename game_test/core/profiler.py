@@ -0,0 +1,188 @@
+import csv
+import os
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
+import pygame
+
+
+class FrameProfiler:
+    """
+    1フレームの中のフェーズごとの時間を測ってリングバッファに貯める（SceneManager から使う）
+    フェーズ: events / update / draw / create(前シーンの on_exit + 次シーン生成) / enter(on_enter) / flip / hud
+    F3: グラフ表示の ON/OFF、F4: バッファを CSV に書き出し
+    """
+
+    PHASES = ("events", "update", "draw", "create", "enter", "flip", "hud")
+    COLUMNS = ("frame", "time", "scene") + PHASES + ("total",)
+    COLORS = {
+        "events": (120, 120, 255),
+        "update": (80, 220, 120),
+        "draw": (255, 200, 60),
+        "create": (255, 80, 80),
+        "enter": (255, 120, 200),
+        "flip": (160, 160, 160),
+        "hud": (90, 90, 90),
+    }
+
+    TOGGLE_KEY = pygame.K_F3
+    DUMP_KEY = pygame.K_F4
+
+    GRAPH_W = 300
+    GRAPH_H = 90
+    GRAPH_MAX_MS = 50.0  # グラフの上端（これより重いフレームははみ出た扱い）
+
+    def __init__(self, size=600, dump_dir=".", budget_ms=1000 / 60, show=False):
+        self.records = deque(maxlen=size)
+        self.dump_dir = dump_dir
+        self.budget_ms = budget_ms
+        self.show = show
+        self.frame_no = 0
+        self._current = None
+        self._font = None
+        self._hud_surf = None
+        self._text_surfs = []
+        self._graph = None
+        self._graphed_frame = 0
+
+    # -------------------------
+    # 計測
+    # -------------------------
+    def begin_frame(self, scene):
+        if self._current is not None:
+            self.end_frame()
+        self.frame_no += 1
+        self._current = {
+            "frame": self.frame_no,
+            "time": time.time(),
+            "scene": type(scene).__name__,
+            "_start": time.perf_counter(),
+        }
+
+    @contextmanager
+    def measure(self, phase):
+        """with profiler.measure("draw"): ... で、その区間の時間(ms)を今のフレームに足す"""
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            if self._current is not None:
+                ms = (time.perf_counter() - t0) * 1000
+                self._current[phase] = self._current.get(phase, 0.0) + ms
+
+    def end_frame(self):
+        """flip の後に呼ぶ（呼ばなくても次の begin_frame で締める）"""
+        rec = self._current
+        if rec is None:
+            return
+        rec["total"] = (time.perf_counter() - rec.pop("_start")) * 1000
+        self.records.append(rec)
+        self._current = None
+
+    # -------------------------
+    # キー操作
+    # -------------------------
+    def handle_events(self, events):
+        for e in events:
+            if e.type != pygame.KEYDOWN:
+                continue
+            if e.key == self.TOGGLE_KEY:
+                self.show = not self.show
+                self._graph = None  # 表示し直すときはバッファから描き直す
+            elif e.key == self.DUMP_KEY:
+                self.dump_csv()
+
+    def dump_csv(self, path=None):
+        if path is None:
+            os.makedirs(self.dump_dir, exist_ok=True)
+            name = datetime.now().strftime("frames_%Y%m%d_%H%M%S.csv")
+            path = os.path.join(self.dump_dir, name)
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(self.COLUMNS)
+            for rec in list(self.records):
+                row = [rec["frame"], datetime.fromtimestamp(rec["time"]).isoformat(timespec="milliseconds"), rec["scene"]]
+                row += [round(rec.get(c, 0.0), 3) for c in self.COLUMNS[3:]]
+                writer.writerow(row)
+        print(f"[profiler] {len(self.records)} frames -> {path}")
+        return path
+
+    # -------------------------
+    # 表示
+    # -------------------------
+    def draw(self, surface):
+        if not self.show:
+            return
+        with self.measure("hud"):
+            self._draw_hud(surface)
+
+    BAR_W = 2
+
+    def _draw_bar(self, graph, x, rec):
+        """1フレーム分の積み上げ棒を graph の x 列に描く"""
+        scale = self.GRAPH_H / self.GRAPH_MAX_MS
+        y = self.GRAPH_H
+        for phase in self.PHASES:
+            ms = rec.get(phase)
+            if not ms:
+                continue
+            h = max(1, int(ms * scale))
+            y -= h
+            if y < 0:
+                h += y
+                y = 0
+            if h > 0:
+                graph.fill(self.COLORS[phase], (x, y, self.BAR_W, h))
+
+    def _update_graph(self):
+        """グラフ面は毎フレーム作り直さず、左に流して新しいフレームの棒だけ足す"""
+        records = list(self.records)
+        if self._graph is None:
+            self._graph = pygame.Surface((self.GRAPH_W, self.GRAPH_H), pygame.SRCALPHA)
+            self._graphed_frame = 0
+        new = [r for r in records if r["frame"] > self._graphed_frame]
+        new = new[-(self.GRAPH_W // self.BAR_W):]
+        if not new:
+            return
+        shift = len(new) * self.BAR_W
+        self._graph.scroll(-shift, 0)
+        self._graph.fill((0, 0, 0, 0), (self.GRAPH_W - shift, 0, shift, self.GRAPH_H))
+        x = self.GRAPH_W - shift
+        for rec in new:
+            self._draw_bar(self._graph, x, rec)
+            x += self.BAR_W
+        self._graphed_frame = new[-1]["frame"]
+
+    def _draw_hud(self, surface):
+        if self._font is None:
+            self._font = pygame.font.Font(None, 18)
+            self._hud_surf = pygame.Surface((self.GRAPH_W, self.GRAPH_H + 36), pygame.SRCALPHA)
+
+        hud = self._hud_surf
+        hud.fill((0, 0, 0, 170))
+        gy = 36
+        self._update_graph()
+        hud.blit(self._graph, (0, gy))
+
+        # 目安の線（60fps の1フレーム）
+        budget_y = gy + self.GRAPH_H - int(self.budget_ms * self.GRAPH_H / self.GRAPH_MAX_MS)
+        pygame.draw.line(hud, (255, 60, 60), (0, budget_y), (self.GRAPH_W, budget_y))
+
+        # 文字は 10 フレームに1回だけ作り直す（毎フレーム render すると HUD 自体が重い）
+        if self.records and (not self._text_surfs or self.frame_no % 10 == 0):
+            recent = list(self.records)[-self.GRAPH_W // self.BAR_W:]
+            totals = sorted(r["total"] for r in recent)
+            p95 = totals[min(len(totals) - 1, int(len(totals) * 0.95))]
+            last = recent[-1]
+            line1 = f"{last['scene']}  frame {last['total']:.1f}ms  p95 {p95:.1f}ms  max {totals[-1]:.1f}ms"
+            line2 = "  ".join(f"{p} {last.get(p, 0.0):.1f}" for p in self.PHASES if p in last)
+            self._text_surfs = [
+                self._font.render(line1, True, (255, 255, 255)),
+                self._font.render(line2, True, (200, 200, 200)),
+            ]
+        for i, t in enumerate(self._text_surfs):
+            hud.blit(t, (4, 3 + i * 16))
+
+        surface.blit(hud, (surface.get_width() - self.GRAPH_W - 4, 4))
@@ -21,6 +21,37 @@ class Scene:
         """描画処理"""
         pass
 
+    def dirty_rects(self):
+        """
+        差分描画したいシーンだけ上書きする（update の後、draw の前に呼ばれる）
+        None       : 全画面を描いて flip（今まで通り）
+        []         : 何も変わっていない → draw も画面の更新もしない
+        [Rect, ...]: draw した後、その範囲だけ画面に反映する
+        """
+        return None
+
+    def idle_timeout(self):
+        """
+        何も動いていないシーンだけ上書きする（SceneManager.tick が見る）
+        None   : アニメーション中（いつもの fps で回す）
+        秒数   : 入力が来るかその秒数が経つまで眠ってよい（math.inf なら入力まで）
+        """
+        return None
+
+    def changed_rects(self, regions):
+        """
+        dirty_rects 用の補助。regions = {名前: (Rect, 見た目を決める値)}
+        前回呼ばれたときから値が変わった領域の Rect だけを返す
+        """
+        prev = getattr(self, "_region_keys", {})
+        rects = [
+            pygame.Rect(rect)
+            for name, (rect, key) in regions.items()
+            if name not in prev or prev[name] != key
+        ]
+        self._region_keys = {name: key for name, (rect, key) in regions.items()}
+        return rects
+
     def request_quit(self):
         self.quit_requested = True
 
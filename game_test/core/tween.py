@@ -0,0 +1,31 @@
+"""
+dt（経過秒）ベースのアニメーション用の小道具。
+「1フレームで ○○ 進む」と書くと fps が落ちたときにアニメまで遅くなるので、
+シーンの update(dt) ではこっちを使う。
+
+    x = approach(x, 255, 300, dt)        # 毎秒 300 ずつ目標へ（元: 毎フレーム +5）
+    y = damp(y, target, 0.12, dt)        # 毎フレーム差の 12% 近づく動きを 60fps 基準で再現
+    speed = decay(speed, 0.95, dt)       # 毎フレーム 0.95 倍を 60fps 基準で再現
+"""
+
+BASE_FPS = 60  # 「毎フレーム」で調整された元の値は 60fps 前提
+
+
+def approach(current, target, speed, dt):
+    """current を毎秒 speed の速さで target に近づける（行き過ぎない）"""
+    step = speed * dt
+    if abs(target - current) <= step:
+        return target
+    return current + step if target > current else current - step
+
+
+def damp(current, target, rate_per_frame, dt, fps=BASE_FPS):
+    """毎フレーム「残りの rate_per_frame 倍」だけ近づくイージングを dt で計算する"""
+    k = 1.0 - (1.0 - rate_per_frame) ** (dt * fps)
+    return current + (target - current) * k
+
+
+def decay(value, factor_per_frame, dt, fps=BASE_FPS):
+    """毎フレーム factor_per_frame 倍される減衰を dt で計算する"""
+    return value * factor_per_frame ** (dt * fps)
+
@@ -1,22 +1,25 @@
-import pygame
-from core.manager import SceneManager
-from scenes.title_scene_class import TitleScene
-from scenes.pose_scene import PoseEstimationScene
-from scenes.ex_game_scene_class import ExGameScene      ##例（本番は使わない）
-from scenes.ex_result_scene_class import ExResultScene  ##例（本番は使わない）
-##ここに自分のクラス名とファイル名を追加してください！
-from scenes.score_screen import ScoreScene
-from common import AppContext, game_state
-
-from scenes.howto_scene_class import HowToScene
-from scenes.roulette_scene_class import RouletteScene
-from scenes.camera_scene_class import CameraScene
-
-from scenes.round_result_scene_class import RoundResultScene
-from scenes.final_result_scene_class import FinalResultScene
+# ゲームの import はすべて関数の中で行う。
+# 推論サービス（services/inference_service.py）は spawn で子プロセスを作るので、子プロセスでも
+# このファイルが __mp_main__ として読み込まれる。ここで pygame やシーンを import すると推論側にまで読み込まれてしまう。
 
 
 def create_scene_factory(app):
+    from scenes.title_scene_class import TitleScene
+    from scenes.pose_scene import PoseEstimationScene
+    from scenes.ex_game_scene_class import ExGameScene      ##例（本番は使わない）
+    from scenes.ex_result_scene_class import ExResultScene  ##例（本番は使わない）
+    ##ここに自分のクラス名とファイル名を追加してください！
+    from scenes.score_screen import ScoreScene
+    from common import Config, game_state
+
+    from scenes.howto_scene_class import HowToScene
+    from scenes.roulette_scene_class import RouletteScene
+    from scenes.camera_scene_class import CameraScene
+
+    from scenes.round_result_scene_class import RoundResultScene
+    from scenes.final_result_scene_class import FinalResultScene
+    from scenes.leaderboard_scene_class import LeaderboardScene
+
     def create_scene(name: str):
         ##ここに自分のクラス名とシーン名を追加してください！
         ##シーンの順番通りに並んでると、わかりやすくて嬉しいです！
@@ -25,7 +28,7 @@ def create_scene_factory(app):
         
         # タイトル
         if name == "title":
-            return TitleScene()
+            return TitleScene(app)
 
         # 工藤が追加
         # ルール説明
@@ -54,21 +57,24 @@ def create_scene_factory(app):
             if game_state.shutter_paths: # 最新の撮影画像を追加
                 image_list.extend(game_state.shutter_paths)
 
-            return PoseEstimationScene(app, image_paths=image_list, on_black=True, save_dir="game_test/outputs_estimated")
+            return PoseEstimationScene(app, image_paths=image_list, on_black=True, save_dir=Config.PATH_OUTPUT_DIR)
         
         # モデルを使って得点を計算するファイルが必要？
 
         # 得点中間発表 
         elif name == "score":
-            return ScoreScene()
+            return ScoreScene(app)
         
         # 川島が追加
         # 細かい点数発表(得点中間発表の前？)
         elif name == "round_result":
-            return RoundResultScene()
+            return RoundResultScene(app)
         # 最終結果発表
         elif name == "final_result":
-            return FinalResultScene()
+            return FinalResultScene(app)
+        # 歴代ランキング（タイトルで L キー）
+        elif name == "leaderboard":
+            return LeaderboardScene(app)
 
         # 例（本番は使わない）
         elif name == "ex_game":
@@ -82,14 +88,29 @@ def create_scene_factory(app):
     return create_scene
 
 def main():
+    import pygame
+    from core.manager import SceneManager
+    from core.profiler import FrameProfiler
+    from common import AppContext, Config
+    from scenes.title_scene_class import TitleScene
+
     pygame.init()
     screen = pygame.display.set_mode((800, 600))
     clock = pygame.time.Clock()
 
     app = AppContext(screen)
+    # 採点モデルはタイトル画面の裏で読み込む
+    app.start_model_loading()
+    # 撮影画像・推定結果が溜まりすぎないように、シーン切替のたびに裏で整理する
+    app.start_retention()
+    profiler = None
+    if Config.FRAME_PROFILER:
+        profiler = FrameProfiler(size=Config.FRAME_PROFILER_SIZE, dump_dir=Config.PATH_PROFILE_DIR)
     manager = SceneManager(
-        initial_scene=TitleScene(),
+        initial_scene=TitleScene(app),
         scene_factory=create_scene_factory(app),
+        profiler=profiler,
+        on_switch=app.on_scene_switch,
     )
 
     
@@ -99,10 +120,12 @@ def main():
 
     running = True
     while running:
-        dt = clock.tick(60) / 1000.0
+        # 止まっている画面では入力まで眠り、裏で推論中は fps を落とす
+        dt = manager.tick(clock, Config.FPS, busy_fps=Config.BUSY_FPS, is_busy=app.is_inference_busy)
         running = manager.run_frame(screen, dt)
-        pygame.display.flip()
+        manager.present()
 
+    app.shutdown()
     pygame.quit()
 
 if __name__ == "__main__":
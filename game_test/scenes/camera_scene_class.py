@@ -6,6 +6,7 @@ import pygame
 from core.scene import Scene
 
 from common import Config, Utils, game_state
+from score_store import score_store
 
 
 class CameraScene(Scene):
@@ -75,6 +76,8 @@ class CameraScene(Scene):
         self.after_shutter_timer = 0.0
         self.dummy_surf.set_alpha(255)
         game_state.shutter_paths = []
+        # 撮影1回 = 1ラウンド。得点はこのラウンドに記録される
+        game_state.round_id = score_store.start_round(theme=game_state.theme)
         self.shutter_anim_timer = 0.0
         self.shutter_anim_active = False
 
@@ -284,6 +287,8 @@ class CameraScene(Scene):
         if ok:
             print(f"Saved shutter frame: {save_path}")
             game_state.shutter_paths.append(save_path)
+            # 1枚目 = 1P、2枚目 = 2P
+            game_state.record_image(game_state.round_id, len(game_state.shutter_paths), save_path)
         else:
             print(f"Failed to save shutter frame: {save_path}")
 
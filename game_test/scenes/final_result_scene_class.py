@@ -4,77 +4,57 @@ import time
 import os
 from core.scene import Scene
 from pathlib import Path
+from common import LayerPool, RotationCache, font_registry, game_state
+from score_store import score_store
 
-def get_result_image_path(first_player_win: bool):
+def get_result_image_path(player: int, session_id=None):
     """
-    first_player_win:
-        True  -> 先攻勝利（2番目に新しい画像）
-        False -> 後攻勝利（最も新しい画像）
+    勝ったプレイヤーの画像（最後のラウンド）。
+    骨格推定の出力（outputs_estimated）を優先し、無ければ撮影画像、それも無ければ DB の採点記録から探す。
     """
-
-    # ★ このファイル（final_result_scene_class.py）の場所
-    base_dir = os.path.dirname(__file__)
-
-    # ★ scenes/ の1つ上 = game_test/
-    game_root = os.path.abspath(os.path.join(base_dir, ".."))
-
-    # ★ outputs_estimated フォルダ
-    image_dir = os.path.join(game_root, "outputs_estimated")
-
-    if not os.path.exists(image_dir):
-        print("[WARN] outputs_estimated not found:", image_dir)
-        return None
-
-    image_files = [
-        f for f in os.listdir(image_dir)
-        if f.startswith("shutter_") and f.endswith(".jpg")
-    ]
-
-    if not image_files:
-        return None
-
-    # ファイル名順 = 時刻順
-    image_files.sort()
-
-    if first_player_win:
-        selected = image_files[-2] if len(image_files) >= 2 else image_files[-1]
-    else:
-        selected = image_files[-1]
-
-    return os.path.join(image_dir, selected)
+    candidates = (
+        game_state.get_image(player, kind="pose"),
+        game_state.get_image(player, kind="shutter"),
+        score_store.player_image(player, session_id),
+    )
+    for path in candidates:
+        if path is not None and os.path.exists(path):
+            return path
+    print(f"[WARN] result image not found for {player}P:", candidates)
+    return None
 
 
 class FinalResultScene(Scene):
-    def __init__(self):
-        super().__init__()
+    # 写真の回転はキャッシュから取る（毎フレーム rotate しない）
+    PHOTO_SMOOTH_ROTATE = True  # rotozoom でなめらかに回す
+    FAST_SPIN_STEP = 8          # Phase3 の高速回転は 8度刻みで十分（1フレームで12度進む）
+    WARM_PER_FRAME = 1          # Phase1/2 の間に1フレームあたり作っておく枚数（rotozoom 1枚で約3ms）
+
+    def __init__(self, app=None):
+        super().__init__(app)
+        # 演出用レイヤー（app があれば共有のプールを使う）
+        self.layers = app.layers if app else LayerPool((800, 600))
 
         # ==============================
-        # スコア読み込み
+        # スコア読み込み（このゲームの全ラウンド合計）
         # ==============================
-        def load_total_score(filename):
-            if not os.path.exists(filename):
-                return 0
-            total = 0
-            with open(filename, "r", encoding="utf-8") as f:
-                for line in f:
-                    for part in line.strip().split(","):
-                        if part.strip().isdigit():
-                            total += int(part)
-            return total
-
-        def clear_score_file(filename):
-            with open(filename, "w", encoding="utf-8") as f:
-                f.write("")
-
-        score_1p = load_total_score("1Pscores.txt")
-        score_2p = load_total_score("2Pscores.txt")
-
-        clear_score_file("1Pscores.txt")
-        clear_score_file("2Pscores.txt")
+        score_store.flush()  # 裏で書き込み中の得点を待つ
+        session_id = score_store.current_session()
+        # RoundResultScene に出した合計（項目ごとに四捨五入した整数）を足したもの
+        totals = score_store.session_totals(session_id)
+        score_1p = totals[1]
+        score_2p = totals[2]
 
         self.IS_DRAW = (score_1p == score_2p)
         self.FIRST_PLAYER_WIN = score_1p > score_2p
 
+        winner = None if self.IS_DRAW else (1 if self.FIRST_PLAYER_WIN else 2)
+        image_path = get_result_image_path(winner, session_id) if winner else None
+
+        # ゲーム終了：次のゲームは新しいセッションになる（記録は消さない）
+        score_store.end_session(session_id)
+        game_state.reset_scores()
+
         # ==============================
         # 画面
         # ==============================
@@ -90,11 +70,11 @@ class FinalResultScene(Scene):
             self.TEXT_STR = "DRAW"
         elif self.FIRST_PLAYER_WIN:
             self.BACKGROUND_COLOR = (255, 80, 80)
-            self.IMAGE_FILENAME = get_result_image_path(first_player_win=True)
+            self.IMAGE_FILENAME = image_path
             self.TEXT_STR = "WINNER 1P!"
         else:
             self.BACKGROUND_COLOR = (80, 80, 255)
-            self.IMAGE_FILENAME = get_result_image_path(first_player_win=False)
+            self.IMAGE_FILENAME = image_path
             self.TEXT_STR = "WINNER 2P!"
 
         # ==============================
@@ -132,6 +112,7 @@ class FinalResultScene(Scene):
         # 画像（勝利時のみ）
         # ==============================
         self.photo = None
+        self.photo_rotations = None
         if self.IMAGE_FILENAME:
             photo = pygame.image.load(self.IMAGE_FILENAME).convert_alpha()
             r = min(self.WIDTH*0.45/photo.get_width(), self.HEIGHT*0.65/photo.get_height())
@@ -139,13 +120,16 @@ class FinalResultScene(Scene):
                 photo,
                 (int(photo.get_width()*r), int(photo.get_height()*r))
             )
+            self.photo_rotations = RotationCache(self.photo, step=1, smooth=self.PHOTO_SMOOTH_ROTATE)
+            self._warm_angles = iter(range(0, 360, self.FAST_SPIN_STEP))
 
         # ==============================
         # フォント
         # ==============================
         cur = os.path.dirname(__file__)
         main = os.path.join(cur, "../font/Paintball_Beta_3.ttf")
-        self.font = pygame.font.Font(main, self.FONT_SIZE)
+        fonts = app.fonts if app else font_registry
+        self.font = fonts.get(main, self.FONT_SIZE)
 
         base = self.font.render(self.TEXT_STR, True, (255,255,255))
         shadow = self.font.render(self.TEXT_STR, True, (0,0,0))
@@ -154,10 +138,15 @@ class FinalResultScene(Scene):
         self.text_surface = pygame.transform.rotate(base, self.TEXT_ANGLE)
         self.shadow_surface = pygame.transform.rotate(shadow, self.TEXT_ANGLE)
 
-        self.outlines = []
+        # 縁取り8枚と本体は1枚に重ねておく（毎フレーム9回 blit しない）
+        outline = pygame.transform.rotate(self.font.render(self.TEXT_STR, True, (0,0,0)), self.TEXT_ANGLE)
+        pad = max(max(abs(ox), abs(oy)) for ox, oy in self.OUTLINE_OFFSETS)
+        w, h = self.text_surface.get_size()
+        self.outlined_text = pygame.Surface((w + pad*2, h + pad*2), pygame.SRCALPHA)
         for ox, oy in self.OUTLINE_OFFSETS:
-            s = self.font.render(self.TEXT_STR, True, (0,0,0))
-            self.outlines.append((pygame.transform.rotate(s, self.TEXT_ANGLE), ox, oy))
+            self.outlined_text.blit(outline, (pad+ox, pad+oy))
+        self.outlined_text.blit(self.text_surface, (pad, pad))
+        self.outline_pad = pad
 
         self.text_w, _ = self.text_surface.get_size()
         self.text_x = -self.text_w
@@ -209,18 +198,49 @@ class FinalResultScene(Scene):
 
         self.current_width = self.initial_width
         self.current_angle = 0.0
+        self.beam_length = int(math.hypot(self.WIDTH, self.HEIGHT) * 2)
 
         self.text_active = False
         self.text_fixed = False
 
+    # ==============================
+    # 白線（回転した長方形の4つの角）
+    # ==============================
+    def beam_points(self):
+        """幅 current_width・長さ 画面対角線×2 の長方形を current_angle 回した頂点（画像を作らずに描く）"""
+        hw = max(1, int(self.current_width)) / 2
+        hh = self.beam_length / 2
+        c = pygame.math.Vector2(self.CENTER)
+        # transform.rotate と同じ向き（画面上で反時計回り）
+        return [c + pygame.math.Vector2(x, y).rotate(-self.current_angle)
+                for x, y in ((-hw, -hh), (hw, -hh), (hw, hh), (-hw, hh))]
+
     # ==============================
     # ドーナツ描画
     # ==============================
     def draw_donut(self, surface, inner, outer, alpha):
-        tmp = pygame.Surface((self.WIDTH, self.HEIGHT), pygame.SRCALPHA)
-        pygame.draw.circle(tmp, (255,255,255,alpha), self.CENTER, outer)
-        pygame.draw.circle(tmp, (0,0,0,0), self.CENTER, inner)
-        surface.blit(tmp, (0,0))
+        # 輪は width 付きの circle で1回で描く（内側をくり抜かない）
+        width = outer - inner if inner > 0 else 0
+        with self.layers.layer() as tmp:
+            r = pygame.draw.circle(tmp, (255,255,255,alpha), self.CENTER, outer, width)
+            surface.blit(tmp, r, r)  # 輪がある範囲だけ合成
+
+    # ==============================
+    # 写真の回転
+    # ==============================
+    def rotated_photo(self):
+        step = self.FAST_SPIN_STEP if self.phase == 3 else None
+        return self.photo_rotations.get(self.rotation_angle, step=step)
+
+    def warm_photo_rotations(self):
+        """Phase3 の高速回転で使う角度を、描画が軽い Phase1/2 のうちに少しずつ作っておく"""
+        if self.photo_rotations is None or self._warm_angles is None:
+            return
+        angles = [a for _, a in zip(range(self.WARM_PER_FRAME), self._warm_angles)]
+        if not angles:
+            self._warm_angles = None
+            return
+        self.photo_rotations.warm(angles, step=self.FAST_SPIN_STEP)
 
     # ==============================
     # update
@@ -229,6 +249,9 @@ class FinalResultScene(Scene):
         now = time.time()
         elapsed = now - self.phase_start
 
+        if self.phase <= 2:
+            self.warm_photo_rotations()
+
         # Phase1：白線回転拡大
         if self.phase == 1:
             if elapsed < self.pause_time:
@@ -311,11 +334,7 @@ class FinalResultScene(Scene):
         # Phase1：白線
         if self.phase == 1:
             surface.fill((0,0,0))
-            diag = int(math.hypot(self.WIDTH, self.HEIGHT) * 2)
-            line = pygame.Surface((max(1,int(self.current_width)), diag), pygame.SRCALPHA)
-            line.fill((255,255,255))
-            rot = pygame.transform.rotate(line, self.current_angle)
-            surface.blit(rot, rot.get_rect(center=self.CENTER))
+            pygame.draw.polygon(surface, (255,255,255), self.beam_points())
             return
 
         # Phase2：フェード
@@ -347,13 +366,12 @@ class FinalResultScene(Scene):
                 if self.donut2.active:
                     self.draw_donut(surface, self.donut2.inner, self.donut2.outer, 230)
 
-            rotated = pygame.transform.rotate(self.photo, self.rotation_angle)
+            rotated = self.rotated_photo()
             rect = rotated.get_rect(center=(self.photo_x, self.CENTER[1]))
             surface.blit(rotated, rect)
 
             if self.text_active:
                 surface.blit(self.shadow_surface,
                     (self.text_x+self.SHADOW_OFFSET[0], self.text_y+self.SHADOW_OFFSET[1]))
-                for s, ox, oy in self.outlines:
-                    surface.blit(s, (self.text_x+ox, self.text_y+oy))
-                surface.blit(self.text_surface, (self.text_x, self.text_y))
+                surface.blit(self.outlined_text,
+                    (self.text_x-self.outline_pad, self.text_y-self.outline_pad))
@@ -2,6 +2,7 @@
 import math
 import pygame
 from core.scene import Scene
+from core.tween import decay
 
 from common import Config
 
@@ -78,7 +79,7 @@ class HowToScene(Scene):
                 self.sim_roulette_state = 1
 
         elif self.sim_roulette_state == 1:
-            self.sim_roulette_speed *= 0.92
+            self.sim_roulette_speed = decay(self.sim_roulette_speed, 0.92, dt)
             self.sim_scroll_y += self.sim_roulette_speed * dt
             if self.sim_roulette_speed < 10.0:
                 target = round(self.sim_scroll_y / box_h) * box_h
@@ -194,6 +195,12 @@ class HowToScene(Scene):
         next_guide = self.renderer.render_system("SPACE で 次へ", 16, Config.GRAY)
         self.screen.blit(next_guide, (Config.SCREEN_WIDTH - 150, Config.SCREEN_HEIGHT - 25))
 
+        # 採点モデルの読み込み進捗
+        loading = self.app.model_loading_text() if self.app is not None else None
+        if loading:
+            t_load = self.renderer.render_system(loading, 14, Config.GRAY)
+            self.screen.blit(t_load, (Config.SCREEN_WIDTH // 2 - t_load.get_width() // 2, Config.SCREEN_HEIGHT - 22))
+
         # キャラ
         red_img = self.app.resource_manager.char_red
         if red_img:
@@ -0,0 +1,124 @@
+# scenes/leaderboard_scene_class.py
+import datetime
+
+import pygame
+from core.scene import Scene
+
+from common import Config
+from score_store import LEADERBOARD_COLUMNS, score_store
+
+
+class LeaderboardScene(Scene):
+    """
+    歴代ランキング画面（セッションをまたいだ上位 N 件）
+    ←→: 項目（合計 / Dynamic / Stable / Unique）
+    ↑↓: お題（全部 → Config.THEMES の順）
+    D  : 今日だけ / 全期間
+    SPACE / ESC: タイトルへ戻る
+    """
+
+    SCREEN_WIDTH = 800
+    SCREEN_HEIGHT = 600
+
+    ROWS = 10  # 画面に出す件数（DB からもこの件数だけ読む）
+    ROW_H = 40
+    TOP_Y = 150
+
+    COMPONENTS = list(LEADERBOARD_COLUMNS.keys())
+    BG_COLOR = (20, 24, 40)
+    TEXT_COLOR = (255, 255, 255)
+    SUB_COLOR = (170, 180, 200)
+    RANK_COLORS = {1: (255, 215, 0), 2: (200, 200, 210), 3: (205, 127, 50)}
+
+    def __init__(self, app):
+        super().__init__(app)
+        self.component_index = 0
+        self.themes = [None] + list(Config.THEMES)
+        self.theme_index = 0
+        self.today_only = False
+
+        self.rows = []
+        self.row_surfaces = []
+        self.header_surfaces = []
+        self._dirty = True
+
+    # -------------------------
+    # 絞り込み
+    # -------------------------
+    @property
+    def component(self):
+        return self.COMPONENTS[self.component_index]
+
+    @property
+    def theme(self):
+        return self.themes[self.theme_index]
+
+    def reload(self):
+        """条件が変わったときだけ DB から表示する分を読み直して、文字を作っておく"""
+        score_store.flush()
+        day = datetime.date.today().isoformat() if self.today_only else None
+        self.rows = score_store.top_scores(self.ROWS, component=self.component, theme=self.theme, day=day)
+        self.render_rows()
+        self._dirty = False
+
+    def render_rows(self):
+        r = self.renderer
+        theme = self.theme if self.theme is not None else "ぜんぶ"
+        period = "TODAY" if self.today_only else "ALL"
+        self.header_surfaces = [
+            (r.render("ランキング", 48, self.TEXT_COLOR), 30),
+            (r.render(f"- {self.component} -   おだい: {theme}   {period}", 24, self.SUB_COLOR), 100),
+        ]
+
+        self.row_surfaces = []
+        for row in self.rows:
+            color = self.RANK_COLORS.get(row["rank"], self.TEXT_COLOR)
+            left = r.render(f"{row['rank']:>2}.  {row['player']}P  {row['theme']}", 26, color)
+            # Total は結果画面と同じ整数、項目別は小数1桁
+            score = f"{row['score']:.0f}" if self.component == "Total" else f"{row['score']:.1f}"
+            right = r.render(f"{score}   {row['day']}", 26, color)
+            self.row_surfaces.append((left, right))
+
+        if not self.rows:
+            self.row_surfaces.append((r.render("まだ きろく が ありません", 26, self.SUB_COLOR), None))
+
+    # -------------------------
+    # Scene API
+    # -------------------------
+    def handle_events(self, events):
+        for e in events:
+            if e.type != pygame.KEYDOWN:
+                continue
+            if e.key in (pygame.K_SPACE, pygame.K_ESCAPE):
+                self.request_next("title")
+            elif e.key == pygame.K_RIGHT:
+                self.component_index = (self.component_index + 1) % len(self.COMPONENTS)
+                self._dirty = True
+            elif e.key == pygame.K_LEFT:
+                self.component_index = (self.component_index - 1) % len(self.COMPONENTS)
+                self._dirty = True
+            elif e.key == pygame.K_DOWN:
+                self.theme_index = (self.theme_index + 1) % len(self.themes)
+                self._dirty = True
+            elif e.key == pygame.K_UP:
+                self.theme_index = (self.theme_index - 1) % len(self.themes)
+                self._dirty = True
+            elif e.key == pygame.K_d:
+                self.today_only = not self.today_only
+                self._dirty = True
+
+    def update(self, dt):
+        if self._dirty:
+            self.reload()
+
+    def draw(self, surface):
+        surface.fill(self.BG_COLOR)
+        cx = self.SCREEN_WIDTH // 2
+        for s, y in self.header_surfaces:
+            surface.blit(s, s.get_rect(midtop=(cx, y)))
+
+        for i, (left, right) in enumerate(self.row_surfaces):
+            y = self.TOP_Y + i * self.ROW_H
+            surface.blit(left, (80, y))
+            if right is not None:
+                surface.blit(right, right.get_rect(topright=(self.SCREEN_WIDTH - 80, y)))
@@ -2,10 +2,36 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 
+import os
 from typing import Any, Dict, List, Optional, Tuple
 import cv2
 import numpy as np
-from ultralytics import YOLO
+
+
+# 推論ランタイム → ultralytics の export 形式で書き出されるパス
+# 例) yolo11n-pose.pt → yolo11n-pose.onnx / yolo11n-pose_openvino_model/
+RUNTIMES = ("torch", "onnx", "openvino")
+
+
+def exported_model_path(pt_path: str, runtime: str, quantized: bool = False) -> str:
+    """.pt のパスから、runtime 用に export されたモデルのパスを返す。"""
+    stem, _ = os.path.splitext(pt_path)
+    if runtime == "onnx":
+        # INT8 版は tools/quantize_models.py が作る
+        return stem + ("_int8.onnx" if quantized else ".onnx")
+    if runtime == "openvino":
+        return stem + "_openvino_model"
+    return pt_path
+
+
+def runtime_of(model_path: str) -> str:
+    """モデルパスの形式からランタイム名を判定する。"""
+    path = model_path.rstrip("/\\")
+    if path.endswith(".onnx"):
+        return "onnx"
+    if path.endswith("_openvino_model"):
+        return "openvino"
+    return "torch"
 
 
 class PoseEstimatorConfig:
@@ -17,13 +43,44 @@ class PoseEstimatorConfig:
         line_width: int = 2,
         draw_on_black_bg: bool = False, # ゲーム画面に重ねる前提なら False
         score_threshold: Optional[float] = None,
+        runtime: Optional[str] = None,  # None: model_path から判定 / "torch" / "onnx" / "openvino"
+        imgsz: int = 640,               # export 時と同じ入力サイズ
+        quantized: bool = False,        # True: INT8 版 ONNX を使う（runtime が None / "onnx" のときだけ）
     ):
+        if runtime is not None and runtime not in RUNTIMES:
+            raise ValueError(f"Unknown runtime: {runtime}")
         self.model_path = model_path
         self.device = device
         self.kpt_radius = kpt_radius
         self.line_width = line_width
         self.draw_on_black_bg = draw_on_black_bg
         self.score_threshold = score_threshold
+        self.runtime = runtime
+        self.imgsz = imgsz
+        self.quantized = quantized
+        if quantized:
+            if runtime in (None, "onnx"):
+                self.runtime = "onnx"
+            else:
+                # INT8 版は ONNX しか無い。指定されたランタイムの方を優先する
+                print(f"[WARN] INT8 model is ONNX only; keeping runtime={runtime} (quantized ignored)")
+                self.quantized = False
+
+    def resolve_model_path(self) -> str:
+        """
+        実際に読み込むモデルパスを返す。
+        .pt を指定して runtime="onnx"/"openvino" のときは export 済みモデルに差し替える
+        （見つからなければ警告して .pt のまま）。
+        """
+        if self.runtime in (None, "torch") or runtime_of(self.model_path) != "torch":
+            return self.model_path
+
+        exported = exported_model_path(self.model_path, self.runtime, self.quantized)
+        if os.path.exists(exported):
+            return exported
+        tool = "quantize_models.py" if self.quantized else "export_pose_model.py"
+        print(f"[WARN] exported model not found: {exported} (run tools/{tool}). using {self.model_path}")
+        return self.model_path
 
 
 class PoseEstimator:
@@ -36,13 +93,39 @@ class PoseEstimator:
 
     def __init__(self, config: Optional[PoseEstimatorConfig] = None):
         self.cfg = config or PoseEstimatorConfig()
-        self.model: YOLO = YOLO(self.cfg.model_path)
+        self.model_path = self.cfg.resolve_model_path()
+        self.runtime = runtime_of(self.model_path)
+        # ultralytics（torch ごと）はモデルを作るときまで import しない
+        from ultralytics import YOLO
+
+        # export 済みモデルはタスクを自動判定できないので明示する
+        if self.runtime == "torch":
+            self.model = YOLO(self.model_path)
+        else:
+            self.model = YOLO(self.model_path, task="pose")
+
+    def _predict_kwargs(self) -> Dict[str, Any]:
+        kwargs: Dict[str, Any] = {"device": self.cfg.device, "verbose": False}
+        if self.runtime != "torch":
+            # ONNX/OpenVINO は CPU 実行・固定入力サイズ
+            kwargs["device"] = self.cfg.device or "cpu"
+            kwargs["imgsz"] = self.cfg.imgsz
+        return kwargs
 
     def estimate(self, image_or_path: Any) -> Dict[str, Any]:
         """単一画像に対して骨格推定を行う。"""
-        results = self.model.predict(source=image_or_path, device=self.cfg.device, verbose=False)
-        res = results[0]
-
+        results = self.model.predict(source=image_or_path, **self._predict_kwargs())
+        return self._build_info(results[0], image_or_path)
+
+    def estimate_batch(self, images: List[np.ndarray]) -> List[Dict[str, Any]]:
+        """複数画像(ndarray)をまとめて1回で推論する。結果は estimate() と同じ形式のリスト。"""
+        if not images:
+            return []
+        results = self.model.predict(source=list(images), **self._predict_kwargs())
+        return [self._build_info(res, img) for res, img in zip(results, images)]
+
+    def _build_info(self, res, image_or_path: Any) -> Dict[str, Any]:
+        """ultralytics の推論結果1枚分を推論辞書にまとめる。"""
         # 画像サイズの取得
         if isinstance(image_or_path, np.ndarray):
             h, w = image_or_path.shape[:2]
@@ -1,8 +1,9 @@
 
 # -*- coding: utf-8 -*-
+import math
 import threading
 import traceback
-from typing import Optional, List, Tuple
+from typing import Any, Optional, List, Tuple
 
 import pygame
 import numpy as np
@@ -10,7 +11,8 @@ import cv2
 import os
 
 from core.scene import Scene
-from scenes.pose_estimate import PoseEstimator, PoseEstimatorConfig
+from common import Config, font_registry, game_state, text_cache
+from score_store import publish_player_score, score_store
 
 
 class PoseEstimationScene(Scene):
@@ -23,20 +25,15 @@ class PoseEstimationScene(Scene):
     SCREEN_HEIGHT = 600
     FPS = 60
 
-    CUSTOM_FONT_PATH = "title/Paintball_Beta_3.ttf"
+    CUSTOM_FONT_PATH = Config.PATH_FONT_PAINTBALL
     FONT_SIZE = 36
     TEXT_COLOR = (255, 196, 70)
     TEXT_SHADOW = (0, 0, 0)
     TEXT_DELAY_MS = 3000
 
     def load_font(self, path, size):
-        if os.path.isfile(path):
-            try:
-                return pygame.font.Font(path, size)
-            except:
-                pass
-        print("[WARN] font load failed, using default")
-        return pygame.font.Font(None, size)
+        # 読めなければ FontRegistry が標準フォントにしてくれる
+        return self.fonts.get(path, size)
 
     def __init__(
         self,
@@ -58,22 +55,20 @@ class PoseEstimationScene(Scene):
         self.on_black = on_black
         self.save_dir = save_dir
 
-        # Fonts
+        # Fonts（全シーン共有の FontRegistry から）
+        self.fonts = app.fonts if app else font_registry
         self.font = self.load_font(self.CUSTOM_FONT_PATH, self.FONT_SIZE)
 
-        # 推定器の準備（必要に応じて device="cuda" やしきい値の設定）
-        cfg = PoseEstimatorConfig(
-            model_path="yolo11n-pose.pt",
-            device=None,          # "cuda" なら高速
-            kpt_radius=5,
-            line_width=2,
-            draw_on_black_bg=on_black,
-            score_threshold=None,
-        )
-        self.estimator = PoseEstimator(cfg)
+        # 推論サービス（別プロセス）があればそちらに任せ、このプロセスでは YOLO を読み込まない
+        self.inference = getattr(app, "inference", None) if app else None
+        self.estimator = None
+        if self.inference is None:
+            from scenes.pose_estimate import PoseEstimator, PoseEstimatorConfig
+            self.estimator = PoseEstimator(PoseEstimatorConfig(**self.estimator_kwargs(on_black)))
 
         # スレッド関連
         self._thread: Optional[threading.Thread] = None
+        self._pending: List[Tuple[str, Any]] = []  # 推論サービスに投げた (画像パス, Future)
         self._done: bool = False
         self._error: Optional[str] = None
 
@@ -82,16 +77,45 @@ class PoseEstimationScene(Scene):
         self._infos: List[dict] = []
         self._index: int = 0
 
+    @staticmethod
+    def estimator_kwargs(on_black: bool) -> dict:
+        """PoseEstimatorConfig の引数（推論サービス側でも同じ設定で作る）"""
+        return dict(
+            model_path=Config.POSE_MODEL_PATH,
+            runtime=Config.POSE_RUNTIME,  # "onnx" / "openvino" で CPU 向けの export 済みモデルを使う
+            quantized=Config.USE_QUANTIZED_MODELS,
+            device=None,          # "cuda" なら高速
+            kpt_radius=5,
+            line_width=2,
+            draw_on_black_bg=on_black,
+            score_threshold=None,
+        )
+
     # -------------------------
     # ライフサイクル
     # -------------------------
     def on_enter(self):
         """シーン入場時に非同期で推論開始"""
+        self._score_shutters()
+
         if not self.image_paths:
             self._error = "no image paths provided."
             self._done = True
             return
 
+        if self.inference is not None:
+            # 推論サービスに全画像を投げておき、update() で結果を拾う
+            self._done = False
+            self._error = None
+            self._surfaces.clear()
+            self._infos.clear()
+            self._index = 0
+            self._pending = [
+                (path, self.inference.submit("pose", image_path=path, on_black=self.on_black))
+                for path in self.image_paths
+            ]
+            return
+
         def worker():
             try:
                 self._surfaces.clear()
@@ -116,10 +140,15 @@ class PoseEstimationScene(Scene):
         self._index = 0
         self._thread = threading.Thread(target=worker, daemon=True)
         self._thread.start()
+        if self.app is not None:
+            self.app.track_background(self._thread)
 
     def on_exit(self):
         """必要に応じて後片付け"""
         self._thread = None
+        for _, fut in self._pending:
+            fut.cancel()
+        self._pending = []
 
     # -------------------------
     # イベント処理
@@ -141,16 +170,52 @@ class PoseEstimationScene(Scene):
                 elif e.key == pygame.K_s:
                     self._save_current_result()
 
+    def _score_shutters(self):
+        """撮影画像（1枚目=1P, 2枚目=2P）を裏で採点し、ラウンドの得点として保存する"""
+        if self.app is None or not game_state.shutter_paths:
+            return
+        if game_state.round_id is None:
+            game_state.round_id = score_store.start_round(theme=game_state.theme)
+        round_id = game_state.round_id
+        for player, path in enumerate(game_state.shutter_paths[:2], start=1):
+            fut = self.app.submit_score(path)
+            if fut is None:
+                return
+
+            def on_scored(f, player=player, path=path):
+                if f.cancelled() or f.exception() is not None or f.result() is None:
+                    print(f"[WARN] scoring failed: {path}")
+                    return
+                publish_player_score(round_id, player, f.result(), image_path=path)
+
+            fut.add_done_callback(on_scored)
+
     def _move_index(self, delta: int):
         if not self._surfaces:
             return
         self._index = (self._index + delta) % len(self._surfaces)
 
     # -------------------------
-    # 更新処理（今回は特に無し）
+    # 更新処理（推論サービスの結果を順番に受け取る）
     # -------------------------
     def update(self, dt):
-        pass
+        while self._pending and self._pending[0][1].done():
+            path, fut = self._pending.pop(0)
+            try:
+                res = fut.result()
+            except Exception as e:
+                self._error = f"error in estimating: {e}"
+                self._pending.clear()
+                break
+            self._surfaces.append(self._bgr_to_surface(res["drawn"]))
+            self._infos.append({**res["info"], "skeleton": res["skeleton"], "image_path": path})
+
+        if self.inference is not None and not self._pending:
+            self._done = True
+
+    def idle_timeout(self):
+        # 推論待ちは 0.1 秒ごとに結果を見に行くだけ、結果表示中は入力まで止まっている
+        return math.inf if self._done else 0.1
 
     # -------------------------
     # 描画処理
@@ -216,20 +281,24 @@ class PoseEstimationScene(Scene):
             os.makedirs(save_dir, exist_ok=True)
 
             info = self._infos[self._index]
-            
-            raw = info.get("raw")
-            width = info.get("width")
-            height = info.get("height")
-
-            # ★ 黒背景キャンバスを作る（高さ×幅×3 の BGR）
-            black_bg = np.zeros((height, width, 3), dtype=np.uint8)
-
-            # ★ 黒背景に骨格のみを描画
-            drawn_bgr = raw.plot(
-                img=black_bg,   # ← base.copy() ではなく黒キャンバス
-                kpt_radius=self.estimator.cfg.kpt_radius,
-                line_width=self.estimator.cfg.line_width
-            )
+
+            if info.get("skeleton") is not None:
+                # 推論サービスが黒背景の骨格画像を作ってくれている
+                drawn_bgr = info["skeleton"]
+            else:
+                raw = info.get("raw")
+                width = info.get("width")
+                height = info.get("height")
+
+                # ★ 黒背景キャンバスを作る（高さ×幅×3 の BGR）
+                black_bg = np.zeros((height, width, 3), dtype=np.uint8)
+
+                # ★ 黒背景に骨格のみを描画
+                drawn_bgr = raw.plot(
+                    img=black_bg,   # ← base.copy() ではなく黒キャンバス
+                    kpt_radius=self.estimator.cfg.kpt_radius,
+                    line_width=self.estimator.cfg.line_width
+                )
 
             #cv2.imwrite(save_path, drawn_bgr)
 
@@ -241,6 +310,12 @@ class PoseEstimationScene(Scene):
 
             cv2.imwrite(save_path, drawn_bgr)
 
+            # 撮影画像の結果なら、そのラウンド・プレイヤーの出力として覚えておく
+            image_path = info.get("image_path")
+            if image_path in game_state.shutter_paths and game_state.round_id is not None:
+                player = game_state.shutter_paths.index(image_path) + 1
+                game_state.record_image(game_state.round_id, player, save_path, kind="pose")
+
             # 画面下部に保存完了メッセージ（簡易）
             if self.screen is not None:
                 self._safe_draw_text(
@@ -272,13 +347,8 @@ class PoseEstimationScene(Scene):
 
     def draw_text_center(self, surface, text, font, y, color, shadow):
         # ★ 画面幅に合わせて中央寄せ（SCREEN_WIDTH 固定ではなく surface 実寸を使用）
-        render = font.render(text, True, color)
-        shadow_r = font.render(text, True, shadow)
-        x = surface.get_width() // 2
-        rect = render.get_rect(center=(x, y))
-        shadow_rect = shadow_r.get_rect(center=(x + 1, y + 1))
-        surface.blit(shadow_r, shadow_rect)
-        surface.blit(render, rect)
+        text_cache.draw(surface, text, font, color, shadow=shadow, shadow_offset=(1, 1),
+                        center=(surface.get_width() // 2, y))
 
     def _safe_draw_text(self, surface: pygame.Surface, text: str, pos: Tuple[int, int], color=(255, 255, 255), size: int = 28):
         """
@@ -307,6 +377,6 @@ class PoseEstimationScene(Scene):
                     except Exception:
                         pass
         # フォールバック：pygame 標準フォント
-        font = pygame.font.Font(None, size)
+        font = self.fonts.get(None, size)
         rend = font.render(text, True, color)
         surface.blit(rend, pos)
@@ -0,0 +1,76 @@
+# scenes/radar_chart.py
+import math
+
+import pygame
+
+
+class RadarChart:
+    """
+    N 軸のレーダーチャート（RoundResultScene の三角形グラフ）
+    軸の向き・ラベルの位置は最初に1回だけ計算しておく。得点の多角形は RadarLayer が持っていて、
+    伸びている途中（progress が変わったとき）だけ描き直す。軸を増やしても毎フレームの重さは変わらない。
+        chart = RadarChart(3, radius=120, max_value=10, size=300)
+        frame = chart.frame_surface(CIRCLE_COLOR, BASE_COLOR)
+        layer = chart.value_layer([7, 5, 9], SCORE_COLOR, EDGE_COLOR)
+        layer.draw(surface, (50, 200), progress)   # 多角形がある範囲だけ blit
+    """
+
+    def __init__(self, axes, radius, max_value, size=None, start_angle=-90):
+        self.axes = axes
+        self.radius = radius
+        self.max_value = max_value
+        self.size = size or radius * 2
+        self.center = (self.size // 2, self.size // 2)
+        # 軸の単位ベクトル（1本目が start_angle、時計回りに等間隔）
+        self.angles = [start_angle + i * 360 / axes for i in range(axes)]
+        self.dirs = [(math.cos(math.radians(a)), math.sin(math.radians(a))) for a in self.angles]
+
+    def points(self, values, progress=1.0, radius=None, center=None):
+        """各軸の値（0..max_value）× progress の位置にある頂点"""
+        cx, cy = center or self.center
+        r = (radius if radius is not None else self.radius) * progress
+        return [(cx + r * (v / self.max_value) * dx, cy + r * (v / self.max_value) * dy)
+                for v, (dx, dy) in zip(values, self.dirs)]
+
+    def frame_surface(self, circle_color, grid_color, width=3):
+        """背景の円と外枠の多角形（アルファを個別に変えられるよう毎回新しい Surface）"""
+        surf = pygame.Surface((self.size, self.size), pygame.SRCALPHA)
+        pygame.draw.circle(surf, circle_color, self.center, self.radius)
+        pygame.draw.polygon(surf, grid_color, self.points([self.max_value] * self.axes), width)
+        return surf
+
+    def label_rects(self, label_surfs, center, radius):
+        """軸の先（中心から radius）に置くラベルの (Surface, Rect)。画面上の center を渡す"""
+        return [(surf, surf.get_rect(center=pos))
+                for surf, pos in zip(label_surfs, self.points([self.max_value] * self.axes, radius=radius, center=center))]
+
+    def value_layer(self, values, fill_color, edge_color, edge_width=2):
+        return RadarLayer(self, values, fill_color, edge_color, edge_width)
+
+
+class RadarLayer:
+    """1人分の得点の多角形。progress が前回と同じなら描き直さずに同じ Surface を返す"""
+
+    def __init__(self, chart, values, fill_color, edge_color, edge_width=2):
+        self.chart = chart
+        self.values = list(values)
+        self.fill_color = fill_color
+        self.edge_color = edge_color
+        self.edge_width = edge_width
+        self.surface = pygame.Surface((chart.size, chart.size), pygame.SRCALPHA)
+        self.rect = pygame.Rect(0, 0, 0, 0)  # 多角形が描いてある範囲
+        self._progress = None
+
+    def render(self, progress):
+        if progress != self._progress:
+            self._progress = progress
+            self.surface.fill((0, 0, 0, 0))
+            pts = self.chart.points(self.values, progress)
+            r1 = pygame.draw.polygon(self.surface, self.fill_color, pts)
+            r2 = pygame.draw.polygon(self.surface, self.edge_color, pts, self.edge_width)
+            self.rect = r1.union(r2)
+        return self.surface
+
+    def draw(self, surface, pos, progress):
+        layer = self.render(progress)
+        return surface.blit(layer, (pos[0] + self.rect.x, pos[1] + self.rect.y), self.rect)
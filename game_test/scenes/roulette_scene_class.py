@@ -2,6 +2,7 @@
 import random
 import pygame
 from core.scene import Scene
+from core.tween import decay
 
 from common import Config, game_state
 
@@ -22,6 +23,8 @@ class RouletteScene(Scene):
         self.fuse_timer = 0.0
         self.expl_timer = 0.0
 
+        self.theme_atlas = self._build_theme_atlas() if Config.THEMES else None
+
     def on_enter(self):
         self.state = 0
         self.scroll_pos = 0.0
@@ -40,7 +43,7 @@ class RouletteScene(Scene):
                 self.state = 1
 
         elif self.state == 1:
-            self.current_speed *= 0.95
+            self.current_speed = decay(self.current_speed, 0.95, dt)
             self.scroll_pos += self.current_speed * dt
 
             if self.current_speed < 50.0:
@@ -93,14 +96,36 @@ class RouletteScene(Scene):
         if self.state == 3:
             self._draw_explosion()
 
+    # ルーレットの箱の大きさと色（0: ふつう / 1: 真ん中 / 2: 決定）
+    BOX_W, BOX_H = 400, 100
+    VARIANT_COLORS = (Config.DARK_BLUE, Config.LIGHT_BLUE, (255, 100, 100))
+    WRAP_ROWS = 5  # 1周の継ぎ目をまたいでも1回の blit で済むように、先頭を何個か後ろに足す
+
+    def _build_theme_atlas(self):
+        """
+        全お題 × 3色 の箱を1枚の縦長画像に描いておく（列=色、行=お題）
+        毎フレームの文字描画・角丸の箱描画をなくすため
+        """
+        h = Config.ROULETTE_ITEM_HEIGHT
+        themes = Config.THEMES
+        rows = len(themes) + self.WRAP_ROWS
+        atlas = pygame.Surface((self.BOX_W * len(self.VARIANT_COLORS), rows * h)).convert()
+        atlas.fill(Config.GRAY)
+
+        texts = [self.renderer.render(t, 60, Config.WHITE) for t in themes]
+        for row in range(rows):
+            ts = texts[row % len(themes)]
+            for col, color in enumerate(self.VARIANT_COLORS):
+                r = pygame.Rect(col * self.BOX_W, row * h + (h - self.BOX_H) // 2, self.BOX_W, self.BOX_H)
+                pygame.draw.rect(atlas, color, r, border_radius=10)
+                atlas.blit(ts, ts.get_rect(center=r.center))
+        return atlas
+
     def _draw_roulette(self):
         h = Config.ROULETTE_ITEM_HEIGHT
-        box_w, box_h = 400, 100
+        box_w, box_h = self.BOX_W, self.BOX_H
         center_y = Config.SCREEN_HEIGHT // 2 + 50
 
-        base_idx = int(self.scroll_pos / h)
-        offset_y = self.scroll_pos % h
-
         bg_rect = pygame.Rect(
             (Config.SCREEN_WIDTH - box_w) // 2 - 20,
             center_y - (h * 1.5) - 20,
@@ -108,26 +133,28 @@ class RouletteScene(Scene):
             h * 3 + 40,
         )
         pygame.draw.rect(self.screen, Config.GRAY, bg_rect)
-        self.screen.set_clip(bg_rect)
-
-        for i in range(base_idx - 2, base_idx + 3):
-            text = Config.THEMES[i % len(Config.THEMES)]
-            pos_y = center_y + (i - base_idx) * h - offset_y - box_h // 2
-            is_center = abs(pos_y + box_h // 2 - center_y) < h // 2
-
-            if self.state >= 2 and is_center:
-                color = (255, 100, 100)
-            else:
-                color = Config.LIGHT_BLUE if is_center else Config.DARK_BLUE
-
-            r = pygame.Rect((Config.SCREEN_WIDTH - box_w) // 2, pos_y, box_w, box_h)
-            pygame.draw.rect(self.screen, color, r, border_radius=10)
-
-            ts = self.renderer.render(text, 60, Config.WHITE)
-            tr = ts.get_rect(center=r.center)
-            self.screen.blit(ts, tr)
 
-        self.screen.set_clip(None)
+        if self.theme_atlas is not None:
+            n = len(Config.THEMES)
+            box_x = (Config.SCREEN_WIDTH - box_w) // 2
+            scroll = self.scroll_pos % (n * h)
+            # 画面の y = アトラスの y + (center_y - h/2 - scroll)
+            shift = center_y - h // 2 - scroll
+
+            # 1) ふつうの色の帯を、枠の高さ分だけ切り出して1回で描く
+            src_y = (bg_rect.top - shift) % (n * h)
+            self.screen.blit(self.theme_atlas, (box_x, bg_rect.top), (0, int(src_y), box_w, bg_rect.height))
+
+            # 2) 真ん中の1個だけ、ハイライト（決定後は赤）の色で上書き
+            i = round(scroll / h)
+            variant = 2 if self.state >= 2 else 1
+            self.screen.set_clip(bg_rect)
+            self.screen.blit(
+                self.theme_atlas,
+                (box_x, int(i * h + shift)),
+                (variant * box_w, (i % n) * h, box_w, h),
+            )
+            self.screen.set_clip(None)
 
         hl_rect = pygame.Rect(
             (Config.SCREEN_WIDTH - box_w) // 2 - 5,
@@ -169,7 +196,7 @@ class RouletteScene(Scene):
         if radius < Config.SCREEN_WIDTH * 1.5:
             pygame.draw.circle(self.screen, Config.YELLOW, (700, 80), radius)
 
-        fade = pygame.Surface((Config.SCREEN_WIDTH, Config.SCREEN_HEIGHT))
-        fade.fill(Config.RED)
-        fade.set_alpha(min(255, int(self.expl_timer * 2 * 255)))
-        self.screen.blit(fade, (0, 0))
+        with self.app.layers.layer(alpha=False) as fade:
+            fade.fill(Config.RED)
+            fade.set_alpha(min(255, int(self.expl_timer * 2 * 255)))
+            self.screen.blit(fade, (0, 0))
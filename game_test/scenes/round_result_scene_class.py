@@ -2,13 +2,18 @@ import pygame
 import math
 import os
 from core.scene import Scene
+from core.tween import approach
+from common import font_registry, game_state, text_cache
+from scenes.radar_chart import RadarChart
+from score_store import display_scores, round_total, score_store
 
 
 class RoundResultScene(Scene):
     """ResultScreen の演出を Scene 版として忠実移植したもの"""
 
-    def __init__(self, score_file="scores.txt"):
-        super().__init__()
+    def __init__(self, app=None, round_id=None):
+        super().__init__(app)
+        fonts = app.fonts if app else font_registry
 
         # =========================
         # 画面サイズ
@@ -32,16 +37,17 @@ class RoundResultScene(Scene):
         main = os.path.join(cur, "../font/Paintball_Beta_3.ttf")
         title = os.path.join(cur, "../font/IoEI.ttf")
 
-        self.font_title = pygame.font.Font(title, 80)
-        self.font_players = pygame.font.Font(main, 50)
-        self.font_labels = pygame.font.Font(title, 30)
-        self.font_score = pygame.font.Font(main, 30)
-        self.font_total = pygame.font.Font(main, 90)
+        self.font_title = fonts.get(title, 80)
+        self.font_players = fonts.get(main, 50)
+        self.font_labels = fonts.get(title, 30)
+        self.font_score = fonts.get(main, 30)
+        self.font_total = fonts.get(main, 90)
 
         # =========================
-        # スコア
+        # スコア（採点は裏で続いていることがあるので、届いたら on_scores_published で作り直す）
         # =========================
-        self.load_scores(score_file)
+        self._scores_dirty = False
+        self.load_scores(round_id)
 
         # =========================
         # STEP 管理（元コード完全一致）
@@ -57,15 +63,32 @@ class RoundResultScene(Scene):
         self.STEP_TOTAL = 8
 
         self.step = self.STEP_BG
+        self._drawn_step = None
         self.score_progress = 0.0
-        self.SCORE_GROW_SPEED = 0.015
+        # 速さはすべて「毎秒」（元は 60fps で 1フレームあたり 0.015 / アルファ +5 / 合計 +1）
+        self.SCORE_GROW_SPEED = 0.9
+        self.FADE_SPEED = 300
+        self.TOTAL_COUNT_SPEED = 60
+        self.SCORE_WAIT = 5.0  # 得点が揃うまで数字を出すのを待つ最長時間（採点に失敗したら届かない）
+        self._score_wait = 0.0
+        self._alphas = {}  # フェード中のアルファ（小数で持つ）
 
         # =========================
         # 描画準備
         # =========================
         self.prepare_assets()
 
-        self.saved = False
+    def on_enter(self):
+        game_state.subscribe(self.on_scores_published)
+        self._scores_dirty = True  # 作ってから入場までに届いていた分
+
+    def on_exit(self):
+        game_state.unsubscribe(self.on_scores_published)
+
+    def on_scores_published(self, round_id, player, scores):
+        """採点スレッドから呼ばれる。反映は次の update() で行う"""
+        if round_id == self.round_id:
+            self._scores_dirty = True
 
     # ==================================================
     # 入力
@@ -82,27 +105,30 @@ class RoundResultScene(Scene):
     # 更新
     # ==================================================
     def update(self, dt):
+        if self._scores_dirty:
+            self.refresh_scores()
+
         if self.step == self.STEP_BG:
-            if self.fade_in(self.bg, 255):
+            if self.fade_in(self.bg, 255, dt):
                 self.step = self.STEP_TITLE
 
         elif self.step == self.STEP_TITLE:
-            if self.fade_in(self.title_surf, 255):
+            if self.fade_in(self.title_surf, 255, dt):
                 self.step = self.STEP_LINE
 
         elif self.step == self.STEP_LINE:
-            if self.fade_in(self.line_surf, 255):
+            if self.fade_in(self.line_surf, 255, dt):
                 self.step = self.STEP_PLAYERS
 
         elif self.step == self.STEP_PLAYERS:
-            done1 = self.fade_in(self.p1_surf, 255)
-            done2 = self.fade_in(self.p2_surf, 255)
+            done1 = self.fade_in(self.p1_surf, 255, dt)
+            done2 = self.fade_in(self.p2_surf, 255, dt)
             if done1 and done2:
                 self.step = self.STEP_CHART_FRAME
 
         elif self.step == self.STEP_CHART_FRAME:
-            doneL = self.fade_in(self.circle_left, 255)
-            doneR = self.fade_in(self.circle_right, 255)
+            doneL = self.fade_in(self.circle_left, 255, dt)
+            doneR = self.fade_in(self.circle_right, 255, dt)
             if doneL and doneR:
                 self.step = self.STEP_SCORE_LABELS
 
@@ -111,8 +137,12 @@ class RoundResultScene(Scene):
             done = True
             for side in self.bottom.values():
                 for s in side["label_surfs"]:
-                    if not self.fade_in(s, 255):
+                    if not self.fade_in(s, 255, dt):
                         done = False
+            # 採点がまだ終わっていなければ、数字を出す前に少しだけ待つ
+            if not self.scores_complete and self._score_wait < self.SCORE_WAIT:
+                self._score_wait += dt
+                done = False
             if done:
                 self.step = self.STEP_SCORE_NUMBERS
 
@@ -120,41 +150,20 @@ class RoundResultScene(Scene):
             done = True
             for side in self.bottom.values():
                 for s in side["scores_surfs"]:
-                    if not self.fade_in(s, 255):
+                    if not self.fade_in(s, 255, dt):
                         done = False
             if done:
                 self.step = self.STEP_CHART_SCORE
 
         elif self.step == self.STEP_CHART_SCORE:
-            self.score_progress = min(self.score_progress + self.SCORE_GROW_SPEED, 1.0)
+            self.score_progress = approach(self.score_progress, 1.0, self.SCORE_GROW_SPEED, dt)
             if self.score_progress >= 1.0:
                 self.step = self.STEP_TOTAL
 
         elif self.step == self.STEP_TOTAL:
             for side in self.bottom.values():
-                if side["total_now"] < side["total_target"]:
-                    side["total_now"] += 1
-        
-        # ★ ここで1回だけ保存
-        if not self.saved:
-            self.append_score("1Pscores.txt", self.total_1)
-            self.append_score("2Pscores.txt", self.total_2)
-            self.saved = True
-    
-    def append_score(self, filename, score):
-        ##score をカンマ区切りで追記保存
-        if os.path.exists(filename):
-            with open(filename, "r", encoding="utf-8") as f:
-                text = f.read().strip()
-            if text:
-                text += f",{score}"
-            else:
-                text = str(score)
-        else:
-            text = str(score)
-
-        with open(filename, "w", encoding="utf-8") as f:
-            f.write(text)
+                side["total_count"] = approach(side["total_count"], side["total_target"], self.TOTAL_COUNT_SPEED, dt)
+                side["total_now"] = int(side["total_count"])
 
 
     # ==================================================
@@ -175,44 +184,82 @@ class RoundResultScene(Scene):
         surface.blit(self.circle_right, (450, 200))
 
         if self.step >= self.STEP_CHART_FRAME:
-            for surf, ang in self.label_surfs:
-                rad = math.radians(ang)
-                for cx in (200, 600):
-                    x = cx + 150 * math.cos(rad)
-                    y = 350 + 150 * math.sin(rad)
-                    surface.blit(surf, surf.get_rect(center=(x, y)))
+            for surf, rect in self.label_blits:
+                surface.blit(surf, rect)
 
         if self.step >= self.STEP_CHART_SCORE:
-            self.draw_score_triangle(surface, (200, 350), self.s1)
-            self.draw_score_triangle(surface, (600, 350), self.s2)
+            # 伸び終わったら同じ Surface の多角形の範囲を blit するだけ
+            for layer, pos in self.score_layers:
+                layer.draw(surface, pos, self.score_progress)
 
         self.draw_bottom(surface)
 
+    def idle_timeout(self):
+        # 合計を数え終わったら、あとは入力待ちだけ
+        if self._scores_dirty:
+            return None
+        if self.step == self.STEP_TOTAL and all(
+            side["total_now"] >= side["total_target"] for side in self.bottom.values()
+        ):
+            return math.inf
+        return None
+
+    def dirty_rects(self):
+        """
+        差分描画: 演出中は全画面、合計のカウントアップ中は合計の数字だけ、
+        数え終わったら何も描かない（次の入力まで止まった画面のまま）
+        """
+        entered_total = self._drawn_step != self.step
+        self._drawn_step = self.step
+        if self.step < self.STEP_TOTAL or entered_total:
+            self._region_keys = {}
+            return None
+        return self.changed_rects({
+            name: (side["total_rect"], side["total_now"]) for name, side in self.bottom.items()
+        })
+
     # ==================================================
     # 内部
     # ==================================================
-    def load_scores(self, score_file):
-        v = list(map(int, open(score_file, encoding="utf-8").read().split(",")))
-        self.s1 = v[:3]
-        self.s2 = v[3:]
-        self.total_1 = sum(self.s1)
-        self.total_2 = sum(self.s2)
+    def load_scores(self, round_id):
+        """score_store からラウンドの得点を読む（省略時は現在のラウンド）"""
+        if round_id is None:
+            round_id = game_state.round_id or score_store.latest_round_id()
+        self.round_id = round_id
+        # 同じプロセスで採点した得点はメモリにある。揃っていなければ DB の分で補う
+        players = game_state.get_round_scores(round_id) or {}
+        if len(players) < 2 and round_id is not None:
+            score_store.flush()
+            rnd = score_store.get_round(round_id)
+            players = {**(rnd["players"] if rnd else {}), **players}
+
+        self.s1 = display_scores(players.get(1, {}))
+        self.s2 = display_scores(players.get(2, {}))
+        # ラウンドの合計はストアが持つので、ここでファイルに追記する必要はない
+        # （FinalResultScene の勝敗と同じ round_total で数える）
+        self.total_1 = round_total(players.get(1, {}))
+        self.total_2 = round_total(players.get(2, {}))
+        self.scores_complete = 1 in players and 2 in players
+
+    def refresh_scores(self):
+        """届いた得点を読み直し、変わっていれば多角形・数字・合計の目標を作り直す"""
+        self._scores_dirty = False
+        before = (self.s1, self.s2)
+        self.load_scores(self.round_id)
+        if (self.s1, self.s2) != before:
+            self.apply_scores()
+            self._drawn_step = None  # 出ている数字が変わるので次のフレームは全画面
 
     def outline(self, text, font, color, outline, w=2):
-        base = font.render(text, True, color)
-        surf = pygame.Surface((base.get_width()+w*2, base.get_height()+w*2), pygame.SRCALPHA)
-        for dx in (-w, w):
-            for dy in (-w, w):
-                surf.blit(font.render(text, True, outline), (dx+w, dy+w))
-        surf.blit(base, (w, w))
-        return surf
+        """縁取り文字（共有キャッシュの Surface なので、set_alpha するものは copy() して使う）"""
+        return text_cache.render(text, font, color, outline=outline, outline_width=w)
 
     def prepare_assets(self):
         self.bg = pygame.Surface((self.W, self.H))
         self.bg.fill(self.BG_COLOR)
         self.bg.set_alpha(0)
 
-        self.title_surf = self.outline("とくてん", self.font_title, (255,255,255), (0,0,0))
+        self.title_surf = self.outline("とくてん", self.font_title, (255,255,255), (0,0,0)).copy()
         self.title_surf.set_alpha(0)
         self.title_pos = self.title_surf.get_rect(center=(400, 80))
 
@@ -221,60 +268,63 @@ class RoundResultScene(Scene):
         self.line_surf.set_alpha(0)
         self.line_pos = self.line_surf.get_rect(center=(400, 350))
 
-        self.p1_surf = self.outline("1P", self.font_players, (255,255,255), (255,80,80))
-        self.p2_surf = self.outline("2P", self.font_players, (255,255,255), (80,80,255))
+        self.p1_surf = self.outline("1P", self.font_players, (255,255,255), (255,80,80)).copy()
+        self.p2_surf = self.outline("2P", self.font_players, (255,255,255), (80,80,255)).copy()
         self.p1_surf.set_alpha(0)
         self.p2_surf.set_alpha(0)
         self.p1_pos = self.p1_surf.get_rect(center=(200,150))
         self.p2_pos = self.p2_surf.get_rect(center=(600,150))
 
-        self.circle_left = pygame.Surface((300,300), pygame.SRCALPHA)
-        self.circle_right = pygame.Surface((300,300), pygame.SRCALPHA)
+        # レーダーチャート（軸は得点の項目数。ラベルの位置も多角形もここで用意しておく）
+        labels = ["ダイナミック", "あんてい", "こせい"]
+        self.chart = RadarChart(len(labels), radius=120, max_value=10, size=300)
+        self.circle_left = self.chart.frame_surface(self.CIRCLE_COLOR, self.BASE_TRI_COLOR)
+        self.circle_right = self.chart.frame_surface(self.CIRCLE_COLOR, self.BASE_TRI_COLOR)
         self.circle_left.set_alpha(0)
         self.circle_right.set_alpha(0)
 
-        pygame.draw.circle(self.circle_left, self.CIRCLE_COLOR, (150,150), 120)
-        pygame.draw.circle(self.circle_right, self.CIRCLE_COLOR, (150,150), 120)
-        self.draw_base_triangle(self.circle_left)
-        self.draw_base_triangle(self.circle_right)
-
-        labels = [("ダイナミック",-90),("あんてい",30),("こせい",150)]
-        self.label_surfs = [(self.font_labels.render(t, True, self.LABEL_COLOR), a) for t,a in labels]
+        label_surfs = [self.font_labels.render(t, True, self.LABEL_COLOR) for t in labels]
+        self.label_blits = []
+        for cx in (200, 600):
+            self.label_blits += self.chart.label_rects(label_surfs, (cx, 350), 150)
 
         self.bottom = {
-            "L": {"x":50, "y":480, "scores":self.s1, "total_target":self.total_1},
-            "R": {"x":430, "y":480, "scores":self.s2, "total_target":self.total_2},
+            "L": {"x":50, "y":480},
+            "R": {"x":430, "y":480},
         }
         for side in self.bottom.values():
-            side["label_surfs"] = [self.font_labels.render(t, True, (0,0,0)) for t,_ in labels]
-            side["scores_surfs"] = [self.outline(str(s), self.font_score, (255,255,255), (255,80,80)) for s in side["scores"]]
-            for s in side["label_surfs"] + side["scores_surfs"]:
+            side["label_surfs"] = [self.font_labels.render(t, True, (0,0,0)) for t in labels]
+            side["scores_surfs"] = []
+            for s in side["label_surfs"]:
                 s.set_alpha(0)
             side["total_now"] = 0
-
-    def fade_in(self, surf, target, step=5):
-        a = surf.get_alpha() or 0
-        a = min(a+step, target)
-        surf.set_alpha(a)
-        return a == target
-
-    def draw_base_triangle(self, surface):
-        pts = []
-        for i in range(3):
-            ang = math.radians(-90+i*120)
-            pts.append((150+120*math.cos(ang),150+120*math.sin(ang)))
-        pygame.draw.polygon(surface, self.BASE_TRI_COLOR, pts, 3)
-
-    def draw_score_triangle(self, surface, center, scores):
-        surf = pygame.Surface((300,300), pygame.SRCALPHA)
-        pts = []
-        for i,sc in enumerate(scores):
-            ang = math.radians(-90+i*120)
-            r = (sc/10)*120*self.score_progress
-            pts.append((150+r*math.cos(ang),150+r*math.sin(ang)))
-        pygame.draw.polygon(surf, self.SCORE_COLOR, pts)
-        pygame.draw.polygon(surf, self.SCORE_EDGE_COLOR, pts, 2)
-        surface.blit(surf, (center[0]-150, center[1]-150))
+            side["total_count"] = 0.0
+            tw, th = self.font_total.size("000")
+            side["total_rect"] = pygame.Rect(side["x"] + 220, side["y"], tw + 4, th + 4)
+        self.apply_scores()
+
+    def apply_scores(self):
+        """得点で変わる部分（多角形・項目の数字・合計の目標）。フェード途中の数字はアルファを引き継ぐ"""
+        self.score_layers = [
+            (self.chart.value_layer(self.s1, self.SCORE_COLOR, self.SCORE_EDGE_COLOR), (50, 200)),
+            (self.chart.value_layer(self.s2, self.SCORE_COLOR, self.SCORE_EDGE_COLOR), (450, 200)),
+        ]
+        for side, scores, total in ((self.bottom["L"], self.s1, self.total_1), (self.bottom["R"], self.s2, self.total_2)):
+            side["scores"] = scores
+            side["total_target"] = total
+            old = side["scores_surfs"]
+            side["scores_surfs"] = [self.outline(str(s), self.font_score, (255,255,255), (255,80,80)).copy() for s in scores]
+            for i, s in enumerate(side["scores_surfs"]):
+                a = self._alphas.pop(old[i], 0) if i < len(old) else 0
+                self._alphas[s] = a
+                s.set_alpha(int(a))
+
+    def fade_in(self, surf, target, dt):
+        a = self._alphas.get(surf, surf.get_alpha() or 0)
+        a = approach(a, target, self.FADE_SPEED, dt)
+        self._alphas[surf] = a
+        surf.set_alpha(int(a))
+        return a >= target
 
     def draw_bottom(self, surface):
         for side in self.bottom.values():
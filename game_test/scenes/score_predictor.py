@@ -1,16 +1,41 @@
-import tensorflow as tf
-from tensorflow.keras.models import load_model
-from tensorflow.keras.applications.vgg16 import preprocess_input
 import cv2
 import numpy as np
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+# ※TensorFlow は backend="keras" のときだけ import する（onnx では一切読み込まない）
+
+# VGG16 (caffe モード) の前処理で引く BGR 平均値
+VGG16_MEAN_BGR = np.array([103.939, 116.779, 123.68], dtype=np.float32)
+
+
+def preprocess_vgg16(img):
+    """
+    keras.applications.vgg16.preprocess_input と同じ処理を numpy だけで行う。
+    （RGB→BGR の並べ替え + 平均値引き。TensorFlow を import しないため）
+    """
+    x = img.astype(np.float32)[..., ::-1]
+    return x - VGG16_MEAN_BGR
+
 
 class ScorePredictor:
-    def __init__(self):
+    BACKENDS = ("keras", "onnx")
+    READY_TIMEOUT = 30.0  # predict() がモデル読み込みを待つ最大秒数
+
+    def __init__(self, backend="keras", quantized=False, background=False):
         # --- 設定 ---
         self.IMAGE_HEIGHT = 128
         self.IMAGE_WIDTH = 128
-        self.SCORE_FILE = "scores.txt" # 書き出すファイル名
+
+        # 推論バックエンド: "keras"(TensorFlow) / "onnx"(onnxruntime, CPU)
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown backend: {backend}")
+        self.BACKEND = backend
+        # True なら tools/quantize_models.py で作った INT8 版を使う（onnx のみ）
+        if quantized and backend != "onnx":
+            raise ValueError("quantized models require backend='onnx'")
+        self.QUANTIZED = quantized
 
         # モデルパス定義
         # ※実際のファイル構成に合わせてパスを修正してください
@@ -19,34 +44,126 @@ class ScorePredictor:
             "Stable":  "model/stable_score_model_final.keras",
             "Unique":  "model/unique_score_model_final.keras"
         }
+        # export_score_onnx.py で書き出した ONNX モデル
+        self.ONNX_MODEL_PATHS = {
+            name: os.path.splitext(path)[0] + ".onnx"
+            for name, path in self.MODEL_PATHS.items()
+        }
+        # quantize_models.py で書き出した INT8 モデル
+        self.INT8_MODEL_PATHS = {
+            name: os.path.splitext(path)[0] + "_int8.onnx"
+            for name, path in self.MODEL_PATHS.items()
+        }
 
         self.loaded_models = {}
-        self.load_all_models()
+        self._lock = threading.Lock()
+        self._executor = None
+        self._futures = {}
+        self._finished = False
 
-    def load_all_models(self):
-        """モデルを全て読み込む（起動時に1回だけ呼ぶ想定）"""
-        print("=== モデル読み込み開始 ===")
-        for model_name, model_path in self.MODEL_PATHS.items():
-            if os.path.exists(model_path):
-                print(f"[{model_name}] モデルを読み込んでいます...")
-                try:
-                    self.loaded_models[model_name] = load_model(model_path)
-                    print(f" -> {model_name} 読み込み完了")
-                except Exception as e:
-                    print(f"エラー: {model_name} の読み込みに失敗しました: {e}")
-            else:
-                print(f"警告: ファイルが見つかりません: {model_path}")
+        # background=True なら読み込みをワーカースレッドに任せてすぐ戻る
+        # （進み具合は status()、完了待ちは wait_until_ready()）
+        if background:
+            self.start_loading()
+        else:
+            self.load_all_models()
+
+    def model_paths(self):
+        """現在のバックエンドで読み込むモデルパスの辞書を返す"""
+        if self.BACKEND == "onnx":
+            return self.INT8_MODEL_PATHS if self.QUANTIZED else self.ONNX_MODEL_PATHS
+        return self.MODEL_PATHS
+
+    def _load_model(self, model_path):
+        if self.BACKEND == "onnx":
+            import onnxruntime as ort
+            return OnnxScoreModel(ort.InferenceSession(model_path, providers=["CPUExecutionProvider"]))
+
+        from tensorflow.keras.models import load_model
+        return load_model(model_path)
 
+    def _load_one(self, model_name, model_path):
+        """モデルを1つ読み込む（ワーカースレッドで実行）。成功なら True"""
+        if not os.path.exists(model_path):
+            print(f"警告: ファイルが見つかりません: {model_path}")
+            return False
+
+        print(f"[{model_name}] モデルを読み込んでいます...")
+        try:
+            model = self._load_model(model_path)
+        except Exception as e:
+            print(f"エラー: {model_name} の読み込みに失敗しました: {e}")
+            return False
+
+        with self._lock:
+            self.loaded_models[model_name] = model
+        print(f" -> {model_name} 読み込み完了")
+        return True
+
+    def start_loading(self):
+        """全モデルの読み込みをワーカースレッドで並列に開始する（2回目以降は何もしない）"""
+        if self._futures:
+            return
+        paths = self.model_paths()
+        print(f"=== モデル読み込み開始 (backend: {self.BACKEND}{', int8' if self.QUANTIZED else ''}) ===")
+        self._executor = ThreadPoolExecutor(max_workers=len(paths), thread_name_prefix="score-model")
+        self._futures = {
+            name: self._executor.submit(self._load_one, name, path)
+            for name, path in paths.items()
+        }
+        for future in self._futures.values():
+            future.add_done_callback(self._on_model_done)
+
+    def _on_model_done(self, _future):
+        with self._lock:
+            if self._finished or not self.is_ready():
+                return
+            self._finished = True
         if not self.loaded_models:
             print("エラー: 有効なモデルが一つも読み込めませんでした。")
-
         print("=== 全モデル読み込み完了 ===\n")
+        self._executor.shutdown(wait=False)
 
-    def predict(self, image_path):
+    def load_all_models(self):
+        """モデルを全て読み込む（起動時に1回だけ呼ぶ想定）。読み込み終わるまで待つ"""
+        self.start_loading()
+        self.wait_until_ready()
+
+    def is_ready(self):
+        """全モデルの読み込み処理が終わったか（失敗したモデルも「終わった」に含む）"""
+        return bool(self._futures) and all(f.done() for f in self._futures.values())
+
+    def wait_until_ready(self, timeout=None):
+        """読み込み完了まで最大 timeout 秒待つ。終わっていれば True"""
+        if not self._futures:
+            return False
+        _, not_done = wait(list(self._futures.values()), timeout=timeout)
+        return not not_done
+
+    def status(self):
         """
-        画像パスを受け取り、予測を実行してスコアの辞書を返す
+        読み込み状況を返す（タイトル画面などの進捗表示用）
+        例) {"ready": False, "done": 1, "total": 3,
+             "models": {"Dynamic": "loaded", "Stable": "loading", "Unique": "failed"}}
         """
-        # --- 画像の前処理 ---
+        models = {}
+        for name, future in self._futures.items():
+            if not future.done():
+                models[name] = "loading"
+            elif future.exception() is None and future.result():
+                models[name] = "loaded"
+            else:
+                models[name] = "failed"
+        done = sum(1 for v in models.values() if v != "loading")
+        return {
+            "ready": self.is_ready(),
+            "done": done,
+            "total": len(self._futures),
+            "models": models,
+        }
+
+    def load_input(self, image_path):
+        """画像パスを読み込み、モデル入力 (1, H, W, 3) に前処理して返す。失敗時は None"""
         if not os.path.exists(image_path):
             print(f"画像が見つかりません: {image_path}")
             return None
@@ -56,10 +173,27 @@ class ScorePredictor:
             print("画像の読み込みに失敗しました。")
             return None
 
+        return np.array([self.preprocess_image(img)])
+
+    def preprocess_image(self, img):
+        """BGR 画像1枚をモデル入力 (H, W, 3) に前処理する"""
         # リサイズ & 前処理
         img = cv2.resize(img, (self.IMAGE_WIDTH, self.IMAGE_HEIGHT))
-        img = np.array([img])
-        img = preprocess_input(img)
+        return preprocess_vgg16(img)
+
+    def predict(self, image_path, timeout=None):
+        """
+        画像パスを受け取り、予測を実行してスコアの辞書を返す
+        モデル読み込み中なら最大 timeout 秒（省略時 READY_TIMEOUT）待つ
+        """
+        if not self.wait_until_ready(self.READY_TIMEOUT if timeout is None else timeout):
+            print("モデルの読み込みが間に合いませんでした。")
+            return None
+
+        # --- 画像の前処理 ---
+        img = self.load_input(image_path)
+        if img is None:
+            return None
 
         # --- 予測実行 ---
         results = {}
@@ -77,49 +211,51 @@ class ScorePredictor:
         
         return results
 
-    def save_scores(self, scores_dict):
+    def predict_batch(self, images, timeout=None):
         """
-        スコア辞書を受け取り、テキストファイルに保存する
+        BGR 画像(ndarray)のリストをまとめて推論し、スコア辞書のリストを返す
+        （採点サーバーで複数ブースのリクエストを1回の推論にまとめる用）
         """
+        if not images:
+            return []
+        if not self.wait_until_ready(self.READY_TIMEOUT if timeout is None else timeout):
+            print("モデルの読み込みが間に合いませんでした。")
+            return [None] * len(images)
+
+        batch = np.stack([self.preprocess_image(img) for img in images])
+        results = [{} for _ in images]
+        for name in ["Dynamic", "Stable", "Unique"]:
+            model = self.loaded_models.get(name)
+            if model:
+                prediction = model.predict(batch, verbose=0)
+                for i, raw_score in enumerate(prediction[:, 0]):
+                    results[i][name] = float(raw_score) * 10.0
+            else:
+                for r in results:
+                    r[name] = 0.0
+        return results
+
+    def save_scores(self, scores_dict, player=None, round_id=None, image_path=None):
+        """
+        スコア辞書を受け取り、score_store（SQLite）に保存する
+        player / round_id を省略すると、最新ラウンドに 1P だけ入っていれば 2P、
+        それ以外は新しいラウンドの 1P として保存する
+        """
+        from common import game_state
+        from score_store import score_store
+
         # 辞書からリストへ変換 (Dynamic, Stable, Unique順)
         d_score = scores_dict.get("Dynamic", 0.0)
         s_score = scores_dict.get("Stable", 0.0)
         u_score = scores_dict.get("Unique", 0.0)
         new_scores = [d_score, s_score, u_score]
 
-        # 文字列作成
-        new_scores_str = ",".join([f"{s:.2f}" for s in new_scores])
-        
-        existing_content = ""
-        value_count = 0
-
-        # ファイル読み込みチェック
-        if os.path.exists(self.SCORE_FILE):
-            with open(self.SCORE_FILE, "r", encoding="utf-8") as f:
-                existing_content = f.read().strip()
-            
-            if existing_content:
-                # カンマ区切りで要素数を数える
-                # 空白や改行が含まれる場合を除去してカウント
-                parts = [p for p in existing_content.split(",") if p.strip()]
-                value_count = len(parts)
-
-        print(f"現在のファイル内の数値個数: {value_count}")
-
-        # ロジック分岐
-        if value_count >= 6 or value_count == 0:
-            # 6個埋まっている、または空なら -> 新規書き込み (1P)
-            write_content = new_scores_str
-            action_msg = "新規書き込み (1P)"
-        else:
-            # それ以外(3個など) -> 追記 (2P)
-            write_content = existing_content + "," + new_scores_str
-            action_msg = "追記 (2P)"
+        if player is None or round_id is None:
+            round_id, player = score_store.next_player_slot()
+        score_store.record_player_score(round_id, player, scores_dict, image_path=image_path)
+        game_state.publish_score(round_id, player, scores_dict)
 
-        with open(self.SCORE_FILE, "w", encoding="utf-8") as f:
-            f.write(write_content)
-        
-        print(f"[{self.SCORE_FILE}] に保存しました: {action_msg}")
+        print(f"[{score_store.path}] に保存しました: ラウンド {round_id} / {player}P")
         return new_scores # 処理したスコアリストを返す
 
     def run_prediction_flow(self, target_image_path):
@@ -149,9 +285,23 @@ class ScorePredictor:
             print("予測に失敗しました。")
             return False
 
+class OnnxScoreModel:
+    """onnxruntime のセッションを keras モデルと同じ predict() で呼べるようにする薄いラッパー"""
+
+    def __init__(self, session):
+        self.session = session
+        self.input_name = session.get_inputs()[0].name
+
+    def predict(self, img, verbose=0):
+        return self.session.run(None, {self.input_name: img.astype(np.float32)})[0]
+
+
 # 単体テスト用
 if __name__ == "__main__":
-    predictor = ScorePredictor()
+    import sys
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+    backend = sys.argv[1] if len(sys.argv) > 1 else "keras"
+    predictor = ScorePredictor(backend=backend)
     # テスト画像を判定
     test_image = "test/2011tokyo_mister_fp-011-320x480.jpg"
     predictor.run_prediction_flow(test_image)
\ No newline at end of file
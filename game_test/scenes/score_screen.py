@@ -5,27 +5,22 @@ import os
 # もしSceneクラスが common.py にあるなら from common import Scene など
 # ここでは便宜上、上記のSceneクラスを継承する前提で書きます
 from core.scene import Scene  # ※Sceneクラスが定義されているファイル名に合わせて変更してください
+from core.tween import damp
+from common import font_registry, game_state, text_cache
 
 class ScoreScene(Scene):
-    def __init__(self):
-        super().__init__() # 親クラス(Scene)の初期化
+    def __init__(self, app=None):
+        super().__init__(app) # 親クラス(Scene)の初期化
+        self.fonts = app.fonts if app else font_registry
         
-        # ▼ 修正前：これだと scenes フォルダの中を見てしまう
-        # BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-        
-        # ▼ 修正後：os.path.dirname を2回使って、1つ上の階層(game_test)を取得する
-        file_path = os.path.abspath(__file__)     # .../game_test/scenes/score_scene.py
-        scene_dir = os.path.dirname(file_path)    # .../game_test/scenes
-        BASE_DIR = os.path.dirname(scene_dir)     # .../game_test  <-- ここが欲しい！
 
         # --- 設定 ---
         self.WIDTH, self.HEIGHT = 800, 600
         self.SEGMENT_LIMITS = [100.0, 100.0, 300.0]
         self.ANIM_SPEED = 180.0
         
-        # これで game_test/finalscores.txt を指すようになります
-        self.SCORES_FILE = os.path.join(BASE_DIR, "finalscores.txt")
-        self.READ_INTERVAL = 0.5
+        # 得点は game_state から受け取る（採点が終わると on_scores_published で通知される）
+        self._scores_dirty = False
         
         
         # フォント設定 (適宜パスを合わせてください)
@@ -53,26 +48,13 @@ class ScoreScene(Scene):
         path_main = os.path.join(current_dir, "../font/Paintball_Beta_3.ttf")
         path_title = os.path.join(current_dir, "../font/Splatfont2.ttf")
 
-        try:
-            # 作成したパス (path_main, path_title) を使う
-            self.score_font = pygame.font.Font(path_main, 24)
-            self.title_font = pygame.font.Font(path_title, 80)
-            self.winner_font = pygame.font.Font(path_main, 80)
-            self.countdown_font = pygame.font.Font(path_main, 150)
-            print("フォント読み込み成功！")
-        except FileNotFoundError:
-            print(f"フォントが見つかりません: {path_main}")
-            # エラー時のフォールバック
-            self.score_font = pygame.font.SysFont(None, 24)
-            self.title_font = pygame.font.SysFont(None, 80)
-            self.winner_font = pygame.font.SysFont(None, 80)
-            self.countdown_font = pygame.font.SysFont(None, 150)
-        except Exception as e:
-            print(f"フォント読み込みエラー: {e}")
-            self.score_font = pygame.font.SysFont(None, 24)
-            self.title_font = pygame.font.SysFont(None, 80)
-            self.winner_font = pygame.font.SysFont(None, 80)
-            self.countdown_font = pygame.font.SysFont(None, 150)
+        # 作成したパス (path_main, path_title) を使う
+        # FontRegistry が読み込んだものを全シーンで使い回す（見つからなければ標準フォント）
+        fallback = lambda size: pygame.font.SysFont(None, size)
+        self.score_font = self.fonts.get(path_main, 24, fallback=fallback)
+        self.title_font = self.fonts.get(path_title, 80, fallback=fallback)
+        self.winner_font = self.fonts.get(path_main, 80, fallback=fallback)
+        self.countdown_font = self.fonts.get(path_main, 150, fallback=fallback)
 
     def reset_state(self):
         """シーン開始時の初期化"""
@@ -80,13 +62,12 @@ class ScoreScene(Scene):
         self.current_blue_segs = [0.0, 0.0, 0.0]
         self.target_red_segs = [0.0, 0.0, 0.0]
         self.target_blue_segs = [0.0, 0.0, 0.0]
-        self._last_read = 0.0
 
         # タイトルアニメーション用
         self.TITLE_STR = "けっかはっぴょう！！"
         self.TITLE_TARGET_Y = 50
         self.TITLE_START_Y = -130.0
-        self.TITLE_EASING = 0.12
+        self.TITLE_EASING = 0.12  # 60fps で 1フレームに残りの 12% 近づく（dt で換算）
         self.CHAR_DROP_DELAY = 0.15
         
         self.title_chars = []
@@ -119,6 +100,19 @@ class ScoreScene(Scene):
         self.dot_surf = self.winner_font.render(".", True, pygame.Color("YELLOW"))
         self.dot_shadow = self.winner_font.render(".", True, pygame.Color("BLACK"))
 
+        # 差分描画で使う範囲（タイトル / メーター2本+アイコン / Winner... / カウントダウン）
+        winner = self.winner_rect.inflate(10, 10)
+        winner.width += 5 + 3 * self.dot_surf.get_width()
+        countdown = self.countdown_font.render("0", True, pygame.Color("BLACK")).get_rect(
+            center=(self.WIDTH // 2, self.HEIGHT // 2))
+        countdown.inflate_ip(countdown.width * 2, 20)
+        self.region_rects = {
+            "title": pygame.Rect(0, 0, self.WIDTH, self.TITLE_TARGET_Y + self.title_font.get_height() + 8),
+            "meters": pygame.Rect(0, 190, self.WIDTH, 200),
+            "winner": winner,
+            "countdown": countdown,
+        }
+
         # カウントダウン用
         self.show_countdown = False
         self.countdown_val = 3
@@ -126,30 +120,28 @@ class ScoreScene(Scene):
         self.all_done = False
         
         # 初回のスコア読み込み
-        self.try_read_scores_file()
+        self.apply_scores()
 
     def clamp_val(self, v, limit):
         return max(0.0, min(limit, v))
 
-    def try_read_scores_file(self):
-        now = time.time()
-        if now - self._last_read < self.READ_INTERVAL: return
-        self._last_read = now
-        
-        if not os.path.exists(self.SCORES_FILE): return
-        try:
-            with open(self.SCORES_FILE, "r", encoding="utf-8") as f:
-                s = f.read().strip()
-            if not s: return
-            parts = [p.strip() for p in s.replace(",", " ").split() if p.strip()]
-            if len(parts) >= 6:
-                r, b = [], []
-                for i in range(3):
-                    r.append(self.clamp_val(float(parts[i]), self.SEGMENT_LIMITS[i]))
-                    b.append(self.clamp_val(float(parts[i+3]), self.SEGMENT_LIMITS[i]))
-                self.target_red_segs = r
-                self.target_blue_segs = b
-        except: pass
+    def on_enter(self):
+        game_state.subscribe(self.on_scores_published)
+        self.apply_scores()  # 入場までに届いていた分
+
+    def on_exit(self):
+        game_state.unsubscribe(self.on_scores_published)
+
+    def on_scores_published(self, round_id, player, scores):
+        """採点スレッドから呼ばれる。反映は次の update() で行う"""
+        self._scores_dirty = True
+
+    def apply_scores(self):
+        self._scores_dirty = False
+        # このゲームの項目別合計 (Dynamic, Stable, Unique) を 1P=赤, 2P=青 に
+        totals = game_state.session_component_totals()
+        self.target_red_segs = [self.clamp_val(v, lim) for v, lim in zip(totals[1], self.SEGMENT_LIMITS)]
+        self.target_blue_segs = [self.clamp_val(v, lim) for v, lim in zip(totals[2], self.SEGMENT_LIMITS)]
 
     def step_list(self, curr, targ, dt):
         out = []
@@ -179,7 +171,8 @@ class ScoreScene(Scene):
 
     def update(self, dt):
         """更新処理 (dtは秒単位)"""
-        self.try_read_scores_file()
+        if self._scores_dirty:
+            self.apply_scores()
         current_time = time.time()
         current_ticks = pygame.time.get_ticks()
 
@@ -189,7 +182,7 @@ class ScoreScene(Scene):
             if current_time >= c['start_time']:
                 dist = self.TITLE_TARGET_Y - c['cy']
                 if dist > 0.5:
-                    c['cy'] += dist * self.TITLE_EASING
+                    c['cy'] = damp(c['cy'], self.TITLE_TARGET_Y, self.TITLE_EASING, dt)
                     all_chars_finished = False
                 else:
                     c['cy'] = self.TITLE_TARGET_Y
@@ -264,11 +257,8 @@ class ScoreScene(Scene):
             # 数値
             total = sum(segs)
             pct = int((total/500)*100)
-            txt = self.score_font.render(f"{int(total)} / 500 ({pct}%)", True, pygame.Color("WHITE"))
-            stxt = self.score_font.render(f"{int(total)} / 500 ({pct}%)", True, pygame.Color("BLACK"))
-            tx, ty = x + 20, y + h//2 - txt.get_height()//2
-            surface.blit(stxt, (tx+2, ty+2))
-            surface.blit(txt, (tx, ty))
+            text_cache.draw(surface, f"{int(total)} / 500 ({pct}%)", self.score_font, "WHITE",
+                            shadow="BLACK", shadow_offset=(2, 2), midleft=(x + 20, y + h//2))
 
         draw_meter(100, 200, self.current_red_segs, self.RED_COLS)
         draw_meter(100, 300, self.current_blue_segs, self.BLUE_COLS)
@@ -291,8 +281,39 @@ class ScoreScene(Scene):
         # CountDown
         if self.show_countdown and self.countdown_val >= 0:
             cs = str(self.countdown_val)
-            c_surf = self.countdown_font.render(cs, True, pygame.Color("YELLOW"))
-            c_shad = self.countdown_font.render(cs, True, pygame.Color("BLACK"))
-            cr = c_surf.get_rect(center=(self.WIDTH//2, self.HEIGHT//2))
-            surface.blit(c_shad, (cr.x+5, cr.y+5))
-            surface.blit(c_surf, cr)
\ No newline at end of file
+            text_cache.draw(surface, cs, self.countdown_font, "YELLOW",
+                            shadow="BLACK", shadow_offset=(5, 5), center=(self.WIDTH//2, self.HEIGHT//2))
+
+    def idle_timeout(self):
+        """
+        Winner のドットとカウントダウンの間は、次に数字が変わるまで眠ってよい
+        （後から届いた得点でメーターがまだ伸びている間は眠らない）
+        """
+        if self._scores_dirty or not self.show_winner or not self.meters_settled():
+            return None
+        now = pygame.time.get_ticks()
+        if self.dot_count < 3:
+            return max(0, self.DOT_INTERVAL - (now - self.dot_timer)) / 1000
+        if self.show_countdown and self.countdown_val >= 0:
+            return max(0, 1000 - (now - self.countdown_timer)) / 1000
+        return None
+
+    def dirty_rects(self):
+        """差分描画: 変わった部分だけ画面に反映する（全部止まっているフレームは描画しない）"""
+        r = self.region_rects
+        cd_val = self.countdown_val if self.show_countdown and self.countdown_val >= 0 else None
+        return self.changed_rects({
+            "title": (r["title"], tuple(int(c['cy']) for c in self.title_chars)),
+            "meters": (r["meters"], (self.meter_key(self.current_red_segs), self.meter_key(self.current_blue_segs))),
+            "winner": (r["winner"], (self.show_winner, self.dot_count)),
+            "countdown": (r["countdown"], cd_val),
+        })
+
+    def meters_settled(self):
+        """メーター2本とも目標の値まで伸びきっているか"""
+        return self.current_red_segs == self.target_red_segs and self.current_blue_segs == self.target_blue_segs
+
+    def meter_key(self, segs):
+        """メーターの見た目（各色の棒の幅と数字）が同じなら同じ値になる"""
+        inner_w = 680 - 8
+        return tuple(int((v / 500.0) * inner_w) for v in segs) + (int(sum(segs)),)
@@ -4,6 +4,9 @@ import os
 import math
 import random
 from core.scene import Scene
+from asset_bundle import AssetBundle
+from common import Config, FadeSprite, LayerPool, font_registry, game_state, text_cache
+from score_store import score_store
 
 
 class TitleScene(Scene):
@@ -15,7 +18,7 @@ class TitleScene(Scene):
     SCREEN_HEIGHT = 600
     FPS = 60
 
-    CUSTOM_FONT_PATH = "title/Paintball_Beta_3.ttf"
+    CUSTOM_FONT_PATH = Config.PATH_FONT_PAINTBALL
     FONT_SIZE = 36
     TEXT_COLOR = (255, 196, 70)
     TEXT_SHADOW = (0, 0, 0)
@@ -45,18 +48,24 @@ class TitleScene(Scene):
     # Utility
     # ---------------------------------------
     def load_font(self, path, size):
-        if os.path.isfile(path):
-            try:
-                return pygame.font.Font(path, size)
-            except:
-                pass
-        print("[WARN] font load failed, using default")
-        return pygame.font.Font(None, size)
+        # 読めなければ FontRegistry が標準フォントにしてくれる
+        return self.fonts.get(path, size)
 
   
 
-    def load_scaled_image(self, path, max_w=None, max_h=None):
+    def load_scaled_image(self, path, max_w=None, max_h=None, fit=None):
+        """アセットバンドルに縮小済みのものがあればそれを使う（fit: 最後にこの大きさに合わせる）"""
+        params = {"max_w": max_w, "max_h": max_h, "fit": fit}
+        return self.assets.load(path, params, lambda: self._decode_scaled_image(path, max_w, max_h, fit))
+
+    def _decode_scaled_image(self, path, max_w=None, max_h=None, fit=None):
         img = pygame.image.load(path).convert_alpha()
+        if fit is not None:
+            return pygame.transform.smoothscale(self._scale_down(img, max_w, max_h), fit)
+        return self._scale_down(img, max_w, max_h)
+
+    @staticmethod
+    def _scale_down(img, max_w, max_h):
         if max_w is None and max_h is None:
             return img
         w, h = img.get_size()
@@ -74,40 +83,49 @@ class TitleScene(Scene):
         
     
 
-    def blit_fade(self, surface, img, pos, start_ms, now_ms, fade_ms):
+    def _decode_spark(self):
+        spark = pygame.image.load(self.HIT_SPARK_IMG).convert_alpha()
+        if self.HIT_SPARK_SCALE != 1.0:
+            w, h = spark.get_size()
+            spark = pygame.transform.smoothscale(
+                spark,
+                (int(w * self.HIT_SPARK_SCALE),
+                 int(h * self.HIT_SPARK_SCALE))
+            )
+        return spark
+
+    def blit_fade(self, surface, sprite, pos, start_ms, now_ms, fade_ms):
+        """sprite は FadeSprite（フェードが終わったら元の画像をそのまま描く）"""
         if now_ms < start_ms:
             return
         alpha = 255
         elapsed = now_ms - start_ms
         if elapsed < fade_ms:
             alpha = int(255 * (elapsed / fade_ms))
-        temp = img.copy()
-        temp.set_alpha(alpha)
-        surface.blit(temp, pos)
+        sprite.blit(surface, pos, alpha)
 
     def draw_text_center(self, surface, text, font, y, color, shadow):
-        render = font.render(text, True, color)
-        shadow_r = font.render(text, True, shadow)
-        x = self.SCREEN_WIDTH // 2
-        rect = render.get_rect(center=(x, y))
-        shadow_rect = shadow_r.get_rect(center=(x + 1, y + 1))
-        surface.blit(shadow_r, shadow_rect)
-        surface.blit(render, rect)
+        text_cache.draw(surface, text, font, color, shadow=shadow, shadow_offset=(1, 1),
+                        center=(self.SCREEN_WIDTH // 2, y))
 
     
 
     # ---------------------------------------
     # constructor （SceneManagerに合わせる）
     # ---------------------------------------
-    def __init__(self):
-        super().__init__()
+    def __init__(self, app=None):
+        super().__init__(app)
+        self.layers = app.layers if app else LayerPool((self.SCREEN_WIDTH, self.SCREEN_HEIGHT))
+        self.fonts = app.fonts if app else font_registry
+        self.assets = app.assets if app else AssetBundle()
 
         # Fonts
         self.font = self.load_font(self.CUSTOM_FONT_PATH, self.FONT_SIZE)
 
         # Images
         self.bg_img = self.load_scaled_image(
-            self.BACKGROUND_IMG, self.SCREEN_WIDTH, self.SCREEN_HEIGHT)
+            self.BACKGROUND_IMG, self.SCREEN_WIDTH, self.SCREEN_HEIGHT,
+            fit=(self.SCREEN_WIDTH, self.SCREEN_HEIGHT))
         self.logo_img = self.load_scaled_image(
             self.TITLE_LOGO_IMG, max_w=self.SCREEN_WIDTH, max_h=self.SCREEN_HEIGHT//1.05)
         self.char1_img = self.load_scaled_image(
@@ -117,20 +135,17 @@ class TitleScene(Scene):
 
         # spark
         try:
-            self.spark_img = pygame.image.load(
-                self.HIT_SPARK_IMG).convert_alpha()
-            if self.HIT_SPARK_SCALE != 1.0:
-                w, h = self.spark_img.get_size()
-                self.spark_img = pygame.transform.smoothscale(
-                    self.spark_img,
-                    (int(w * self.HIT_SPARK_SCALE),
-                     int(h * self.HIT_SPARK_SCALE))
-                )
+            self.spark_img = self.assets.load(
+                self.HIT_SPARK_IMG, {"scale": self.HIT_SPARK_SCALE}, self._decode_spark)
         except:
             print("[WARN] No spark image")
             self.spark_img = None
 
-        self.bg_img = pygame.transform.smoothscale(self.bg_img, (self.SCREEN_WIDTH, self.SCREEN_HEIGHT))
+        # フェード用（アルファを変えるコピーは1枚ずつだけ持つ）
+        self.logo_sprite = FadeSprite(self.logo_img)
+        self.char1_sprite = FadeSprite(self.char1_img)
+        self.char2_sprite = FadeSprite(self.char2_img)
+        self.spark_sprite = FadeSprite(self.spark_img) if self.spark_img else None
 
         # rects
         self.logo_rect = self.logo_img.get_rect(
@@ -157,7 +172,15 @@ class TitleScene(Scene):
         for e in events:
             if e.type == pygame.KEYDOWN and e.key == pygame.K_SPACE:
                 ##次のシーン名が決まったら、"ex_game" の部分を書き換えてください！！！
+                self.start_game()
                 self.request_next("pose_estimate_multi")
+            elif e.type == pygame.KEYDOWN and e.key == pygame.K_l:
+                self.request_next("leaderboard")
+
+    def start_game(self):
+        """新しいゲームを始める（途中で終わった前のゲームの得点は持ち越さない）"""
+        game_state.reset_scores()
+        score_store.start_session()
 
     def update(self, dt):
         pass
@@ -178,7 +201,7 @@ class TitleScene(Scene):
         surface.blit(self.bg_img, (ox, oy))
 
         # logo
-        self.blit_fade(surface, self.logo_img,
+        self.blit_fade(surface, self.logo_sprite,
                        self.logo_rect.topleft,
                        self.LOGO_DELAY_MS, elapsed, self.FADE_MS)
 
@@ -197,6 +220,17 @@ class TitleScene(Scene):
                     self.TEXT_SHADOW
                 )
 
+        self.draw_loading(surface)
+
+    def draw_loading(self, surface):
+        """採点モデルの読み込み中は左下に進捗を出す"""
+        if self.app is None or self.renderer is None:
+            return
+        msg = self.app.model_loading_text()
+        if msg:
+            t = self.renderer.render_system(msg, 16, (255, 255, 255))
+            surface.blit(t, (10, self.SCREEN_HEIGHT - t.get_height() - 8))
+
     # ---------------------------------------
     # character animation
     # ---------------------------------------
@@ -214,13 +248,8 @@ class TitleScene(Scene):
         chars_elapsed = elapsed - self.CHARS_DELAY_MS
         alpha = min(255, int(255 * (chars_elapsed / self.FADE_MS)))
 
-        img1 = self.char1_img.copy()
-        img2 = self.char2_img.copy()
-        img1.set_alpha(alpha)
-        img2.set_alpha(alpha)
-
-        surface.blit(img1, (c1_pos[0]+ox, c1_pos[1]+oy))
-        surface.blit(img2, (c2_pos[0]+ox, c2_pos[1]+oy))
+        self.char1_sprite.blit(surface, (c1_pos[0]+ox, c1_pos[1]+oy), alpha)
+        self.char2_sprite.blit(surface, (c2_pos[0]+ox, c2_pos[1]+oy), alpha)
 
         # peak hit flash
         if abs(cycle_t - self.ATTACK_PEAK_MS) < 80:
@@ -234,15 +263,13 @@ class TitleScene(Scene):
                 self.spark_until = now + self.HIT_SPARK_DURATION_MS
                 self.spark_pos = (hx+ox, hy+oy)
 
-            flash = pygame.Surface(
-                (self.SCREEN_WIDTH, self.SCREEN_HEIGHT), pygame.SRCALPHA)
-            flash.fill((255, 255, 255, 120))
-            surface.blit(flash, (0, 0))
+            with self.layers.layer(alpha=False) as flash:
+                flash.fill((255, 255, 255))
+                flash.set_alpha(120)
+                surface.blit(flash, (0, 0))
 
             self.shake_until = now + self.SHAKE_DURATION_MS
 
-        if self.spark_img and now < self.spark_until:
-            s = self.spark_img.copy()
-            s.set_alpha(self.HIT_SPARK_ALPHA)
-            rect = s.get_rect(center=self.spark_pos)
-            surface.blit(s, rect)
+        if self.spark_sprite and now < self.spark_until:
+            rect = self.spark_img.get_rect(center=self.spark_pos)
+            self.spark_sprite.blit(surface, rect, self.HIT_SPARK_ALPHA)
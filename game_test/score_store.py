@@ -0,0 +1,402 @@
+# -*- coding: utf-8 -*-
+"""
+得点の保存先（SQLite）。scores.txt / 1Pscores.txt / 2Pscores.txt / finalscores.txt の代わり。
+
+    セッション(sessions) : タイトルから最終結果までの1ゲーム
+    ラウンド(rounds)     : 1回の撮影（お題1つ）。session_id と round_no を持つ
+    得点(player_scores)  : ラウンドごと・プレイヤーごとの Dynamic / Stable / Unique
+
+追記は INSERT 1回、読み出しはインデックス付きのクエリで行う。
+シーンからはモジュール末尾の score_store（game_state と同じく共有インスタンス）を使う。
+"""
+import os
+import queue
+import sqlite3
+import threading
+from datetime import datetime
+
+from common import Config, game_state
+
+SCORE_KEYS = ("Dynamic", "Stable", "Unique")
+
+
+def display_scores(scores):
+    """画面に出す項目ごとの点（項目ごとに四捨五入した整数）[D, S, U]"""
+    return [int(round(float(scores.get(k, 0.0)))) for k in SCORE_KEYS]
+
+
+def round_total(scores):
+    """ラウンドの合計点。画面に出した項目ごとの整数を足す（勝敗もこれで決める）"""
+    return sum(display_scores(scores))
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at  TEXT NOT NULL,
+    ended_at    TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_open ON sessions(ended_at, id);
+
+CREATE TABLE IF NOT EXISTS rounds (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id  INTEGER NOT NULL REFERENCES sessions(id),
+    round_no    INTEGER NOT NULL,
+    theme       TEXT NOT NULL DEFAULT '',
+    created_at  TEXT NOT NULL,
+    UNIQUE (session_id, round_no)
+);
+
+CREATE TABLE IF NOT EXISTS player_scores (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    round_id    INTEGER NOT NULL REFERENCES rounds(id),
+    player      INTEGER NOT NULL,
+    dynamic     REAL NOT NULL,
+    stable      REAL NOT NULL,
+    uniq        REAL NOT NULL,
+    total       REAL NOT NULL,
+    image_path  TEXT,
+    created_at  TEXT NOT NULL,
+    theme       TEXT NOT NULL DEFAULT '',  -- ランキング用に rounds から複製
+    day         TEXT NOT NULL DEFAULT '',  -- YYYY-MM-DD（ランキング用）
+    UNIQUE (round_id, player)
+);
+"""
+
+# ランキングで並べ替えられる項目 → 列名
+LEADERBOARD_COLUMNS = {
+    "Total": "total",
+    "Dynamic": "dynamic",
+    "Stable": "stable",
+    "Unique": "uniq",
+}
+
+# 「全体 / お題別 / 日別」×「項目」ごとのインデックス（上位 N 件を並べ替えなしで取れる）
+_LEADERBOARD_INDEXES = "".join(
+    f"CREATE INDEX IF NOT EXISTS idx_ps_{col} ON player_scores({col} DESC);\n"
+    f"CREATE INDEX IF NOT EXISTS idx_ps_theme_{col} ON player_scores(theme, {col} DESC);\n"
+    f"CREATE INDEX IF NOT EXISTS idx_ps_day_{col} ON player_scores(day, {col} DESC);\n"
+    for col in LEADERBOARD_COLUMNS.values()
+)
+
+
+def _now():
+    return datetime.now().isoformat(timespec="seconds")
+
+
+class ScoreStore:
+    """得点の保存・読み出し。複数スレッドから呼んでよい（内部でロック）"""
+
+    def __init__(self, path):
+        self.path = path
+        self._conn = None
+        self._lock = threading.RLock()
+        self._write_q = queue.Queue()
+        self._writer = None
+
+    # -------------------------
+    # 接続
+    # -------------------------
+    def _db(self):
+        """初回アクセス時に接続してテーブルを作る"""
+        if self._conn is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._migrate(conn)
+            conn.executescript(_LEADERBOARD_INDEXES)
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def _migrate(conn):
+        """
+        古い DB を今の形にそろえる
+        - theme / day 列が無ければ足して埋める
+        - total を round_total（結果画面に出した整数の合計）で入れ直す（user_version 1）
+        """
+        cols = {row["name"] for row in conn.execute("PRAGMA table_info(player_scores)")}
+        if "theme" not in cols or "day" not in cols:
+            ScoreStore._add_ranking_columns(conn, cols)
+        if conn.execute("PRAGMA user_version").fetchone()[0] < 1:
+            rows = conn.execute("SELECT id, dynamic, stable, uniq FROM player_scores").fetchall()
+            with conn:
+                conn.executemany(
+                    "UPDATE player_scores SET total = ? WHERE id = ?",
+                    [(round_total(dict(zip(SCORE_KEYS, (r["dynamic"], r["stable"], r["uniq"])))), r["id"])
+                     for r in rows],
+                )
+                conn.execute("PRAGMA user_version = 1")
+
+    @staticmethod
+    def _add_ranking_columns(conn, cols):
+        with conn:
+            if "theme" not in cols:
+                conn.execute("ALTER TABLE player_scores ADD COLUMN theme TEXT NOT NULL DEFAULT ''")
+            if "day" not in cols:
+                conn.execute("ALTER TABLE player_scores ADD COLUMN day TEXT NOT NULL DEFAULT ''")
+            conn.execute(
+                "UPDATE player_scores SET"
+                " theme = COALESCE((SELECT theme FROM rounds WHERE rounds.id = player_scores.round_id), ''),"
+                " day = substr(created_at, 1, 10)"
+            )
+
+    # -------------------------
+    # 裏での書き込み（フレームループを止めない）
+    # -------------------------
+    def submit(self, method_name, *args, **kwargs):
+        """書き込み系メソッドを書き込み用スレッドで実行する"""
+        with self._lock:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_loop, name="score-store", daemon=True)
+                self._writer.start()
+        self._write_q.put((method_name, args, kwargs))
+
+    def _write_loop(self):
+        while True:
+            method_name, args, kwargs = self._write_q.get()
+            try:
+                getattr(self, method_name)(*args, **kwargs)
+            except Exception as e:
+                print(f"[WARN] score store write failed ({method_name}): {e}")
+            finally:
+                self._write_q.task_done()
+
+    def flush(self):
+        """裏で溜まっている書き込みが全部終わるまで待つ"""
+        if self._writer is not None:
+            self._write_q.join()
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # -------------------------
+    # セッション
+    # -------------------------
+    def start_session(self):
+        """
+        新しいゲームを始める（タイトルでスタートしたとき）。
+        最終結果まで行かずに終わったゲーム（途中でやめた・落ちた）のセッションはここで閉じるので、
+        その得点が次のゲームの合計に入ることはない（記録とランキングには残る）
+        """
+        with self._lock:
+            db = self._db()
+            with db:
+                now = _now()
+                db.execute("UPDATE sessions SET ended_at = ? WHERE ended_at IS NULL", (now,))
+                cur = db.execute("INSERT INTO sessions(started_at) VALUES (?)", (now,))
+            return cur.lastrowid
+
+    def current_session(self):
+        """終わっていない最新のセッション id（無ければ新しく作る）"""
+        with self._lock:
+            row = self._db().execute(
+                "SELECT id FROM sessions WHERE ended_at IS NULL ORDER BY id DESC LIMIT 1"
+            ).fetchone()
+            return row["id"] if row else self.start_session()
+
+    def end_session(self, session_id):
+        with self._lock:
+            db = self._db()
+            with db:
+                db.execute("UPDATE sessions SET ended_at = ? WHERE id = ?", (_now(), session_id))
+
+    # -------------------------
+    # ラウンド
+    # -------------------------
+    def start_round(self, session_id=None, theme=""):
+        with self._lock:
+            if session_id is None:
+                session_id = self.current_session()
+            db = self._db()
+            with db:
+                row = db.execute(
+                    "SELECT COALESCE(MAX(round_no), 0) AS n FROM rounds WHERE session_id = ?",
+                    (session_id,),
+                ).fetchone()
+                cur = db.execute(
+                    "INSERT INTO rounds(session_id, round_no, theme, created_at) VALUES (?, ?, ?, ?)",
+                    (session_id, row["n"] + 1, theme or "", _now()),
+                )
+            return cur.lastrowid
+
+    def latest_round_id(self, session_id=None):
+        with self._lock:
+            if session_id is None:
+                session_id = self.current_session()
+            row = self._db().execute(
+                "SELECT id FROM rounds WHERE session_id = ? ORDER BY round_no DESC LIMIT 1",
+                (session_id,),
+            ).fetchone()
+            return row["id"] if row else None
+
+    def get_round(self, round_id):
+        """
+        ラウンドの内容を返す
+        {"id", "session_id", "round_no", "theme",
+         "players": {1: {"Dynamic", "Stable", "Unique", "total", "image_path"}, 2: {...}}}
+        """
+        with self._lock:
+            db = self._db()
+            r = db.execute("SELECT * FROM rounds WHERE id = ?", (round_id,)).fetchone()
+            if r is None:
+                return None
+            rows = db.execute(
+                "SELECT * FROM player_scores WHERE round_id = ? ORDER BY player", (round_id,)
+            ).fetchall()
+        return {
+            "id": r["id"],
+            "session_id": r["session_id"],
+            "round_no": r["round_no"],
+            "theme": r["theme"],
+            "players": {row["player"]: self._player_dict(row) for row in rows},
+        }
+
+    @staticmethod
+    def _player_dict(row):
+        return {
+            "Dynamic": row["dynamic"],
+            "Stable": row["stable"],
+            "Unique": row["uniq"],
+            "total": row["total"],
+            "image_path": row["image_path"],
+        }
+
+    # -------------------------
+    # 得点
+    # -------------------------
+    def record_player_score(self, round_id, player, scores, image_path=None):
+        """ラウンドにプレイヤーの得点を1件追加する（同じラウンド・プレイヤーなら上書き）"""
+        values = [float(scores.get(k, 0.0)) for k in SCORE_KEYS]
+        # total は画面に出した合計（ランキングの Total も結果画面と同じ数字になる）
+        total = round_total(scores)
+        now = _now()
+        with self._lock:
+            db = self._db()
+            with db:
+                r = db.execute("SELECT theme FROM rounds WHERE id = ?", (round_id,)).fetchone()
+                db.execute(
+                    "INSERT OR REPLACE INTO player_scores"
+                    "(round_id, player, dynamic, stable, uniq, total, image_path, created_at, theme, day)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (round_id, player, *values, total, image_path, now,
+                     r["theme"] if r else "", now[:10]),
+                )
+
+    def next_player_slot(self, session_id=None):
+        """
+        次に得点を入れる (round_id, player) を返す。
+        最新ラウンドに 1P だけ入っていれば 2P、それ以外は新しいラウンドの 1P。
+        """
+        with self._lock:
+            round_id = self.latest_round_id(session_id)
+            if round_id is not None:
+                players = {
+                    row["player"]
+                    for row in self._db().execute(
+                        "SELECT player FROM player_scores WHERE round_id = ?", (round_id,)
+                    )
+                }
+                if not players:
+                    return round_id, 1
+                if players == {1}:
+                    return round_id, 2
+            return self.start_round(session_id), 1
+
+    def player_image(self, player, session_id=None):
+        """セッションで最後に採点されたそのプレイヤーの画像パス（無ければ None）"""
+        with self._lock:
+            if session_id is None:
+                session_id = self.current_session()
+            row = self._db().execute(
+                "SELECT p.image_path AS image_path"
+                " FROM rounds r JOIN player_scores p ON p.round_id = r.id AND p.player = ?"
+                " WHERE r.session_id = ? AND p.image_path IS NOT NULL"
+                " ORDER BY r.round_no DESC LIMIT 1",
+                (player, session_id),
+            ).fetchone()
+        return row["image_path"] if row else None
+
+    def session_totals(self, session_id=None):
+        """
+        セッション内の各プレイヤーの合計点 {1: int, 2: int}
+        （total 列は round_total = 結果画面に出した数字の合計なので、そのまま足せばよい）
+        """
+        with self._lock:
+            if session_id is None:
+                session_id = self.current_session()
+            rows = self._db().execute(
+                "SELECT p.player AS player, SUM(p.total) AS total"
+                " FROM player_scores p JOIN rounds r ON p.round_id = r.id"
+                " WHERE r.session_id = ? GROUP BY p.player",
+                (session_id,),
+            ).fetchall()
+        totals = {1: 0, 2: 0}
+        totals.update({row["player"]: int(round(row["total"])) for row in rows})
+        return totals
+
+    def session_component_totals(self, session_id=None):
+        """セッション内の各プレイヤーの項目別合計 {1: [D, S, U], 2: [D, S, U]}"""
+        with self._lock:
+            if session_id is None:
+                session_id = self.current_session()
+            rows = self._db().execute(
+                "SELECT p.player AS player, SUM(p.dynamic) AS d, SUM(p.stable) AS s, SUM(p.uniq) AS u"
+                " FROM player_scores p JOIN rounds r ON p.round_id = r.id"
+                " WHERE r.session_id = ? GROUP BY p.player",
+                (session_id,),
+            ).fetchall()
+        out = {1: [0.0, 0.0, 0.0], 2: [0.0, 0.0, 0.0]}
+        out.update({row["player"]: [row["d"], row["s"], row["u"]] for row in rows})
+        return out
+
+    # -------------------------
+    # ランキング
+    # -------------------------
+    def top_scores(self, limit=10, component="Total", theme=None, day=None):
+        """
+        上位 limit 件を返す（インデックスを使うので件数が増えても速い）
+        component: "Total" / "Dynamic" / "Stable" / "Unique"
+        theme:     お題で絞り込み（None なら全部）
+        day:       "YYYY-MM-DD" で絞り込み（None なら全期間）
+        戻り値: [{"rank", "score", "player", "theme", "day", "round_id", "image_path", "created_at"}, ...]
+        """
+        col = LEADERBOARD_COLUMNS.get(component)
+        if col is None:
+            raise ValueError(f"Unknown component: {component}")
+        if theme is not None and day is not None:
+            # 両方で絞るときはお題のインデックスを使い、日付は絞り込みのみ
+            where, params = "WHERE theme = ? AND day = ?", [theme, day]
+        elif theme is not None:
+            where, params = "WHERE theme = ?", [theme]
+        elif day is not None:
+            where, params = "WHERE day = ?", [day]
+        else:
+            where, params = "", []
+
+        with self._lock:
+            rows = self._db().execute(
+                f"SELECT {col} AS score, player, theme, day, round_id, image_path, created_at"
+                f" FROM player_scores {where} ORDER BY {col} DESC LIMIT ?",
+                (*params, int(limit)),
+            ).fetchall()
+        return [{"rank": i + 1, **dict(row)} for i, row in enumerate(rows)]
+
+
+# シーン間で共有するインスタンス（game_state と同じ扱い）
+score_store = ScoreStore(Config.PATH_SCORE_DB)
+
+
+def publish_player_score(round_id, player, scores, image_path=None):
+    """
+    採点結果を game_state に載せて購読中のシーンに知らせ、DB への保存は裏で行う
+    """
+    game_state.publish_score(round_id, player, scores)
+    score_store.submit("record_player_score", round_id, player, scores, image_path=image_path)
@@ -0,0 +1,247 @@
+# -*- coding: utf-8 -*-
+"""
+骨格推定(PoseEstimator)と採点(ScorePredictor)を別プロセスで動かす推論サービス。
+
+pygame と同じプロセスで YOLO / TensorFlow を動かすと GIL を取り合って描画が重くなるので、
+推論は子プロセスに任せ、ゲーム側は InferenceClient 経由でリクエストを投げて Future で受け取る。
+
+    client = InferenceClient()            # 子プロセスを起動（mode="local" ならスレッドで代用）
+    fut = client.submit("pose", image_path="a.jpg", on_black=True)
+    if fut.done():
+        res = fut.result()                # {"drawn": ndarray, "skeleton": ndarray, "info": {...}}
+
+リクエスト:
+    "pose"   image_path, on_black  → {"drawn", "skeleton", "info"}（info は raw/base を除いた推定結果）
+    "score"  image_path            → {"Dynamic": float, "Stable": float, "Unique": float} or None
+    "status"                       → ScorePredictor.status()
+"""
+import itertools
+import multiprocessing as mp
+import queue
+import threading
+import traceback
+from concurrent.futures import Future, InvalidStateError
+
+import numpy as np
+
+OPS = ("pose", "score", "status")
+
+
+class InferenceWorker:
+    """実際に推論を行う側（子プロセス内、または local モードのスレッド内で動く）"""
+
+    def __init__(self, pose_kwargs=None, score_kwargs=None):
+        self.pose_kwargs = pose_kwargs or {}
+        self.score_kwargs = score_kwargs or {}
+        self.estimator = None
+        self.predictor = None
+
+    def start(self):
+        """モデルの準備（採点モデルは裏で読み込み、YOLO は最初の pose で読み込む）"""
+        from scenes.score_predictor import ScorePredictor
+
+        self.predictor = ScorePredictor(background=True, **self.score_kwargs)
+
+    def _get_estimator(self):
+        if self.estimator is None:
+            from scenes.pose_estimate import PoseEstimator, PoseEstimatorConfig
+
+            self.estimator = PoseEstimator(PoseEstimatorConfig(**self.pose_kwargs))
+        return self.estimator
+
+    def handle(self, op, kwargs):
+        if op == "pose":
+            return self.pose(**kwargs)
+        if op == "score":
+            return self.score(**kwargs)
+        if op == "status":
+            return self.predictor.status()
+        raise ValueError(f"Unknown op: {op}")
+
+    def pose(self, image_path, on_black=None):
+        est = self._get_estimator()
+        info = est.estimate(image_path)
+        base, raw = info["base"], info["raw"]
+        drawn = est.draw(base, raw, on_black=on_black)
+        # 保存用の「黒背景に骨格だけ」の画像もここで作っておく（raw はプロセス間で渡さない）
+        skeleton = est.draw(base, raw, on_black=True)
+        info = {k: v for k, v in info.items() if k not in ("raw", "base")}
+        return {"drawn": np.ascontiguousarray(drawn), "skeleton": np.ascontiguousarray(skeleton), "info": info}
+
+    def score(self, image_path):
+        scores = self.predictor.predict(image_path)
+        if scores is None:
+            return None
+        return {k: float(v) for k, v in scores.items()}
+
+
+def _drain(q):
+    items = []
+    while True:
+        try:
+            items.append(q.get_nowait())
+        except queue.Empty:
+            return items
+
+
+def _serve(req_q, res_q, cancel_q, pose_kwargs, score_kwargs):
+    """
+    子プロセスのメインループ。None を受け取ったら終了
+    cancel_q に届いた id（呼び出し側で cancel した Future）のリクエストは推論せずに捨てる
+    """
+    worker = InferenceWorker(pose_kwargs, score_kwargs)
+    worker.start()
+    cancelled = set()
+    while True:
+        req = req_q.get()
+        if req is None:
+            break
+        req_id, op, kwargs = req
+        cancelled.update(_drain(cancel_q))
+        if req_id in cancelled:
+            cancelled.discard(req_id)
+            continue
+        # リクエストは id 順に届くので、処理済みの id の cancel はもう要らない
+        cancelled = {i for i in cancelled if i > req_id}
+        try:
+            res_q.put((req_id, True, worker.handle(op, kwargs)))
+        except Exception as e:
+            res_q.put((req_id, False, f"{e}\n{traceback.format_exc()}"))
+
+
+class InferenceClient:
+    """
+    ゲーム側から推論サービスを呼ぶクライアント。
+    リクエストはキューに積まれ、サービス側で1件ずつ順番に処理される。
+
+    mode:
+        "process" : 子プロセスで推論（本番）
+        "local"   : 同じプロセスのスレッドで推論（テスト・デバッグ用の代用品）
+    worker:
+        local モードで使う InferenceWorker 相当のオブジェクト（handle(op, kwargs) を持つもの）。
+        省略時は本物の InferenceWorker。
+    """
+
+    def __init__(self, mode="process", pose_kwargs=None, score_kwargs=None, worker=None):
+        if mode not in ("process", "local"):
+            raise ValueError(f"Unknown mode: {mode}")
+        self.mode = mode
+        self._ids = itertools.count()
+        self._futures = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+        if mode == "process":
+            ctx = mp.get_context("spawn")  # Windows と同じ挙動に揃える
+            self._req_q = ctx.Queue()
+            self._res_q = ctx.Queue()
+            self._cancel_q = ctx.Queue()
+            self._proc = ctx.Process(
+                target=_serve,
+                args=(self._req_q, self._res_q, self._cancel_q, pose_kwargs, score_kwargs),
+                name="inference-service",
+                daemon=True,
+            )
+            self._proc.start()
+        else:
+            self._req_q = queue.Queue()
+            self._res_q = queue.Queue()
+            self._cancel_q = None
+            self._proc = None
+            if worker is None:
+                worker = InferenceWorker(pose_kwargs, score_kwargs)
+                worker.start()
+            self._local_worker = worker
+            threading.Thread(target=self._local_loop, name="inference-local", daemon=True).start()
+
+        self._receiver = threading.Thread(target=self._receive_loop, name="inference-recv", daemon=True)
+        self._receiver.start()
+
+    # -------------------------
+    # 公開 API
+    # -------------------------
+    def submit(self, op, **kwargs):
+        """リクエストをキューに積み、結果の Future を返す（ブロックしない）"""
+        if op not in OPS:
+            raise ValueError(f"Unknown op: {op}")
+        fut = Future()
+        if self._closed:
+            fut.set_exception(RuntimeError("inference client is closed"))
+            return fut
+        req_id = next(self._ids)
+        with self._lock:
+            self._futures[req_id] = fut
+        fut.add_done_callback(lambda f, req_id=req_id: self._on_done(req_id, f))
+        self._req_q.put((req_id, op, kwargs))
+        return fut
+
+    def pending(self):
+        """まだ結果が返っていないリクエスト数"""
+        with self._lock:
+            return len(self._futures)
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._req_q.put(None)
+        if self._proc is not None:
+            self._proc.join(timeout=2.0)
+            if self._proc.is_alive():
+                self._proc.terminate()
+        self._res_q.put(None)
+        self._receiver.join(timeout=1.0)
+        with self._lock:
+            futures, self._futures = list(self._futures.values()), {}
+        for fut in futures:
+            if fut.cancel():
+                continue
+            try:
+                fut.set_exception(RuntimeError("inference client is closed"))
+            except InvalidStateError:
+                pass
+
+    # -------------------------
+    # 内部
+    # -------------------------
+    def _on_done(self, req_id, fut):
+        """呼び出し側で cancel されたら、まだ推論していなければサービス側で捨ててもらう"""
+        if not fut.cancelled():
+            return
+        with self._lock:
+            self._futures.pop(req_id, None)
+        if self._cancel_q is not None and not self._closed:
+            self._cancel_q.put(req_id)
+
+    def _local_loop(self):
+        while True:
+            req = self._req_q.get()
+            if req is None:
+                break
+            req_id, op, kwargs = req
+            with self._lock:
+                fut = self._futures.get(req_id)
+            if fut is None or fut.cancelled():
+                continue
+            try:
+                self._res_q.put((req_id, True, self._local_worker.handle(op, kwargs)))
+            except Exception as e:
+                self._res_q.put((req_id, False, f"{e}\n{traceback.format_exc()}"))
+
+    def _receive_loop(self):
+        while True:
+            msg = self._res_q.get()
+            if msg is None:
+                break
+            req_id, ok, value = msg
+            with self._lock:
+                fut = self._futures.pop(req_id, None)
+            if fut is None:
+                continue
+            try:
+                if ok:
+                    fut.set_result(value)
+                else:
+                    fut.set_exception(RuntimeError(value))
+            except InvalidStateError:
+                pass  # 呼び出し側で cancel 済み
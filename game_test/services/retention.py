@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+"""
+撮影画像（shuttered）と骨格推定の出力（outputs_estimated）の整理係。
+
+ブースで何週間も動かすとフォルダに画像が溜まり続けて、ディスク・バックアップ・フォルダ走査が重くなる。
+古い順に「日数 / 枚数 / 合計サイズ」の上限を超えた分を消す（archive_dir があれば、消す前に
+日付ごとの tar.gz にまとめる。1回ごとに別の tar.gz）。フレームループは止めず、シーン切替のときに裏スレッドで動く。
+
+    retention = RetentionService([RetentionPolicy(Config.PATH_SHUTTER_DIR)], archive_dir="archive")
+    retention.request(protected=game_state.shutter_paths)   # すぐ戻る（実際の整理は裏で）
+
+今のゲームで使っている画像は protected に渡しておけば消さない（上限の数には入る）。
+"""
+import fnmatch
+import os
+import tarfile
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+
+
+@dataclass
+class RetentionPolicy:
+    directory: str
+    patterns: tuple = ("*.jpg", "*.jpeg", "*.png")
+    max_age_days: float | None = 30  # None なら制限なし
+    max_files: int | None = 2000
+    max_mb: float | None = 2048
+
+
+class RetentionService:
+    def __init__(self, policies, archive_dir=None, min_interval=300.0):
+        """
+        policies: RetentionPolicy のリスト
+        archive_dir: 消す前に日付ごと・1回ごとの tar.gz を置くフォルダ（None ならそのまま消す）
+        min_interval: これより短い間隔の request() は無視する（秒）
+        """
+        self.policies = list(policies)
+        self.archive_dir = archive_dir
+        self.min_interval = min_interval
+        self._last_run = None
+        self._protected = set()
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._closed = False
+
+    # -------------------------
+    # 呼び出し側（メインスレッド）
+    # -------------------------
+    def request(self, protected=(), force=False):
+        """裏スレッドに整理を頼む（待たない）。間隔が短すぎて見送ったら False"""
+        now = time.monotonic()
+        if not force and self._last_run is not None and now - self._last_run < self.min_interval:
+            return False
+        self._last_run = now
+        with self._lock:
+            self._protected = {os.path.abspath(p) for p in protected if p}
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name="retention", daemon=True)
+            self._thread.start()
+        self._wake.set()
+        return True
+
+    def close(self):
+        self._closed = True
+        self._wake.set()
+
+    # -------------------------
+    # 裏スレッド
+    # -------------------------
+    def _loop(self):
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            if self._closed:
+                return
+            with self._lock:
+                protected = set(self._protected)
+            try:
+                self.run_once(protected)
+            except Exception as e:
+                print(f"[retention] failed: {e}")
+
+    def run_once(self, protected=()):
+        """すべてのフォルダを1回整理して {"removed", "archived", "freed_mb"} を返す"""
+        protected = {os.path.abspath(p) for p in protected}
+        stats = {"removed": 0, "archived": 0, "freed_mb": 0.0}
+        now = time.time()
+        for policy in self.policies:
+            files = self._scan(policy)
+            expired = self._select(policy, files, now, protected)
+            if not expired:
+                continue
+            if self.archive_dir:
+                expired = self._archive(policy, expired)
+                stats["archived"] += len(expired)
+            for path, _, size in expired:
+                try:
+                    os.remove(path)
+                except OSError as e:
+                    print(f"[retention] could not remove {path}: {e}")
+                    continue
+                stats["removed"] += 1
+                stats["freed_mb"] += size / (1024 * 1024)
+        if stats["removed"]:
+            print(f"[retention] removed {stats['removed']} files "
+                  f"({stats['freed_mb']:.1f}MB, archived {stats['archived']})")
+        return stats
+
+    @staticmethod
+    def _scan(policy):
+        """[(path, mtime, size)] 新しい順"""
+        if not os.path.isdir(policy.directory):
+            return []
+        files = []
+        with os.scandir(policy.directory) as it:
+            for entry in it:
+                if not entry.is_file() or not any(fnmatch.fnmatch(entry.name, p) for p in policy.patterns):
+                    continue
+                st = entry.stat()
+                files.append((os.path.abspath(entry.path), st.st_mtime, st.st_size))
+        files.sort(key=lambda f: f[1], reverse=True)
+        return files
+
+    @staticmethod
+    def _select(policy, files, now, protected):
+        """新しい方から数えて、日数・枚数・サイズのどれかの上限を超えたものを選ぶ"""
+        max_age = policy.max_age_days * 86400 if policy.max_age_days is not None else None
+        max_bytes = policy.max_mb * 1024 * 1024 if policy.max_mb is not None else None
+        count = 0
+        total = 0
+        expired = []
+        for path, mtime, size in files:
+            count += 1
+            total += size
+            if path in protected:
+                continue
+            if ((max_age is not None and now - mtime > max_age)
+                    or (policy.max_files is not None and count > policy.max_files)
+                    or (max_bytes is not None and total > max_bytes)):
+                expired.append((path, mtime, size))
+        return expired
+
+    def _archive(self, policy, expired):
+        """
+        日付ごとに <フォルダ名>_<YYYY-MM-DD>_<まとめた時刻>.tar.gz へまとめる。まとめられたものだけ返す（それだけ消す）
+        1回ごとに新しい tar.gz を作るので、前の tar.gz を開いて作り直すことはない（何度動いても重くならない）
+        """
+        by_day = {}
+        for f in expired:
+            day = datetime.fromtimestamp(f[1]).strftime("%Y-%m-%d")
+            by_day.setdefault(day, []).append(f)
+
+        os.makedirs(self.archive_dir, exist_ok=True)
+        name = os.path.basename(os.path.normpath(policy.directory))
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        existing = set(os.listdir(self.archive_dir))
+        archived = []
+        for day, group in sorted(by_day.items()):
+            filename = self._unique_name(f"{name}_{day}_{stamp}.tar.gz", existing)
+            existing.add(filename)
+            bundle = os.path.join(self.archive_dir, filename)
+            tmp = bundle + ".tmp"
+            written = []
+            try:
+                with tarfile.open(tmp, "w:gz") as out:
+                    for f in group:
+                        try:
+                            out.add(f[0], arcname=os.path.basename(f[0]))
+                        except OSError as e:
+                            print(f"[retention] could not archive {f[0]}: {e}")
+                            continue
+                        written.append(f)
+                if written:
+                    os.replace(tmp, bundle)
+                else:
+                    os.remove(tmp)
+            except (OSError, tarfile.TarError) as e:
+                print(f"[retention] could not archive {bundle}: {e}")
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+                continue
+            archived.extend(written)
+        return archived
+
+    @staticmethod
+    def _unique_name(name, taken):
+        """taken に無い名前（name, name~1.ext, name~2.ext, ...。.tar.gz は1つの拡張子として扱う）"""
+        stem, ext = (name[:-7], ".tar.gz") if name.endswith(".tar.gz") else os.path.splitext(name)
+        n = 0
+        while name in taken:
+            n += 1
+            name = f"{stem}~{n}{ext}"
+        return name
@@ -0,0 +1,362 @@
+# -*- coding: utf-8 -*-
+"""
+複数ブースで共有する採点サーバー（ScorePredictor / PoseEstimator を1台にまとめる）。
+
+各ブースの game_main はモデルを読み込まず、RemoteScoreBackend で画像を送って
+スコア辞書を受け取る。サーバーは複数クライアントのリクエストを少しだけ溜めて
+（マイクロバッチ）1回の推論にまとめる。サーバーに繋がらない・時間切れのときは
+ローカルの ScorePredictor で採点する。
+
+サーバー起動（リポジトリのルートで実行）:
+    python game_test/services/scoring_server.py --host 0.0.0.0 --port 5055
+
+通信形式: 4バイト(ビッグエンディアン)の長さ + UTF-8 JSON を1メッセージとする。
+    リクエスト  {"id": 1, "op": "score" | "pose", "image": "<JPEG を base64>"}
+    レスポンス  {"id": 1, "ok": true, "result": ...} / {"id": 1, "ok": false, "error": "..."}
+    score の result: {"Dynamic": float, "Stable": float, "Unique": float}
+    pose  の result: {"num_persons", "width", "height", "rows"}（PoseEstimator.estimate と同じ rows）
+"""
+import argparse
+import base64
+import itertools
+import json
+import os
+import queue
+import socket
+import socketserver
+import struct
+import sys
+import threading
+import time
+import traceback
+
+import cv2
+import numpy as np
+
+DEFAULT_PORT = 5055
+OPS = ("score", "pose")
+_HEADER = struct.Struct(">I")
+MAX_MESSAGE_BYTES = 32 * 1024 * 1024
+
+
+# ==================================================
+# 通信
+# ==================================================
+def send_message(sock, obj):
+    data = json.dumps(obj).encode("utf-8")
+    sock.sendall(_HEADER.pack(len(data)) + data)
+
+
+def _recv_exact(sock, n):
+    buf = bytearray()
+    while len(buf) < n:
+        chunk = sock.recv(n - len(buf))
+        if not chunk:
+            return None
+        buf.extend(chunk)
+    return bytes(buf)
+
+
+def recv_message(sock):
+    """1メッセージ受信する。接続が切れたら None"""
+    header = _recv_exact(sock, _HEADER.size)
+    if header is None:
+        return None
+    (length,) = _HEADER.unpack(header)
+    if length > MAX_MESSAGE_BYTES:
+        raise ValueError(f"message too large: {length} bytes")
+    data = _recv_exact(sock, length)
+    if data is None:
+        return None
+    return json.loads(data.decode("utf-8"))
+
+
+def encode_image_file(image_path):
+    with open(image_path, "rb") as f:
+        return base64.b64encode(f.read()).decode("ascii")
+
+
+def decode_image(b64):
+    buf = np.frombuffer(base64.b64decode(b64), dtype=np.uint8)
+    img = cv2.imdecode(buf, cv2.IMREAD_COLOR)
+    if img is None:
+        raise ValueError("画像のデコードに失敗しました")
+    return img
+
+
+# ==================================================
+# サーバー
+# ==================================================
+class _Job:
+    __slots__ = ("op", "image", "reply")
+
+    def __init__(self, op, image, reply):
+        self.op = op
+        self.image = image
+        self.reply = reply
+
+
+class ScoringServer:
+    """
+    predictor: predict_batch(images) を持つもの（ScorePredictor）
+    estimator: estimate_batch(images) を持つもの（PoseEstimator）。None なら pose は受け付けない
+    max_batch: 1回の推論にまとめる最大件数
+    max_wait:  バッチが揃うのを待つ最大秒数（最初の1件が来てから）
+    """
+
+    def __init__(self, predictor, estimator=None, host="127.0.0.1", port=DEFAULT_PORT,
+                 max_batch=8, max_wait=0.02):
+        self.predictor = predictor
+        self.estimator = estimator
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._jobs = queue.Queue()
+        self._stop = threading.Event()
+
+        server = self
+
+        class Handler(socketserver.BaseRequestHandler):
+            def handle(self):
+                server._handle_connection(self.request)
+
+        class _TCPServer(socketserver.ThreadingTCPServer):
+            allow_reuse_address = True
+            daemon_threads = True
+
+        self._tcp = _TCPServer((host, port), Handler)
+        self.address = self._tcp.server_address
+        self._threads = []
+
+    # -------------------------
+    # 起動・停止
+    # -------------------------
+    def start(self):
+        """別スレッドで待ち受けとバッチ処理を開始する"""
+        for target, name in ((self._tcp.serve_forever, "scoring-accept"), (self._batch_loop, "scoring-batch")):
+            t = threading.Thread(target=target, name=name, daemon=True)
+            t.start()
+            self._threads.append(t)
+        return self
+
+    def serve_forever(self):
+        self.start()
+        try:
+            while not self._stop.is_set():
+                time.sleep(0.5)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.shutdown()
+
+    def shutdown(self):
+        self._stop.set()
+        self._jobs.put(None)
+        self._tcp.shutdown()
+        self._tcp.server_close()
+
+    # -------------------------
+    # 接続ごとの受信
+    # -------------------------
+    def _handle_connection(self, sock):
+        write_lock = threading.Lock()
+
+        def reply_to(req_id):
+            def reply(ok, value):
+                msg = {"id": req_id, "ok": ok, ("result" if ok else "error"): value}
+                with write_lock:
+                    try:
+                        send_message(sock, msg)
+                    except OSError:
+                        pass  # クライアントが切断済み
+            return reply
+
+        while not self._stop.is_set():
+            try:
+                req = recv_message(sock)
+            except (OSError, ValueError):
+                break
+            if req is None:
+                break
+            reply = reply_to(req.get("id"))
+            op = req.get("op")
+            if op not in OPS or (op == "pose" and self.estimator is None):
+                reply(False, f"unsupported op: {op}")
+                continue
+            try:
+                image = decode_image(req["image"])
+            except Exception as e:
+                reply(False, str(e))
+                continue
+            self._jobs.put(_Job(op, image, reply))
+
+    # -------------------------
+    # マイクロバッチ
+    # -------------------------
+    def _next_batch(self):
+        first = self._jobs.get()
+        if first is None:
+            return None
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            remain = deadline - time.monotonic()
+            if remain <= 0:
+                break
+            try:
+                job = self._jobs.get(timeout=remain)
+            except queue.Empty:
+                break
+            if job is None:
+                self._jobs.put(None)
+                break
+            batch.append(job)
+        return batch
+
+    def _batch_loop(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                break
+            for op in OPS:
+                jobs = [j for j in batch if j.op == op]
+                if jobs:
+                    self._run(op, jobs)
+
+    def _run(self, op, jobs):
+        images = [j.image for j in jobs]
+        try:
+            if op == "score":
+                results = self.predictor.predict_batch(images)
+            else:
+                results = [
+                    {k: info[k] for k in ("num_persons", "width", "height", "rows")}
+                    for info in self.estimator.estimate_batch(images)
+                ]
+        except Exception as e:
+            err = f"{e}\n{traceback.format_exc()}"
+            for j in jobs:
+                j.reply(False, err)
+            return
+
+        for j, res in zip(jobs, results):
+            if res is None:
+                j.reply(False, "prediction failed")
+            else:
+                j.reply(True, res)
+
+
+# ==================================================
+# クライアント
+# ==================================================
+class RemoteScoreBackend:
+    """
+    ScorePredictor の代わりに使える、採点サーバーへの薄いクライアント。
+    predict(image_path) はサーバーに問い合わせ、繋がらない・timeout 秒以内に返らない・
+    エラーのときは fallback_factory() で作ったローカルの ScorePredictor で採点する。
+    """
+
+    def __init__(self, host="127.0.0.1", port=DEFAULT_PORT, timeout=2.0, fallback_factory=None):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.fallback_factory = fallback_factory
+        self._fallback = None
+        self._sock = None
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    # ScorePredictor と同じ読み込み状況 API（サーバー側で読み込み済みとみなす）
+    def status(self):
+        return {"ready": True, "done": 0, "total": 0, "models": {}}
+
+    def is_ready(self):
+        return True
+
+    def wait_until_ready(self, timeout=None):
+        return True
+
+    def predict(self, image_path, timeout=None):
+        try:
+            return self.request("score", image_path, timeout=timeout)
+        except Exception as e:
+            print(f"[WARN] scoring server unavailable ({e}). scoring locally.")
+            fallback = self._get_fallback()
+            return fallback.predict(image_path) if fallback else None
+
+    def estimate_keypoints(self, image_path, timeout=None):
+        """サーバーで骨格推定して rows 形式の結果を返す（失敗時は例外）"""
+        return self.request("pose", image_path, timeout=timeout)
+
+    def request(self, op, image_path, timeout=None):
+        timeout = self.timeout if timeout is None else timeout
+        payload = {"id": next(self._ids), "op": op, "image": encode_image_file(image_path)}
+        with self._lock:
+            try:
+                sock = self._connect(timeout)
+                sock.settimeout(timeout)
+                send_message(sock, payload)
+                res = recv_message(sock)
+            except OSError:
+                self._close_socket()
+                raise
+            if res is None or res.get("id") != payload["id"]:
+                self._close_socket()
+                raise ConnectionError("invalid response from scoring server")
+        if not res.get("ok"):
+            raise RuntimeError(res.get("error"))
+        return res["result"]
+
+    def close(self):
+        with self._lock:
+            self._close_socket()
+
+    def _connect(self, timeout):
+        if self._sock is None:
+            self._sock = socket.create_connection((self.host, self.port), timeout=timeout)
+        return self._sock
+
+    def _close_socket(self):
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            except OSError:
+                pass
+            self._sock = None
+
+    def _get_fallback(self):
+        if self._fallback is None and self.fallback_factory is not None:
+            self._fallback = self.fallback_factory()
+        return self._fallback
+
+
+def main():
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+    from common import AppContext, Config
+    from scenes.pose_estimate import PoseEstimator, PoseEstimatorConfig
+    from scenes.score_predictor import ScorePredictor
+
+    parser = argparse.ArgumentParser(description="複数ブース共有の採点サーバー")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--max-batch", type=int, default=8)
+    parser.add_argument("--max-wait", type=float, default=0.02, help="バッチを待つ最大秒数")
+    parser.add_argument("--no-pose", action="store_true", help="骨格推定を受け付けない")
+    args = parser.parse_args()
+
+    predictor = ScorePredictor(**AppContext.score_predictor_kwargs())
+    estimator = None
+    if not args.no_pose:
+        estimator = PoseEstimator(PoseEstimatorConfig(
+            model_path=Config.POSE_MODEL_PATH,
+            runtime=Config.POSE_RUNTIME,
+            quantized=Config.USE_QUANTIZED_MODELS,
+        ))
+
+    server = ScoringServer(predictor, estimator, host=args.host, port=args.port,
+                           max_batch=args.max_batch, max_wait=args.max_wait)
+    print(f"scoring server listening on {server.address[0]}:{server.address[1]}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+"""
+テスト共通の準備（リポジトリのルートで python -m pytest -q）。
+tools/ と同じく game_test を import パスに入れ、画面・音は SDL のダミードライバで動かす。
+"""
+import os
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+GAME_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, GAME_DIR)
+
+import pygame  # noqa: E402
+import pytest  # noqa: E402
+
+
+@pytest.fixture
+def screen():
+    pygame.init()
+    surface = pygame.display.set_mode((800, 600))
+    yield surface
+    pygame.quit()
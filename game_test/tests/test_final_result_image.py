@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from common import game_state
+from scenes import final_result_scene_class
+from scenes.final_result_scene_class import get_result_image_path
+
+
+@pytest.fixture(autouse=True)
+def clean_state(monkeypatch):
+    game_state.reset_scores()
+    # DB の採点記録は見ない（必要なテストだけ差し替える）
+    monkeypatch.setattr(final_result_scene_class.score_store, "player_image", lambda player, session_id=None: None)
+    yield
+    game_state.reset_scores()
+
+
+def touch(path):
+    path.write_bytes(b"jpg")
+    return str(path)
+
+
+def test_prefers_pose_output_over_shutter(tmp_path):
+    shutter = touch(tmp_path / "shutter_1.jpg")
+    pose = touch(tmp_path / "estimated_shutter_1.jpg")
+    game_state.record_image(1, 1, shutter)
+    game_state.record_image(1, 1, pose, kind="pose")
+
+    assert get_result_image_path(1) == pose
+
+
+def test_falls_back_to_shutter_without_pose_output(tmp_path):
+    shutter = touch(tmp_path / "shutter_1.jpg")
+    game_state.record_image(1, 1, shutter)
+    # 記録はあってもファイルが消えていれば使わない
+    game_state.record_image(1, 1, str(tmp_path / "missing.jpg"), kind="pose")
+
+    assert get_result_image_path(1) == shutter
+
+
+def test_falls_back_to_score_store(tmp_path, monkeypatch):
+    stored = touch(tmp_path / "shutter_2.jpg")
+    monkeypatch.setattr(final_result_scene_class.score_store, "player_image",
+                        lambda player, session_id=None: stored if player == 2 else None)
+
+    assert get_result_image_path(2) == stored
+    assert get_result_image_path(1) is None
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+import pygame
+
+from core.manager import SceneManager
+from core.scene import Scene
+
+
+class IdleScene(Scene):
+    def __init__(self, timeout):
+        super().__init__()
+        self.timeout = timeout
+
+    def idle_timeout(self):
+        return self.timeout
+
+
+def test_tick_waits_at_least_1ms_for_sub_millisecond_timeout(screen, monkeypatch):
+    # event.wait(0) は「時間切れなしで待つ」なので、1ms 未満の残り時間で 0 を渡すと入力まで固まる
+    waits = []
+    monkeypatch.setattr(pygame.event, "wait", lambda ms=0: waits.append(ms) or pygame.event.Event(pygame.NOEVENT))
+    manager = SceneManager(IdleScene(0.0005), scene_factory=None)
+    manager._full_redraw = False
+
+    manager.tick(pygame.time.Clock(), 60)
+
+    assert waits == [1]
+
+
+def test_tick_caps_wait_at_max_idle(screen, monkeypatch):
+    waits = []
+    monkeypatch.setattr(pygame.event, "wait", lambda ms=0: waits.append(ms) or pygame.event.Event(pygame.NOEVENT))
+    manager = SceneManager(IdleScene(float("inf")), scene_factory=None)
+    manager._full_redraw = False
+
+    manager.tick(pygame.time.Clock(), 60)
+
+    assert waits == [int(SceneManager.MAX_IDLE * 1000)]
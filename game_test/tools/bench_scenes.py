@@ -0,0 +1,302 @@
+# -*- coding: utf-8 -*-
+"""
+シーンごとの 1 フレームの重さを測るベンチマーク（画面なし・カメラなしで動く）。
+
+SDL のダミードライバで SceneManager を立ち上げ、各シーンを決まったキー入力で N フレーム回して、
+handle_events / update / draw / present の時間（p50/p95/p99）と 1 フレームあたりのメモリ確保量を JSON で出す。
+フレームはゲームと同じ SceneManager.run_frame → present で回すので、差分描画（描かずに済んだフレーム）や
+眠れるフレーム（idle_timeout）の割合も出る。コミット間で JSON を比べれば、どこが重くなったかが分かる。
+
+使い方（リポジトリのルートで実行）:
+    python game_test/tools/bench_scenes.py --frames 600 --out bench.json
+    python game_test/tools/bench_scenes.py --scenes title roulette --compare bench_old.json
+
+CameraScene は FakeHardware（動くグラデーションを返す偽カメラ）で動かす。
+得点や撮影画像は一時フォルダに書くので、本番の scores.db / shuttered は触らない。
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+GAME_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+REPO_DIR = os.path.dirname(GAME_DIR)
+sys.path.insert(0, GAME_DIR)
+
+import numpy as np  # noqa: E402
+import pygame  # noqa: E402
+
+from common import AppContext, Config, game_state  # noqa: E402
+from core.manager import SceneManager  # noqa: E402
+from core.profiler import FrameProfiler  # noqa: E402
+
+PHASES = ("handle_events", "update", "draw", "present")
+# FrameProfiler のフェーズ名 → このベンチの JSON の名前
+PROFILER_PHASES = {"events": "handle_events", "update": "update", "draw": "draw", "flip": "present"}
+DEFAULT_SCENES = ("title", "howto", "roulette", "camera", "score", "round_result", "final_result")
+
+# シーンごとの入力台本: {フレーム番号: キー}
+SCRIPTS = {
+    "howto": {i * 45: pygame.K_SPACE for i in range(1, 7)},
+    "score": {240: pygame.K_SPACE},
+    "round_result": {300: pygame.K_SPACE},
+}
+
+
+class FakeHardware:
+    """HardwareManager の代わり（カメラが無くても CameraScene を動かせる）"""
+
+    def __init__(self, width=Config.SCREEN_WIDTH, height=Config.SCREEN_HEIGHT):
+        try:
+            import cv2
+        except ImportError:
+            cv2 = None
+        self.cv2 = cv2
+        self.cap = None
+        self.frame_no = 0
+        x = np.linspace(0, 255, width, dtype=np.float32)
+        y = np.linspace(0, 255, height, dtype=np.float32)
+        self._base = (x[None, :] * 0.5 + y[:, None] * 0.5).astype(np.uint8)
+
+    def start_camera(self):
+        return True
+
+    def read_frame(self):
+        self.frame_no += 1
+        shift = (self.frame_no * 4) % self._base.shape[1]
+        g = np.roll(self._base, shift, axis=1)
+        frame = np.dstack([g, 255 - g, np.full_like(g, 96)])
+        return True, frame
+
+    def process_pose(self, frame):
+        return frame
+
+    def release(self):
+        pass
+
+
+def percentiles(values):
+    if not values:
+        return {"p50": None, "p95": None, "p99": None, "mean": None, "max": None}
+    a = np.asarray(values, dtype=np.float64)
+    return {
+        "p50": float(np.percentile(a, 50)),
+        "p95": float(np.percentile(a, 95)),
+        "p99": float(np.percentile(a, 99)),
+        "mean": float(a.mean()),
+        "max": float(a.max()),
+    }
+
+
+def fake_photo(path):
+    """撮影画像の代わり（FinalResultScene の勝者の写真に使う）"""
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        photo = pygame.Surface((Config.SCREEN_WIDTH, Config.SCREEN_HEIGHT))
+        photo.fill((60, 140, 90))
+        pygame.draw.circle(photo, (240, 220, 60), photo.get_rect().center, 180)
+        pygame.image.save(photo, path)
+    return path
+
+
+def prepare_state(store):
+    """各シーンが読む共有状態を用意する（お題・1ラウンド分の得点と撮影画像）"""
+    game_state.theme = Config.THEMES[0] if Config.THEMES else ""
+    game_state.player_turn = 1
+    game_state.shutter_paths = []
+    game_state.round_id = store.start_round(theme=game_state.theme)
+    # 本番と同じ 0〜10 の範囲（メーター・レーダー・合計がゲーム中と同じ見た目になる）
+    sample = {1: {"Dynamic": 7.2, "Stable": 4.8, "Unique": 8.6},
+              2: {"Dynamic": 5.5, "Stable": 6.9, "Unique": 3.4}}
+    for player, scores in sample.items():
+        path = fake_photo(os.path.join(Config.PATH_SHUTTER_DIR, f"shutter_bench_{player}P.jpg"))
+        game_state.record_image(game_state.round_id, player, path)
+        store.record_player_score(game_state.round_id, player, scores, image_path=path)
+        game_state.publish_score(game_state.round_id, player, scores)
+
+
+class BenchSceneManager(SceneManager):
+    """測っているシーンに居続ける SceneManager（次シーンへの切替と終了は止める）"""
+
+    def switch_if_needed(self):
+        self.current_scene.next_scene_name = None
+        self.current_scene.quit_requested = False
+        return True
+
+
+def run_frames(manager, screen, frames, script, dt, measure_alloc=False):
+    """
+    frames 回 run_frame → present で回して、フェーズごとの時間(ms)とメモリ確保量(KB)、
+    描かずに済んだフレーム数・眠ってよいフレーム数を返す（tick は眠ってしまうので呼ばない）
+    """
+    times = {p: [] for p in PHASES}
+    times["frame"] = []
+    alloc_peak, alloc_net = [], []
+    counts = {"skipped_draw": 0, "idle": 0}
+
+    for i in range(frames):
+        key = script.get(i)
+        if key is not None:
+            pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=key, mod=0, unicode=""))
+            pygame.event.post(pygame.event.Event(pygame.KEYUP, key=key, mod=0, unicode=""))
+
+        if measure_alloc:
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+
+        manager.run_frame(screen, dt)
+        manager.present()
+
+        if measure_alloc:
+            after, peak = tracemalloc.get_traced_memory()
+            alloc_peak.append((peak - before) / 1024)
+            alloc_net.append((after - before) / 1024)
+        else:
+            rec = manager.profiler.records[-1]
+            for phase, name in PROFILER_PHASES.items():
+                times[name].append(rec.get(phase, 0.0))  # 差分描画で描かなかったフレームは draw 0
+            times["frame"].append(rec["total"])
+            counts["skipped_draw"] += "draw" not in rec
+            counts["idle"] += manager.current_scene.idle_timeout() is not None
+
+    return times, alloc_peak, alloc_net, counts
+
+
+def bench_scene(name, factory, screen, frames, alloc_frames, dt):
+    script = SCRIPTS.get(name, {})
+
+    t0 = time.perf_counter()
+    scene = factory(name)
+    t1 = time.perf_counter()
+    # on_enter もここで呼ばれる。フェーズの時間はゲームと同じく FrameProfiler が測る
+    manager = BenchSceneManager(initial_scene=scene, scene_factory=factory, profiler=FrameProfiler(size=frames))
+    t2 = time.perf_counter()
+
+    times, _, _, counts = run_frames(manager, screen, frames, script, dt)
+    if hasattr(scene, "on_exit"):
+        scene.on_exit()
+
+    result = {phase: percentiles(v) for phase, v in times.items()}
+    result["create_ms"] = (t1 - t0) * 1000
+    result["on_enter_ms"] = (t2 - t1) * 1000
+    result["skipped_draw_ratio"] = counts["skipped_draw"] / frames if frames else None
+    result["idle_ratio"] = counts["idle"] / frames if frames else None
+
+    if alloc_frames > 0:
+        # tracemalloc を入れると遅くなるので、時間とは別に新しいシーンで測る
+        scene = factory(name)
+        manager = BenchSceneManager(initial_scene=scene, scene_factory=factory)
+        tracemalloc.start()
+        try:
+            _, peak, net, _ = run_frames(manager, screen, alloc_frames, script, dt, measure_alloc=True)
+        finally:
+            tracemalloc.stop()
+        result["alloc_peak_kb"] = percentiles(peak)
+        result["alloc_net_kb"] = percentiles(net)
+        if hasattr(scene, "on_exit"):
+            scene.on_exit()
+    return result
+
+
+def git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR,
+                             capture_output=True, text=True, timeout=5)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def compare(report, old_path):
+    """前回の JSON と比べて p95 の変化を表示する"""
+    with open(old_path, encoding="utf-8") as f:
+        old = json.load(f)
+    print(f"--- compare with {old_path} ({old['meta'].get('commit')}) p95 ms ---")
+    for name, cur in report["scenes"].items():
+        prev = old.get("scenes", {}).get(name)
+        if prev is None:
+            continue
+        parts = []
+        for phase in PHASES + ("frame",):
+            if phase not in prev:
+                continue  # 古い JSON には無いフェーズ（present など）
+            a, b = prev[phase]["p95"], cur[phase]["p95"]
+            if a is None or b is None:
+                continue
+            # 20% 以上かつ 0.05ms 以上遅くなったら印を付ける（誤差は無視）
+            mark = " !" if b > a * 1.2 and b - a > 0.05 else ""
+            parts.append(f"{phase} {a:.2f}->{b:.2f}{mark}")
+        print(f"{name:>14}: " + ", ".join(parts))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="シーンごとのフレーム時間ベンチマーク")
+    parser.add_argument("--scenes", nargs="+", default=list(DEFAULT_SCENES))
+    parser.add_argument("--frames", type=int, default=300, help="時間を測るフレーム数")
+    parser.add_argument("--alloc-frames", type=int, default=60, help="メモリ確保を測るフレーム数（0 で測らない）")
+    parser.add_argument("--dt", type=float, default=1 / 60, help="update に渡す dt（固定）")
+    parser.add_argument("--out", default=None, help="JSON の保存先（省略時は標準出力）")
+    parser.add_argument("--compare", default=None, help="比べる前回の JSON")
+    args = parser.parse_args()
+
+    # シーンの画像パスはリポジトリのルートからの相対パス
+    os.chdir(REPO_DIR)
+
+    tmp = tempfile.mkdtemp(prefix="bench_scenes_")
+    Config.PATH_SHUTTER_DIR = os.path.join(tmp, "shuttered")
+    import score_store as score_store_module
+
+    score_store_module.score_store.path = os.path.join(tmp, "scores.db")
+
+    pygame.init()
+    screen = pygame.display.set_mode((Config.SCREEN_WIDTH, Config.SCREEN_HEIGHT))
+
+    from game_main import create_scene_factory
+
+    app = AppContext(screen)
+    app.hardware = FakeHardware()
+    factory = create_scene_factory(app)
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "frames": args.frames,
+            "alloc_frames": args.alloc_frames,
+            "dt": args.dt,
+            "unit": {"time": "ms", "alloc": "KB"},
+        },
+        "scenes": {},
+    }
+
+    for name in args.scenes:
+        prepare_state(score_store_module.score_store)
+        print(f"[bench] {name} ...", file=sys.stderr)
+        report["scenes"][name] = bench_scene(name, factory, screen, args.frames, args.alloc_frames, args.dt)
+
+    score_store_module.score_store.close()
+    pygame.quit()
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+        print(f"[{args.out}] に保存しました", file=sys.stderr)
+    else:
+        print(text)
+
+    if args.compare:
+        compare(report, args.compare)
+
+
+if __name__ == "__main__":
+    main()
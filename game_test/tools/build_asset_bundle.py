@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""
+起動時に読む画像を、読み込み・縮小した後の画素のまま1つのファイル（assets.bundle）にまとめる。
+
+ゲームと同じ手順（AppContext の ResourceManager と TitleScene）で画像を読み込み、
+AssetBundle(record=True) がその結果を覚えて書き出す。縮小の大きさや画像を変えたら作り直す
+（作り直さなくても、元画像が変わったものはバンドルを使わずに今まで通り読むだけ）。
+
+使い方（リポジトリのルートで実行）:
+    python game_test/tools/build_asset_bundle.py
+    python game_test/tools/build_asset_bundle.py --out /tmp/assets.bundle
+"""
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+GAME_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+REPO_DIR = os.path.dirname(GAME_DIR)
+sys.path.insert(0, GAME_DIR)
+
+import pygame  # noqa: E402
+
+from asset_bundle import AssetBundle  # noqa: E402
+from common import AppContext, Config  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--out", default=Config.PATH_ASSET_BUNDLE, help="書き出すファイル")
+    args = parser.parse_args()
+
+    # 画像のパスはリポジトリのルートからの相対パス（ゲームと同じ場所から読む）
+    os.chdir(REPO_DIR)
+    pygame.init()
+    screen = pygame.display.set_mode((Config.SCREEN_WIDTH, Config.SCREEN_HEIGHT))
+
+    from scenes.title_scene_class import TitleScene
+
+    t0 = time.perf_counter()
+    bundle = AssetBundle(record=True)
+    app = AppContext(screen, assets=bundle)
+    TitleScene(app)
+    count = bundle.save(args.out)
+    elapsed = time.perf_counter() - t0
+
+    size_mb = os.path.getsize(args.out) / (1024 * 1024)
+    print(f"wrote {count} images to {args.out} ({size_mb:.1f}MB, {elapsed:.2f}s)")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
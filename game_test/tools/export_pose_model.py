@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""
+骨格推定モデル(yolo11n-pose.pt)を ONNX / OpenVINO に書き出すツール。
+
+使い方（リポジトリのルートで実行）:
+    python game_test/tools/export_pose_model.py                 # onnx と openvino の両方
+    python game_test/tools/export_pose_model.py --format onnx
+
+書き出した後は common.Config.POSE_RUNTIME を "onnx" / "openvino" にすると
+PoseEstimationScene がそのモデルを使う。
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from common import Config  # noqa: E402
+from scenes.pose_estimate import exported_model_path  # noqa: E402
+
+
+def export_pose_model(pt_path, fmt, imgsz=640):
+    from ultralytics import YOLO
+
+    model = YOLO(pt_path)
+    out = model.export(format=fmt, imgsz=imgsz, dynamic=False)
+    expected = exported_model_path(pt_path, fmt)
+    print(f"[{fmt}] -> {out}")
+    if os.path.abspath(str(out)) != os.path.abspath(expected):
+        print(f"[WARN] PoseEstimatorConfig は {expected} を探します")
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description="骨格推定モデルを export する")
+    parser.add_argument("--model", default=Config.POSE_MODEL_PATH)
+    parser.add_argument("--format", choices=("onnx", "openvino", "all"), default="all")
+    parser.add_argument("--imgsz", type=int, default=640)
+    args = parser.parse_args()
+
+    formats = ("onnx", "openvino") if args.format == "all" else (args.format,)
+    for fmt in formats:
+        export_pose_model(args.model, fmt, imgsz=args.imgsz)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+学習済みスコアモデル(.keras)を ONNX に変換するツール。
+
+使い方（リポジトリのルートで実行）:
+    python game_test/tools/export_score_onnx.py
+    python game_test/tools/export_score_onnx.py --check test/2011tokyo_mister_fp-011-320x480.jpg
+
+変換後は ScorePredictor(backend="onnx") で TensorFlow なしに推論できる。
+変換には tensorflow と tf2onnx、確認(--check)には onnxruntime が必要。
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from scenes.score_predictor import ScorePredictor  # noqa: E402
+
+
+def export_models(opset=13):
+    import tensorflow as tf
+    import tf2onnx
+
+    predictor = ScorePredictor(backend="keras")
+    spec = (
+        tf.TensorSpec(
+            (None, predictor.IMAGE_HEIGHT, predictor.IMAGE_WIDTH, 3),
+            tf.float32,
+            name="input",
+        ),
+    )
+
+    for name, model in predictor.loaded_models.items():
+        out_path = predictor.ONNX_MODEL_PATHS[name]
+        print(f"[{name}] -> {out_path}")
+        tf2onnx.convert.from_keras(model, input_signature=spec, opset=opset, output_path=out_path)
+
+    return predictor
+
+
+def check_models(keras_predictor, image_path):
+    """keras と onnx の予測値を並べて表示し、差分を確認する"""
+    onnx_predictor = ScorePredictor(backend="onnx")
+    k = keras_predictor.predict(image_path)
+    o = onnx_predictor.predict(image_path)
+    if k is None or o is None:
+        print("確認用画像の予測に失敗しました。")
+        return
+
+    print("-" * 40)
+    for name in ("Dynamic", "Stable", "Unique"):
+        print(f"{name:8s} keras: {k[name]:6.3f}  onnx: {o[name]:6.3f}  diff: {abs(k[name] - o[name]):.5f}")
+    print("-" * 40)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="スコアモデルを ONNX に変換する")
+    parser.add_argument("--opset", type=int, default=13)
+    parser.add_argument("--check", metavar="IMAGE", help="変換後に keras と onnx の結果を比較する画像")
+    args = parser.parse_args()
+
+    predictor = export_models(opset=args.opset)
+    if args.check:
+        check_models(predictor, args.check)
+
+
+if __name__ == "__main__":
+    main()
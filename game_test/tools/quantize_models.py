@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+"""
+スコアモデル3種と骨格推定モデルの INT8 版を作り、FP32 との精度差をレポートするツール。
+
+使い方（リポジトリのルートで実行）:
+    python game_test/tools/export_score_onnx.py                  # 先に FP32 の ONNX を用意
+    python game_test/tools/export_pose_model.py --format onnx
+    python game_test/tools/quantize_models.py
+
+キャリブレーション画像は pose_examples/ と game_test/shuttered/ から集める。
+出力:
+    model/*_score_model_final_int8.onnx
+    yolo11n-pose_int8.onnx
+    model/quantization_report.json （スコア MAE / キーポイントのずれ）
+
+作ったモデルは common.Config.USE_QUANTIZED_MODELS = True で使われる。
+onnxruntime が必要。
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from common import Config  # noqa: E402
+from scenes.score_predictor import ScorePredictor  # noqa: E402
+
+CALIBRATION_DIRS = ["pose_examples", Config.PATH_SHUTTER_DIR]
+IMAGE_EXTS = (".jpg", ".jpeg", ".png")
+SCORE_NAMES = ("Dynamic", "Stable", "Unique")
+KPT_CONF_MIN = 0.5
+
+
+def collect_images(dirs):
+    paths = []
+    for d in dirs:
+        for p in sorted(glob.glob(os.path.join(d, "*"))):
+            if p.lower().endswith(IMAGE_EXTS):
+                paths.append(p)
+    return paths
+
+
+def letterbox(img, size=640):
+    """ultralytics と同じ letterbox（比率維持で縮小 + 灰色パディング）→ (1, 3, size, size)"""
+    h, w = img.shape[:2]
+    r = min(size / h, size / w)
+    nw, nh = int(round(w * r)), int(round(h * r))
+    resized = cv2.resize(img, (nw, nh), interpolation=cv2.INTER_LINEAR)
+    canvas = np.full((size, size, 3), 114, dtype=np.uint8)
+    top, left = (size - nh) // 2, (size - nw) // 2
+    canvas[top:top + nh, left:left + nw] = resized
+    x = canvas[..., ::-1].transpose(2, 0, 1).astype(np.float32) / 255.0
+    return x[None]
+
+
+class ImageCalibrationReader:
+    """onnxruntime.quantization 用のキャリブレーションデータ供給クラス"""
+
+    def __init__(self, input_name, tensors):
+        self.input_name = input_name
+        self.tensors = list(tensors)
+        self._iter = iter(self.tensors)
+
+    def get_next(self):
+        x = next(self._iter, None)
+        return None if x is None else {self.input_name: x}
+
+    def rewind(self):
+        """複数回データを読むキャリブレーション方式のために最初から読み直す"""
+        self._iter = iter(self.tensors)
+
+
+def quantize(fp32_path, int8_path, tensors):
+    import onnxruntime as ort
+    from onnxruntime.quantization import QuantFormat, QuantType, quantize_static
+
+    session = ort.InferenceSession(fp32_path, providers=["CPUExecutionProvider"])
+    input_name = session.get_inputs()[0].name
+    quantize_static(
+        fp32_path,
+        int8_path,
+        ImageCalibrationReader(input_name, tensors),
+        quant_format=QuantFormat.QDQ,
+        per_channel=True,
+        activation_type=QuantType.QInt8,
+        weight_type=QuantType.QInt8,
+    )
+    print(f" -> {int8_path}")
+
+
+# ==================================================
+# スコアモデル
+# ==================================================
+def quantize_score_models(images):
+    fp32 = ScorePredictor(backend="onnx")
+    tensors = [x for x in (fp32.load_input(p) for p in images) if x is not None]
+    for name in SCORE_NAMES:
+        src = fp32.ONNX_MODEL_PATHS[name]
+        if not os.path.exists(src):
+            print(f"警告: ONNX モデルがありません: {src}")
+            continue
+        print(f"[{name}] INT8 量子化中...")
+        quantize(src, fp32.INT8_MODEL_PATHS[name], tensors)
+    return fp32
+
+
+def score_report(fp32, images):
+    int8 = ScorePredictor(backend="onnx", quantized=True)
+    errors = {name: [] for name in SCORE_NAMES}
+    for p in images:
+        a, b = fp32.predict(p), int8.predict(p)
+        if a is None or b is None:
+            continue
+        for name in SCORE_NAMES:
+            errors[name].append(abs(float(a[name]) - float(b[name])))
+
+    return {
+        name: {
+            "mae": float(np.mean(v)) if v else None,
+            "max": float(np.max(v)) if v else None,
+        }
+        for name, v in errors.items()
+    } | {"num_images": len(images)}
+
+
+# ==================================================
+# 骨格推定モデル
+# ==================================================
+def quantize_pose_model(pt_path, images, imgsz):
+    # 骨格推定まわりは --skip-pose のときは import しない
+    from scenes.pose_estimate import exported_model_path
+
+    src = exported_model_path(pt_path, "onnx")
+    if not os.path.exists(src):
+        print(f"警告: ONNX モデルがありません: {src}")
+        return
+    tensors = []
+    for p in images:
+        img = cv2.imread(p)
+        if img is not None:
+            tensors.append(letterbox(img, imgsz))
+    print("[Pose] INT8 量子化中...")
+    quantize(src, exported_model_path(pt_path, "onnx", quantized=True), tensors)
+
+
+def _person_points(info):
+    """person_id → {keypoint_id: (x, y)}（信頼度が低い点は除く）"""
+    out = {}
+    for pid, kpts in info["keypoints"].items():
+        out[pid] = {
+            k["keypoint_id"]: (k["x"], k["y"])
+            for k in kpts
+            if k["confidence"] is None or k["confidence"] >= KPT_CONF_MIN
+        }
+    return out
+
+
+def _match_deviation(a, b):
+    """2つの推定結果の人物を近い順に対応付け、共通キーポイントのずれ(px)を返す"""
+    devs = []
+    used = set()
+    for pa in a.values():
+        if not pa:
+            continue
+        ca = np.mean(list(pa.values()), axis=0)
+        best, best_d = None, None
+        for pid, pb in b.items():
+            if pid in used or not pb:
+                continue
+            d = np.linalg.norm(ca - np.mean(list(pb.values()), axis=0))
+            if best_d is None or d < best_d:
+                best, best_d = pid, d
+        if best is None:
+            continue
+        used.add(best)
+        pb = b[best]
+        for kid in pa.keys() & pb.keys():
+            devs.append(float(np.hypot(pa[kid][0] - pb[kid][0], pa[kid][1] - pb[kid][1])))
+    return devs
+
+
+def pose_report(pt_path, images, imgsz):
+    from scenes.pose_estimate import PoseEstimator, PoseEstimatorConfig
+
+    fp32 = PoseEstimator(PoseEstimatorConfig(model_path=pt_path, runtime="onnx", imgsz=imgsz))
+    int8 = PoseEstimator(PoseEstimatorConfig(model_path=pt_path, quantized=True, imgsz=imgsz))
+    devs = []
+    person_mismatch = 0
+    for p in images:
+        a, b = fp32.estimate(p), int8.estimate(p)
+        if a["num_persons"] != b["num_persons"]:
+            person_mismatch += 1
+        devs.extend(_match_deviation(_person_points(a), _person_points(b)))
+
+    return {
+        "keypoint_mean_px": float(np.mean(devs)) if devs else None,
+        "keypoint_p95_px": float(np.percentile(devs, 95)) if devs else None,
+        "keypoint_max_px": float(np.max(devs)) if devs else None,
+        "num_keypoints": len(devs),
+        "person_count_mismatch": person_mismatch,
+        "num_images": len(images),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="INT8 量子化と精度レポート")
+    parser.add_argument("--pose-model", default=Config.POSE_MODEL_PATH)
+    parser.add_argument("--imgsz", type=int, default=640)
+    parser.add_argument("--report", default="model/quantization_report.json")
+    parser.add_argument("--skip-score", action="store_true")
+    parser.add_argument("--skip-pose", action="store_true")
+    args = parser.parse_args()
+
+    images = collect_images(CALIBRATION_DIRS)
+    print(f"キャリブレーション画像: {len(images)} 枚")
+    if not images:
+        print("エラー: キャリブレーション画像が見つかりません。")
+        return
+
+    report = {}
+    if not args.skip_score:
+        fp32 = quantize_score_models(images)
+        report["score"] = score_report(fp32, images)
+    if not args.skip_pose:
+        quantize_pose_model(args.pose_model, images, args.imgsz)
+        report["pose"] = pose_report(args.pose_model, images, args.imgsz)
+
+    os.makedirs(os.path.dirname(args.report) or ".", exist_ok=True)
+    with open(args.report, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    print("=" * 40)
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    print(f"[{args.report}] に保存しました")
+
+
+if __name__ == "__main__":
+    main()